@@ -0,0 +1,172 @@
+"""
+VOICE_BENCH.PY — Replay recorded voice commands through JINX's voice pipeline
+Usage:
+    python scripts/voice_bench.py recordings/*.wav
+    python scripts/voice_bench.py --repeat 20 --llm-first-ms 400 --tts-ms 250 recordings/
+    python scripts/voice_bench.py --play recordings/   (real output device)
+
+Each WAV is fed in as if spoken after the wake word, through the real
+_on_wake → listen → _transcribe_vosk → _execute_command → ask_gemini →
+speak path, traced by SPECTRE. Cloud services are stubbed with fixed
+latencies: Gemini streams a canned reply, TTS returns a silent clip, and
+yt-dlp/mpv are never called. STT is real Vosk when installed; otherwise
+a sidecar transcript (command.wav → command.txt) stands in for it.
+Everything runs in a scratch directory, so no real cache is touched.
+"""
+
+import io
+import os
+import sys
+import time
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import Future
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
+import dna
+
+
+class StubCortex:
+    """Gemini stand-in: canned replies after fixed delays."""
+    available = True
+
+    def __init__(self, first_ms: float, total_ms: float):
+        self.first = first_ms / 1000
+        self.rest  = max(0.0, total_ms - first_ms) / 1000
+        self.count = 0
+
+    def stream(self, prompt, priority=None, history=None, timeout=None, system=None):
+        self.count += 1
+        words = (f"Reply number {self.count}. That is a bold question, "
+                 "and I have a sarcastic answer ready for it. You are welcome.").split(" ")
+        time.sleep(self.first)
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(self.rest / len(words))
+            yield word + " "
+
+    def ask(self, prompt, priority=None, history=None, timeout=None, system=None) -> str:
+        return "".join(self.stream(prompt)).strip()
+
+    def submit(self, prompt, priority=None, history=None, timeout=None, stream=False, system=None):
+        thought = Future()
+        thought.set_result("The user and JINX have been chatting.")
+        return thought
+
+
+def silent_wav(seconds: float, rate: int = 22050) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\0\0" * int(seconds * rate))
+    return buf.getvalue()
+
+
+def load_pcm16(path: Path, rate: int) -> bytes:
+    """WAV → 16-bit mono PCM at `rate`."""
+    from antenna import Resampler, pcm16
+    with wave.open(str(path), "rb") as w:
+        src, width, channels = w.getframerate(), w.getsampwidth(), w.getnchannels()
+        frames = w.readframes(w.getnframes())
+    if width != 2:
+        raise ValueError(f"{path.name}: only 16-bit WAV is supported")
+    samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels).mean(axis=1) / 32768.0
+    samples = samples.astype(np.float32)
+    return pcm16(samples if src == rate else Resampler(src, rate)(samples))
+
+
+def build_vocoder(args):
+    dna.SYNAPSE_TRANSPORT = "loopback"
+    dna.SPECTRE_HISTORY   = max(dna.SPECTRE_HISTORY, args.repeat * 1000)
+    from synapse  import Synapse
+    from blackbox import Blackbox
+    from psyche   import Psyche
+    from vocoder  import Vocoder
+
+    vocoder = Vocoder(Synapse(), Blackbox(), Psyche(), StubCortex(args.llm_first_ms, args.llm_ms))
+
+    def synthesize(text):
+        with vocoder.spectre.span("tts", chars=len(text)):
+            time.sleep(args.tts_ms / 1000)
+            return silent_wav(0.06 * len(text.split()))
+
+    vocoder._tts_engine          = lambda: ("bench", "stub")
+    vocoder._synthesize          = synthesize
+    vocoder._open_stream_player  = lambda: None
+    vocoder.jukebox._fetch       = lambda query: "https://example.invalid/stream"
+    vocoder.resonator.play_music = lambda url: None
+    if args.play:
+        vocoder.resonator.start()
+    else:
+        def play(audio):
+            with vocoder.spectre.span("playback", bytes=len(audio)):
+                vocoder.spectre.audio()
+        vocoder._play_mp3 = play
+    return vocoder
+
+
+def replay(vocoder, path: Path):
+    """Make the next listen() hear `path`."""
+    import speech_recognition as sr
+    sidecar = path.with_suffix(".txt")
+
+    def listen(timeout=5):
+        with vocoder.spectre.span("listen", stt="replay"):
+            if vocoder.wiretap:
+                rate  = vocoder.wiretap.rate
+                audio = sr.AudioData(load_pcm16(path, rate), rate, 2)
+                return vocoder._transcribe_vosk(audio)
+            with vocoder.spectre.span("stt", engine="sidecar"):
+                return sidecar.read_text().strip().lower() if sidecar.exists() else ""
+
+    vocoder.listen = listen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice pipeline latency benchmark")
+    parser.add_argument("inputs", nargs="+", help="WAV files or directories of them")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per recording")
+    parser.add_argument("--llm-first-ms", type=float, default=350, help="Stub Gemini time to first token")
+    parser.add_argument("--llm-ms", type=float, default=900, help="Stub Gemini time to full reply")
+    parser.add_argument("--tts-ms", type=float, default=200, help="Stub TTS time per clip")
+    parser.add_argument("--play", action="store_true", help="Play through the real output device")
+    args = parser.parse_args()
+
+    wavs = []
+    for item in map(Path, args.inputs):
+        wavs += sorted(item.glob("*.wav")) if item.is_dir() else [item]
+    wavs = [w.resolve() for w in wavs]
+    if not wavs:
+        print("[ERROR] No WAV files given")
+        return 1
+
+    os.chdir(tempfile.mkdtemp(prefix="jinx-bench-"))  # Databases and voicebank stay scratch
+    vocoder = build_vocoder(args)
+    print(f"\n[BENCH] {len(wavs)} recordings × {args.repeat} runs "
+          f"(LLM {args.llm_first_ms:.0f}/{args.llm_ms:.0f} ms, TTS {args.tts_ms:.0f} ms)\n")
+
+    for run in range(args.repeat):
+        for wav in wavs:
+            replay(vocoder, wav)
+            vocoder._on_wake()
+
+    stats = vocoder.spectre.stats()
+    order = ["first_audio_ms", "reply_audio_ms", "total_ms"]
+    order += sorted(k for k in stats if k not in order)
+    print(f"\n{'metric':<18}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for key in order:
+        if key in stats:
+            s = stats[key]
+            print(f"{key:<18}{s['n']:>6}{s['p50']:>10}{s['p95']:>10}{s['p99']:>10}")
+    vocoder.uplink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,43 +4,32 @@ Handles: Document Q&A (RAG over uploaded PDFs/docs), code review,
          image search for visual answers, reading documents aloud,
          and laptop integration for live code watching.
 
-Upload documents to data/documents/
+Upload documents to data/documents/ — they are picked up by a
+filesystem watcher and indexed by a small ingestion worker pool.
 Set WATCH_CODE_DIR in dna.py to enable live code review.
 """
 
 import os
+import re
 import json
 import time
+import queue
 import threading
 import hashlib
 from pathlib import Path
-from datetime import datetime
 
 import dna
 from blackbox import Blackbox
-from synapse  import Synapse
+from synapse  import Synapse, Pulse
 from psyche   import Psyche
+from oracle   import Oracle, tokenize
+from tripwire import Tripwire
+from scribe   import Scribe, PDF_AVAILABLE
+from overwatch import Overwatch, changed_hunks
+from cortex   import Cortex, DOCS, REVIEW, INGEST
+from engram   import Engram
 
 # Optional imports
-try:
-    import google.generativeai as genai
-    genai.configure(api_key=dna.GEMINI_API_KEY)
-    GEMINI_MODEL = genai.GenerativeModel("gemini-2.0-flash")
-    GEMINI_AVAILABLE = True
-except Exception:
-    GEMINI_AVAILABLE = False
-
-try:
-    import PyPDF2
-    PDF_AVAILABLE = True
-except ImportError:
-    try:
-        import pypdf as PyPDF2
-        PDF_AVAILABLE = True
-    except ImportError:
-        PDF_AVAILABLE = False
-        print("  [AGENT] Install PyPDF2 or pypdf for PDF support: pip install pypdf")
-
 try:
     import docx
     DOCX_AVAILABLE = True
@@ -48,18 +37,50 @@ except ImportError:
     DOCX_AVAILABLE = False
 
 
+DOC_EXTENSIONS = {".pdf", ".txt", ".md", ".py", ".js", ".docx"}
+
+# "What is this document about?"-style questions, answered from precomputed summaries
+BROAD_QUESTION_RE = re.compile(
+    r"\b(summar(y|ise|ize)|overview|gist|tl;?dr)\b"
+    r"|\bwhat(?:'s| is| are)\b.*\babout\b"
+    r"|\bwhat (does|do)\b.*\b(cover|contain)\b"
+)
+# Words that can surround a whole-document question without narrowing it
+_BROAD_WORDS = {
+    "summary", "summarise", "summarize", "overview", "gist", "tl", "dr", "tldr", "about", "cover",
+    "covers", "contain", "contains", "give", "tell", "can", "could", "please", "quick", "brief",
+    "short", "whole", "entire", "overall", "document", "doc", "file", "pdf", "manual", "book",
+    "paper", "text", "one", "all", "jinx", "hey", "us",
+}
+_SUMMARY_LINE_RE = re.compile(r"^\[(\d+)\]\s*(.+)$", re.MULTILINE)
+
+
 class Agent:
-    def __init__(self, synapse: Synapse, blackbox: Blackbox, psyche: Psyche):
+    def __init__(self, synapse: Synapse, blackbox: Blackbox, psyche: Psyche, cortex: Cortex,
+                 engram: Engram):
         self.synapse   = synapse
         self.blackbox  = blackbox
         self.psyche    = psyche
+        self.cortex    = cortex
+        self.engram    = engram
         self.running   = False
 
-        # Document store: {filename: {"text": str, "hash": str}}
-        self.document_store = {}
+        # Persistent chunked index; document_store is its metadata view:
+        # {filename: {"path", "size", "mtime", "hash", "chars", "indexed_at"}}
+        self.oracle = Oracle(dna.DOCUMENT_INDEX_DB)
+        self.document_store = self.oracle.documents
+        self.scribe = Scribe()
+
+        # Ingestion: one queue per worker, a file always hashes to the same
+        # worker so events for one document are processed in order
+        self.ingest_queues = [queue.Queue() for _ in range(max(1, dna.INGEST_WORKERS))]
+        self.doc_wire      = None
+
+        # Background summarization (chunk → section → document), lowest LLM priority
+        self.summary_queue = queue.Queue()
 
         # Code watch state
-        self.watched_files = {}  # {path: last_hash}
+        self.overwatch = None
         self.code_review_queue = []
 
         # Load existing documents
@@ -76,80 +97,198 @@ class Agent:
     # ── Document Loading ───────────────────────────────────────────────────
 
     def _load_documents(self):
-        """Load all documents from the documents directory."""
+        """Reconcile the index with the documents directory (startup only —
+        after that the watcher reports changes)."""
         doc_dir = Path(dna.DOCUMENTS_DIR)
         if not doc_dir.exists():
             doc_dir.mkdir(parents=True)
-            return
 
+        present = set()
         for path in doc_dir.iterdir():
-            if path.suffix.lower() in {".pdf", ".txt", ".md", ".py", ".js", ".docx"}:
+            if path.suffix.lower() in DOC_EXTENSIONS:
+                present.add(path.name)
                 self._index_document(path)
 
+        for name in list(self.document_store):
+            if name not in present:
+                self._forget_document(Path(name))
+            elif not self.oracle.document_summary(name):
+                self.summary_queue.put(name)  # Backfill once the summary worker starts
+
+    def _forget_document(self, path: Path) -> bool:
+        if path.name not in self.document_store:
+            return False
+        self.oracle.remove_document(path.name)
+        print(f"  [AGENT] Removed: {path.name}")
+        return True
+
+    def _on_document_event(self, path: Path, kind: str):
+        """Tripwire callback (and web uploads) — hand the event to the ingestion
+        pool. One file always lands on the same worker, so a watcher event and
+        an upload of the same file are indexed one after the other, never twice
+        at once."""
+        q = self.ingest_queues[hash(path.name) % len(self.ingest_queues)]
+        q.put((path, kind))
+
+    def _ingest_worker(self, q: queue.Queue):
+        while self.running:
+            try:
+                path, kind = q.get(timeout=1)
+            except queue.Empty:
+                continue
+            if kind == "deleted" and not path.exists():
+                if self._forget_document(path):
+                    self.synapse.publish(dna.TOPIC["command"],
+                        {"type": "document_status", "result": "removed", "path": str(path)})
+            elif path.exists():
+                before  = self.oracle.lookup(path.name)
+                ok      = self._index_document(path)
+                changed = self.oracle.lookup(path.name) is not before
+                if not ok or changed or kind == "upload":  # Skip no-op touches, but always answer an upload
+                    self.synapse.publish(dna.TOPIC["command"],
+                        {"type": "document_status", "result": "indexed" if ok else "failed",
+                         "path": str(path)})
+                    if ok and changed:
+                        self.summary_queue.put(path.name)
+
+    # ── Background Summaries ──────────────────────────────────────────────
+
+    def _summary_worker(self):
+        while self.running:
+            try:
+                name = self.summary_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            doc = self.oracle.lookup(name)
+            if not doc or not self.cortex.available or self.oracle.document_summary(name):
+                continue
+            try:
+                self._summarize_document(name, doc["hash"])
+            except Exception as e:
+                print(f"  [AGENT] Summary failed for {name}: {e}")
+
+    def _summarize_document(self, name: str, doc_hash: str):
+        """Build and store the summary hierarchy. Bails out quietly if the
+        document changes underneath (its new version gets queued anyway)."""
+        chunks = self.oracle.chunk_texts(name)
+        per    = dna.SUMMARY_SECTION_CHUNKS
+        chunk_lines, sections = [], []
+        for start in range(0, len(chunks), per):
+            if (self.oracle.lookup(name) or {}).get("hash") != doc_hash:
+                return
+            lines, section = self._summarize_section(name, chunks[start:start + per])
+            chunk_lines += [(start + i, line) for i, line in lines.items()]
+            sections.append(section)
+        if not sections:
+            return
+        if not (self.oracle.store_summaries(name, doc_hash, "chunk", chunk_lines) and
+                self.oracle.store_summaries(name, doc_hash, "section", list(enumerate(sections)))):
+            return
+
+        level, depth = sections, 0
+        while len(level) > dna.SUMMARY_FANOUT:
+            depth += 1
+            level = [self._condense(name, level[i:i + dna.SUMMARY_FANOUT])
+                     for i in range(0, len(level), dna.SUMMARY_FANOUT)]
+            if not self.oracle.store_summaries(name, doc_hash, f"part{depth}", list(enumerate(level))):
+                return
+        summary = self._condense(name, level, spoken=True)
+        if self.oracle.store_summaries(name, doc_hash, "document", [(0, summary)]):
+            print(f"  [AGENT] Summarized: {name} ({len(chunks)} chunks, {len(sections)} sections)")
+
+    def _summarize_section(self, name: str, passages: list) -> tuple:
+        """One LLM call per section: ({passage index: one-liner}, section summary)."""
+        numbered = "\n\n".join(f"[{i + 1}] {text}" for i, text in enumerate(passages))
+        prompt = (
+            f"Below are {len(passages)} consecutive passages from the document {name}, numbered.\n\n"
+            f"{numbered}\n\n"
+            "For each passage write exactly one line: '[n] <one-sentence summary>'. "
+            "Then write a line starting with 'SECTION:' followed by a 2-4 sentence summary "
+            "of all the passages together. Plain text, no markdown."
+        )
+        reply = self.cortex.ask(prompt, INGEST, timeout=dna.SUMMARY_TIMEOUT)
+        body, _, section = reply.partition("SECTION:")
+        lines = {int(n) - 1: text.strip() for n, text in _SUMMARY_LINE_RE.findall(body)
+                 if 0 < int(n) <= len(passages)}
+        return lines, (section.strip() or " ".join(lines.values()))
+
+    def _condense(self, name: str, summaries: list, spoken: bool = False) -> str:
+        joined = "\n\n".join(summaries)
+        if spoken:
+            prompt = (
+                "Summarize this document for listening (not reading). "
+                "Be clear, natural, and conversational. 3-5 sentences max. "
+                "Cover the whole document, not just its beginning.\n\n"
+                f"Document: {name}\nSection summaries, in order:\n\n{joined}"
+            )
+        else:
+            prompt = (
+                f"These are consecutive section summaries from the document {name}. "
+                f"Merge them into one 3-5 sentence summary. Plain text, no markdown.\n\n{joined}"
+            )
+        return self.cortex.ask(prompt, INGEST, timeout=dna.SUMMARY_TIMEOUT)
+
     def _index_document(self, path: Path) -> bool:
-        """Extract and index text from a document."""
+        """Extract and index text from a document, unless the store already has this exact file."""
         try:
-            text = self._extract_text(path)
-            if not text:
+            st    = path.stat()
+            known = self.oracle.lookup(path.name)
+            if known and known["size"] == st.st_size and known["mtime"] == st.st_mtime:
+                return True  # Untouched since last index — not even read
+
+            raw_hash = self._hash_file(path)
+            if known and known["hash"] == raw_hash:
+                self.oracle.touch(path.name, st.st_size, st.st_mtime)
+                return True  # Rewritten with identical bytes
+
+            n_chunks = self.oracle.add_pages(path.name, self._extract_pages(path), path=str(path),
+                                             size=st.st_size, mtime=st.st_mtime, raw_hash=raw_hash)
+            if not n_chunks:
                 return False
-            doc_hash = hashlib.md5(text.encode()).hexdigest()
-
-            # Skip if already indexed with same content
-            existing = self.document_store.get(path.name, {})
-            if existing.get("hash") == doc_hash:
-                return True
-
-            self.document_store[path.name] = {
-                "text": text,
-                "hash": doc_hash,
-                "path": str(path),
-                "indexed_at": datetime.now().isoformat(),
-                "size": len(text),
-            }
-            print(f"  [AGENT] Indexed: {path.name} ({len(text)} chars)")
+            print(f"  [AGENT] Indexed: {path.name} ({self.document_store[path.name]['chars']} chars, "
+                  f"{n_chunks} chunks)")
             return True
         except Exception as e:
             print(f"  [AGENT] Failed to index {path.name}: {e}")
             return False
 
-    def _extract_text(self, path: Path) -> str:
-        """Extract plain text from various file formats."""
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.md5()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _extract_pages(self, path: Path):
+        """Yield (page_no, text) from various file formats; page_no is None
+        for formats without pages."""
         ext = path.suffix.lower()
 
         if ext == ".pdf" and PDF_AVAILABLE:
-            return self._extract_pdf(path)
+            try:
+                yield from self.scribe.pages(path)
+            except Exception as e:
+                print(f"  [AGENT] PDF extraction error: {e}")
 
         elif ext == ".docx" and DOCX_AVAILABLE:
             doc = docx.Document(str(path))
-            return "\n".join(p.text for p in doc.paragraphs)
+            yield None, "\n".join(p.text for p in doc.paragraphs)
 
         elif ext in {".txt", ".md", ".py", ".js", ".ts", ".css", ".html", ".java", ".c", ".cpp"}:
-            return path.read_text(encoding="utf-8", errors="ignore")
-
-        return ""
-
-    def _extract_pdf(self, path: Path) -> str:
-        text_parts = []
-        try:
-            with open(path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                for page in reader.pages:
-                    text = page.extract_text()
-                    if text:
-                        text_parts.append(text)
-        except Exception as e:
-            print(f"  [AGENT] PDF extraction error: {e}")
-        return "\n".join(text_parts)
+            yield None, path.read_text(encoding="utf-8", errors="ignore")
 
     def add_document(self, path: str) -> bool:
-        """Add a new document to the index."""
+        """Queue a document for indexing; the ingest worker publishes its
+        document_status. False if there is no such file."""
         p = Path(path)
         if not p.exists():
             return False
-        return self._index_document(p)
+        self._on_document_event(p, "upload")
+        return True
 
     def list_documents(self) -> list:
-        return [{"name": k, "size": v["size"]} for k, v in self.document_store.items()]
+        return [{"name": k, "size": v["chars"]} for k, v in self.document_store.items()]
 
     # ── Document Q&A ───────────────────────────────────────────────────────
 
@@ -158,20 +297,35 @@ class Agent:
         if not self.document_store:
             return "No documents in my database. Upload some to data/documents/ first."
 
-        if not GEMINI_AVAILABLE:
+        # Broad "what's this about" questions: precomputed whole-document summary
+        precomputed = self._precomputed_answer(question)
+        if precomputed:
+            self.blackbox.log_event("AGENT_QUERY", {"question": question[:100], "source": "summary"})
+            return precomputed
+
+        # RAG: only the chunks that actually match the question
+        hits = self.oracle.search(question, dna.RETRIEVAL_TOP_K)
+        if not hits:
+            return "Nothing in my documents covers that. Try asking differently, or upload something relevant."
+
+        # Same question against the same document versions = same answer
+        version = self._doc_version({h["doc"] for h in hits})
+        cached  = self.engram.recall("docs", question, version)
+        if cached is not None:
+            self.blackbox.log_event("AGENT_QUERY", {"question": question[:100], "source": "cache"})
+            return cached
+
+        if not self.cortex.available:
             return "AI brain offline. Check Gemini API key."
 
-        # Simple RAG: concatenate all document text (trimmed to fit context)
         context_parts = []
         total_chars = 0
         max_chars   = dna.MAX_CONTEXT_TOKENS * 3  # Rough char estimate
-
-        for name, doc in self.document_store.items():
-            excerpt = doc["text"][:5000]  # Max 5k chars per doc
-            context_parts.append(f"=== {name} ===\n{excerpt}")
-            total_chars += len(excerpt)
-            if total_chars > max_chars:
+        for hit in hits:
+            if total_chars + len(hit["text"]) > max_chars:
                 break
+            context_parts.append(f"=== {self._cite(hit)} ===\n{hit['text']}")
+            total_chars += len(hit["text"])
 
         context = "\n\n".join(context_parts)
 
@@ -180,18 +334,51 @@ class Agent:
             f"The user has uploaded documents. Use this knowledge to answer:\n\n"
             f"DOCUMENT CONTENT:\n{context}\n\n"
             f"USER QUESTION: {question}\n\n"
-            "Answer based on the documents. If the answer isn't in the documents, say so. "
+            "Answer based on the documents, naming the document and page you used. "
+            "If the answer isn't in the documents, say so. "
             "Be concise and accurate. No markdown formatting."
         )
 
         try:
-            response = GEMINI_MODEL.generate_content(prompt)
-            answer   = response.text.strip()
-            self.blackbox.log_event("AGENT_QUERY", {"question": question[:100], "source": "documents"})
+            answer = self.cortex.ask(prompt, DOCS)
+            self.engram.remember("docs", question, answer, version)
+            self.blackbox.log_event("AGENT_QUERY", {
+                "question": question[:100], "source": "documents",
+                "chunks": [self._cite(h) for h in hits[:len(context_parts)]],
+            })
             return answer
         except Exception as e:
             return f"I ran into a problem: {e}"
 
+    def _precomputed_answer(self, question: str) -> str | None:
+        if not BROAD_QUESTION_RE.search(question.lower()):
+            return None
+        q = question.lower()
+        named = [n for n in self.document_store
+                 if Path(n).stem.lower() in q or Path(n).stem.lower().replace("_", " ") in q]
+        if not named and len(self.document_store) == 1:
+            named = list(self.document_store)
+        if len(named) != 1:
+            return None  # Ambiguous — let retrieval decide
+        # "Summarize the installation section" / "what is chapter 3 about" ask about
+        # part of the document: anything left besides the name and the phrasing → retrieval
+        name_words = set(tokenize(re.sub(r"[_\-.]", " ", Path(named[0]).stem)))
+        if any(w not in _BROAD_WORDS and w not in name_words for w in tokenize(q)):
+            return None
+        summary = self.oracle.document_summary(named[0])
+        return f"{named[0]}: {summary}" if summary else None
+
+    def _doc_version(self, names) -> str:
+        return ",".join(f"{n}:{(self.oracle.lookup(n) or {}).get('hash', '')}" for n in sorted(names))
+
+    @staticmethod
+    def _cite(hit: dict) -> str:
+        if hit["page"] is None:
+            return f"{hit['doc']} (part {hit['idx'] + 1})"
+        if hit["page_end"] and hit["page_end"] != hit["page"]:
+            return f"{hit['doc']} (pages {hit['page']}-{hit['page_end']})"
+        return f"{hit['doc']} (page {hit['page']})"
+
     def read_document_aloud(self, filename: str, vocoder=None) -> str:
         """Read a document summary aloud via vocoder."""
         if filename not in self.document_store:
@@ -201,7 +388,15 @@ class Agent:
                 return f"I don't have a document called {filename}. Available: {', '.join(self.document_store.keys())}"
             filename = matches[0]
 
-        doc_text = self.document_store[filename]["text"]
+        version = self._doc_version([filename])
+        summary = (self.oracle.document_summary(filename) or
+                   self.engram.recall("summary", filename, version, similar=False))
+        if summary is not None:
+            if vocoder:
+                vocoder.speak(f"Here's a summary of {filename}: {summary}")
+            return summary
+
+        doc_text = self.oracle.document_text(filename)
 
         # Generate a spoken summary
         prompt = (
@@ -211,8 +406,8 @@ class Agent:
         )
 
         try:
-            response = GEMINI_MODEL.generate_content(prompt)
-            summary  = response.text.strip()
+            summary = self.cortex.ask(prompt, DOCS)
+            self.engram.remember("summary", filename, summary, version)
             if vocoder:
                 vocoder.speak(f"Here's a summary of {filename}: {summary}")
             return summary
@@ -221,11 +416,20 @@ class Agent:
 
     # ── Code Review ────────────────────────────────────────────────────────
 
-    def review_code(self, code: str, filename: str = "code", language: str = None) -> str:
-        """Review code and return analysis."""
-        if not GEMINI_AVAILABLE:
+    def review_code(self, code: str, filename: str = "code", language: str = None,
+                    priority: int = DOCS) -> str:
+        """Review code and return analysis. Asked-for reviews run at DOCS
+        priority; the watcher's automatic ones pass REVIEW."""
+        if not self.cortex.available:
             return "Can't review code — Gemini offline."
-
+        review = self._review_full(code, filename, language, priority)
+        return review if review is not None else "Code review failed — Gemini offline or errored."
+
+    def _review_full(self, code: str, filename: str, language: str = None,
+                     priority: int = DOCS) -> str | None:
+        """Whole-file review, or None on failure."""
+        if not self.cortex.available:
+            return None
         lang = language or self._detect_language(filename)
 
         prompt = (
@@ -244,16 +448,83 @@ class Agent:
         )
 
         try:
-            response = GEMINI_MODEL.generate_content(prompt)
-            review   = response.text.strip()
-            self.blackbox.log_event("CODE_REVIEW", {"file": filename, "lines": code.count("\n")})
-            return review
+            review = self.cortex.ask(prompt, priority)
+        except Exception as e:
+            print(f"  [AGENT] Code review failed: {e}")
+            return None
+        self.blackbox.log_event("CODE_REVIEW", {"file": filename, "lines": code.count("\n")})
+        return review
+
+    def review_changes(self, path: Path, code: str, previous: str | None) -> tuple:
+        """Review only what changed since the last review: diff hunks plus their
+        enclosing def/class, with per-hunk reviews cached. Returns (review, stats);
+        stats["ok"] is False when Gemini couldn't review it."""
+        hunks = changed_hunks(previous, code) if previous is not None else []
+        changed = sum(h["changed"] for h in hunks)
+        if not hunks or len(hunks) > dna.REVIEW_MAX_HUNKS or changed > code.count("\n") // 2:
+            review = self._review_full(code, path.name, priority=REVIEW)
+            stats  = {"mode": "full", "lines": code.count("\n"), "ok": review is not None}
+            return review or "Code review failed — Gemini offline or errored.", stats
+
+        reviews = {i: self.overwatch.cached_review(path, h["hash"]) for i, h in enumerate(hunks)}
+        pending = [i for i, r in reviews.items() if r is None]
+        if pending:
+            fresh = self._review_hunks(path.name, [hunks[i] for i in pending])
+            if fresh is None:
+                return "Code review failed — Gemini offline or errored.", {"mode": "diff", "hunks": len(hunks),
+                                                                           "ok": False}
+            if isinstance(fresh, str):  # Sections didn't split cleanly: show it whole, cache nothing
+                return fresh, {"mode": "diff", "hunks": len(hunks), "cached": 0, "lines": changed, "ok": True}
+            for i, review in zip(pending, fresh):
+                reviews[i] = review
+                self.overwatch.store_review(path, hunks[i]["hash"], review)
+
+        parts = []
+        for i, hunk in enumerate(hunks):
+            where = hunk["scope"][-1] if hunk["scope"] else "top level"
+            parts.append(f"{where} ({hunk['header']}): {reviews[i]}")
+        return "\n\n".join(parts), {"mode": "diff", "hunks": len(hunks),
+                                    "cached": len(hunks) - len(pending), "lines": changed, "ok": True}
+
+    def _review_hunks(self, filename: str, hunks: list) -> list | str | None:
+        """One Gemini call for several hunks; returns one review per hunk, the
+        raw reply if it can't be split per hunk, or None on failure."""
+        if not self.cortex.available:
+            return None
+        lang = self._detect_language(filename)
+        sections = []
+        for n, hunk in enumerate(hunks, 1):
+            scope = " > ".join(hunk["scope"]) or "top level"
+            sections.append(f"=== HUNK {n} ===\nIn: {scope}\n```diff\n{hunk['diff']}\n```")
+
+        prompt = (
+            f"{self.psyche.get_system_prompt()}\n\n"
+            f"Someone just edited {filename} ({lang}). Review ONLY these changes — each hunk "
+            "shows its enclosing function/class and a unified diff (- removed, + added):\n\n"
+            + "\n\n".join(sections) + "\n\n"
+            "Reply with one section per hunk, each starting with its own '=== HUNK n ===' line. "
+            "Flag bugs, performance and security problems the change introduces; "
+            "if a hunk is fine, say so in one line. "
+            "Keep JINX's sarcastic personality but make the review genuinely useful. "
+            "Plain text, no markdown."
+        )
+        try:
+            text = self.cortex.ask(prompt, REVIEW)
         except Exception as e:
-            return f"Code review failed: {e}"
+            print(f"  [AGENT] Hunk review failed: {e}")
+            return None
+
+        found = {}
+        parts = re.split(r"^=== HUNK (\d+) ===\s*$", text, flags=re.MULTILINE)
+        for number, body in zip(parts[1::2], parts[2::2]):
+            found[int(number)] = body.strip()
+        if sorted(found) != list(range(1, len(hunks) + 1)):
+            return text
+        return [found[n] for n in range(1, len(hunks) + 1)]
 
     def fix_code(self, code: str, issue: str = "", language: str = None) -> str:
         """Attempt to fix code issues."""
-        if not GEMINI_AVAILABLE:
+        if not self.cortex.available:
             return code
 
         lang = language or "python"
@@ -264,8 +535,7 @@ class Agent:
         )
 
         try:
-            response = GEMINI_MODEL.generate_content(prompt)
-            return response.text.strip().replace(f"```{lang}", "").replace("```", "").strip()
+            return self.cortex.ask(prompt, DOCS).replace(f"```{lang}", "").replace("```", "").strip()
         except Exception:
             return code
 
@@ -289,77 +559,65 @@ class Agent:
             print(f"  [AGENT] Watch directory not found: {dna.WATCH_CODE_DIR}")
             return
 
-        code_extensions = {".py", ".js", ".ts", ".java", ".c", ".cpp", ".cs", ".go", ".rs"}
-
-        while self.running:
-            try:
-                for file_path in watch_path.rglob("*"):
-                    if file_path.suffix.lower() not in code_extensions:
-                        continue
-                    if file_path.stat().st_mtime < time.time() - 5:
-                        continue  # Only check recently modified
-
-                    file_hash = hashlib.md5(file_path.read_bytes()).hexdigest()
-                    if self.watched_files.get(str(file_path)) != file_hash:
-                        self.watched_files[str(file_path)] = file_hash
-                        code = file_path.read_text(encoding="utf-8", errors="ignore")
-                        if len(code) > 50:  # Skip tiny files
-                            review = self.review_code(code, file_path.name)
-                            # Publish review to dashboard and notify
-                            self.synapse.publish(dna.TOPIC["command"],
-                                json.dumps({
-                                    "type": "code_review_result",
-                                    "file": file_path.name,
-                                    "review": review,
-                                }))
-                            print(f"  [AGENT] Auto-reviewed: {file_path.name}")
-            except Exception as e:
-                print(f"  [AGENT] Watch error: {e}")
-            time.sleep(5)
+        self.overwatch = Overwatch(watch_path, self._on_code_change)
+        self.overwatch.start()
+
+    def _on_code_change(self, path: Path, code: str, previous: str | None) -> bool:
+        review, stats = self.review_changes(path, code, previous)
+        self.blackbox.log_event("CODE_AUTO_REVIEW", {"file": path.name, **stats})
+        # Publish review to dashboard and notify
+        self.synapse.publish(dna.TOPIC["command"], {
+            "type": "code_review_result",
+            "file": path.name,
+            "review": review,
+            **stats,
+        })
+        print(f"  [AGENT] Auto-reviewed: {path.name} ({stats['mode']}"
+              f"{', %d hunks' % stats['hunks'] if stats['mode'] == 'diff' else ''})")
+        return stats["ok"]  # Overwatch only records the file as reviewed on success
 
     # ── MQTT Handlers ─────────────────────────────────────────────────────
 
-    def _on_command(self, payload: str):
+    def _on_command(self, pulse: Pulse):
         try:
-            cmd = json.loads(payload)
+            cmd = pulse.json()
             if cmd.get("type") == "agent_query":
                 query    = cmd.get("query", "")
                 response = self.query_documents(query)
                 self.synapse.publish(dna.TOPIC["command"],
-                    json.dumps({"type": "agent_response", "response": response}))
+                    {"type": "agent_response", "response": response})
 
             elif cmd.get("type") == "code_review":
                 code    = cmd.get("code", "")
                 fname   = cmd.get("filename", "code")
                 review  = self.review_code(code, fname)
                 self.synapse.publish(dna.TOPIC["command"],
-                    json.dumps({"type": "code_review_result", "file": fname, "review": review}))
+                    {"type": "code_review_result", "file": fname, "review": review})
 
         except (json.JSONDecodeError, KeyError):
             pass
 
-    def _on_web_command(self, payload: str):
+    def _on_web_command(self, pulse: Pulse):
         try:
-            cmd = json.loads(payload)
+            cmd = pulse.json()
             action = cmd.get("action", "")
 
             if action == "add_document":
                 path = cmd.get("path", "")
-                success = self.add_document(path)
-                result = "indexed" if success else "failed"
-                self.synapse.publish(dna.TOPIC["command"],
-                    json.dumps({"type": "document_status", "result": result, "path": path}))
+                if not self.add_document(path):  # Queued ones are reported by the ingest worker
+                    self.synapse.publish(dna.TOPIC["command"],
+                        {"type": "document_status", "result": "failed", "path": path})
 
             elif action == "list_documents":
                 docs = self.list_documents()
                 self.synapse.publish(dna.TOPIC["command"],
-                    json.dumps({"type": "document_list", "docs": docs}))
+                    {"type": "document_list", "docs": docs})
 
             elif action == "query":
                 question = cmd.get("question", "")
                 response = self.query_documents(question)
                 self.synapse.publish(dna.TOPIC["command"],
-                    json.dumps({"type": "agent_response", "response": response}))
+                    {"type": "agent_response", "response": response})
 
         except (json.JSONDecodeError, KeyError):
             pass
@@ -370,13 +628,26 @@ class Agent:
         self.running = True
 
         # Start code watcher if configured
-        if dna.WATCH_CODE_DIR:
-            threading.Thread(target=self._watch_code_directory, daemon=True).start()
+        self._watch_code_directory()
+
+        # Document ingestion: watcher events -> worker pool -> summarizer
+        threading.Thread(target=self._summary_worker, name="agent-summary", daemon=True).start()
+        for i, q in enumerate(self.ingest_queues):
+            threading.Thread(target=self._ingest_worker, args=(q,),
+                             name=f"agent-ingest-{i}", daemon=True).start()
+        self.doc_wire = Tripwire(
+            dna.DOCUMENTS_DIR, self._on_document_event, recursive=False, name="documents",
+            accept=lambda path, is_dir: not is_dir and path.suffix.lower() in DOC_EXTENSIONS,
+        )
+        self.doc_wire.start()
 
-        # Watch for new documents
         while self.running:
-            self._load_documents()  # Re-scan for new files
-            time.sleep(30)
+            time.sleep(1)
 
     def stop(self):
         self.running = False
+        if self.doc_wire:
+            self.doc_wire.stop()
+        self.scribe.shutdown()
+        if self.overwatch:
+            self.overwatch.stop()
@@ -0,0 +1,223 @@
+"""
+ANTENNA.PY — SHARED AUDIO CAPTURE
+One continuous microphone stream for the whole bot. The PortAudio
+callback only copies each block into a ring buffer; a pump thread then
+resamples it once per target rate (16 kHz for speech, 22050 Hz for the
+sound classifier, ...) into that rate's own ring. Consumers open a Tap —
+a private read cursor on one rate's ring — so Vocoder, Wiretap and
+EchoHunter all hear the same samples with no gaps between reads and no
+fighting over the device.
+
+Each ring has a single writer that publishes its write counter only
+after the samples are in place, so readers never take a lock to copy
+audio; a condition variable is used only to put idle readers to sleep.
+A reader that falls more than a ring behind skips ahead and counts an
+overrun rather than stalling the writer.
+"""
+
+import threading
+
+import numpy as np
+
+import dna
+
+try:
+    import sounddevice as sd
+    SD_AVAILABLE = True
+except ImportError:
+    SD_AVAILABLE = False
+
+try:
+    from scipy.signal import butter, lfilter, lfilter_zi
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False  # Resample without an anti-alias filter
+
+
+def pcm16(samples: np.ndarray) -> bytes:
+    """float32 [-1, 1] → 16-bit little-endian PCM."""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+
+class _Ring:
+    def __init__(self, rate: int, seconds: float):
+        self.rate    = rate
+        self.data    = np.zeros(max(1, int(rate * seconds)), dtype=np.float32)
+        self.written = 0  # Total samples ever written; the only thing readers synchronize on
+
+    def write(self, x: np.ndarray):
+        cap = len(self.data)
+        if len(x) > cap:
+            self.written += len(x) - cap
+            x = x[-cap:]
+        i     = self.written % cap
+        first = min(len(x), cap - i)
+        self.data[i:i + first] = x[:first]
+        self.data[:len(x) - first] = x[first:]
+        self.written += len(x)  # Publish only after the copy
+
+    def read(self, start: int, n: int) -> np.ndarray:
+        cap = len(self.data)
+        i   = start % cap
+        if i + n <= cap:
+            return self.data[i:i + n].copy()
+        return np.concatenate((self.data[i:], self.data[:n - (cap - i)]))
+
+
+class Resampler:
+    """Streaming linear-interpolation resampler (low-passed first when
+    downsampling and scipy is available). State carries across blocks."""
+
+    def __init__(self, src: int, dst: int):
+        self.step = src / dst
+        self.pos  = 0.0                              # Next output position, in input samples
+        self.tail = np.zeros(1, dtype=np.float32)    # Last input sample of the previous block
+        self.lp   = None
+        if SCIPY_AVAILABLE and dst < src:
+            b, a    = butter(6, 0.9 * dst / src)     # Cut at 0.45 × dst, below the new Nyquist
+            self.lp = (b, a, lfilter_zi(b, a) * 0.0)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        if self.lp:
+            b, a, zi = self.lp
+            x, zi    = lfilter(b, a, x, zi=zi)
+            self.lp  = (b, a, zi)
+        buf = np.concatenate((self.tail, x))
+        idx = np.arange(self.pos, len(buf) - 1, self.step)
+        out = np.interp(idx, np.arange(len(buf)), buf).astype(np.float32)
+        self.pos  = (idx[-1] + self.step if len(idx) else self.pos) - (len(buf) - 1)
+        self.tail = buf[-1:].astype(np.float32)
+        return out
+
+
+class Tap:
+    """One consumer's cursor on one rate's ring. Starts at "now"."""
+
+    def __init__(self, antenna, ring: _Ring):
+        self.antenna  = antenna
+        self.ring     = ring
+        self.rate     = ring.rate
+        self.cursor   = ring.written
+        self.overruns = 0
+
+    def seek_now(self):
+        self.cursor = self.ring.written
+
+    def available(self) -> int:
+        return self.ring.written - self.cursor
+
+    def read(self, n: int, timeout: float = None) -> np.ndarray | None:
+        """Next n samples (float32), blocking until they exist. None on
+        timeout or when the antenna stops."""
+        cond = self.antenna._cond
+        with cond:
+            if not cond.wait_for(lambda: self.available() >= n or not self.antenna.running, timeout):
+                return None
+        if self.available() < n:
+            return None
+        cap = len(self.ring.data)
+        if self.available() > cap - n:  # Fell a ring behind: drop the oldest, keep going
+            self.cursor = self.ring.written - (cap - n)
+            self.overruns += 1
+        out = self.ring.read(self.cursor, n)
+        self.cursor += n
+        return out
+
+    def read_pcm16(self, n: int, timeout: float = None) -> bytes | None:
+        samples = self.read(n, timeout)
+        return None if samples is None else pcm16(samples)
+
+    def close(self):
+        self.antenna._release(self)
+
+
+class Antenna:
+    def __init__(self, rate: int = None):
+        self.rate      = rate or dna.CAPTURE_SAMPLE_RATE
+        self.block     = int(self.rate * dna.CAPTURE_BLOCK_MS / 1000)
+        self.native    = _Ring(self.rate, dna.CAPTURE_RING_SECONDS)
+        self.rings     = {}   # target rate -> (_Ring, Resampler)
+        self.taps      = []
+        self.running   = False
+        self.stream    = None
+        self.overflows = 0    # Blocks PortAudio reported as overflowed
+        self._cond     = threading.Condition()
+        self._fresh    = threading.Event()
+        self._lock     = threading.Lock()
+
+    def start(self) -> bool:
+        if not SD_AVAILABLE:
+            print("  [ANTENNA] sounddevice not installed — no microphone")
+            return False
+        try:
+            self.stream = sd.InputStream(samplerate=self.rate, blocksize=self.block, channels=1,
+                                         dtype="float32", callback=self._on_audio)
+            self.stream.start()
+        except Exception as e:
+            print(f"  [ANTENNA] Microphone unavailable: {e}")
+            self.stream = None
+            return False
+        self.running = True
+        threading.Thread(target=self._pump, name="antenna", daemon=True).start()
+        print(f"  [ANTENNA] Capturing at {self.rate} Hz ({dna.CAPTURE_BLOCK_MS} ms blocks)")
+        return True
+
+    def stop(self):
+        self.running = False
+        self._fresh.set()
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def tap(self, rate: int = None) -> Tap:
+        """A new reader at the given rate; resampling for that rate is set
+        up on first use and shared by every tap at the same rate."""
+        rate = rate or self.rate
+        with self._lock:
+            if rate == self.rate:
+                ring = self.native
+            else:
+                if rate not in self.rings:
+                    self.rings[rate] = (_Ring(rate, dna.CAPTURE_RING_SECONDS), Resampler(self.rate, rate))
+                ring = self.rings[rate][0]
+            tap = Tap(self, ring)
+            self.taps.append(tap)
+            return tap
+
+    def _release(self, tap: Tap):
+        with self._lock:
+            if tap in self.taps:
+                self.taps.remove(tap)
+            if tap.rate != self.rate and not any(t.rate == tap.rate for t in self.taps):
+                self.rings.pop(tap.rate, None)  # Nobody listens at this rate any more
+
+    # ── Capture ───────────────────────────────────────────────────────────
+
+    def _on_audio(self, indata, frames, time_info, status):
+        # PortAudio thread: copy and go — resampling happens on the pump
+        if status:
+            self.overflows += 1
+        self.native.write(indata[:, 0])
+        self._fresh.set()
+
+    def _pump(self):
+        cursor = self.native.written
+        while self.running:
+            self._fresh.wait(1)
+            self._fresh.clear()
+            written = self.native.written
+            if written == cursor:
+                continue
+            if written - cursor > len(self.native.data):
+                cursor = written - len(self.native.data)
+            block  = self.native.read(cursor, written - cursor)
+            cursor = written
+            with self._lock:
+                targets = list(self.rings.values())
+            for ring, resample in targets:
+                ring.write(resample(block))
+            with self._cond:
+                self._cond.notify_all()
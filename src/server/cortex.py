@@ -0,0 +1,348 @@
+"""
+CORTEX.PY — SHARED LLM EXECUTOR
+One Gemini client for the whole bot. Requests go through a priority queue
+served by a small worker pool, so a pile of background code reviews can
+never starve an interactive voice reply:
+
+    VOICE (0)  >  DOCS (1)  >  REVIEW (2)  >  INGEST (3)
+
+A token bucket caps the request rate, the background classes (REVIEW,
+INGEST) may only hold LLM_BACKGROUND_SLOTS workers between them, every request carries a deadline,
+transient API errors (429/5xx/timeouts) are retried with jittered
+exponential backoff, and queued or backing-off requests can be cancelled.
+stream() hands reply fragments to the caller as Gemini produces them.
+A request may carry a system prompt; it is set once as the model's
+system_instruction rather than pasted into every message.
+Queue wait, time to first fragment, API time and end-to-end latency are
+tracked per class and broadcast on TOPIC["cortex_stats"].
+"""
+
+import time
+import queue
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future, CancelledError, TimeoutError as WaitTimeout
+
+import dna
+
+try:
+    import google.generativeai as genai
+    genai.configure(api_key=dna.GEMINI_API_KEY)
+    GEMINI_MODEL = genai.GenerativeModel(dna.GEMINI_MODEL_NAME)
+    GEMINI_AVAILABLE = True
+except Exception:
+    GEMINI_AVAILABLE = False
+    print("  [CORTEX] Gemini not available")
+
+try:
+    from google.api_core import exceptions as gexc
+    RETRYABLE = (gexc.TooManyRequests, gexc.ResourceExhausted, gexc.ServiceUnavailable,
+                 gexc.InternalServerError, gexc.DeadlineExceeded)
+except ImportError:
+    RETRYABLE = ()
+
+VOICE, DOCS, REVIEW, INGEST = 0, 1, 2, 3
+CLASS_NAMES = {VOICE: "voice", DOCS: "docs", REVIEW: "review", INGEST: "ingest"}
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, RETRYABLE + (TimeoutError, ConnectionError)):
+        return True
+    msg = str(e).lower()
+    return any(s in msg for s in ("429", "500", "503", "timed out", "deadline", "unavailable"))
+
+
+def _pct(samples, q: float):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+
+class Thought(Future):
+    """Future for one LLM request. cancel() also works while the request
+    is waiting to retry; an attempt already on the wire is simply discarded."""
+
+    def __init__(self, prompt, priority: int, history, deadline: float, seq: int,
+                 stream: bool = False, system: str = None):
+        super().__init__()
+        self.prompt     = prompt
+        self.priority   = priority
+        self.history    = history
+        self.system     = system
+        self.deadline   = deadline
+        self.seq        = seq
+        self.submitted  = time.monotonic()
+        self.not_before = 0.0
+        self.attempts   = 0
+        self.abandoned  = False
+        self.emitted    = False  # Streaming: a fragment already reached the caller (no retry)
+        self.sink       = queue.Queue() if stream else None
+        if stream:
+            self.add_done_callback(lambda t: t.sink.put(None))
+
+    def cancel(self) -> bool:
+        self.abandoned = True
+        return super().cancel() or not self.done()
+
+
+class _Bucket:
+    """Token bucket: `rate` requests per minute, bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate   = rate / 60.0
+        self.burst  = max(1, burst)
+        self.tokens = float(self.burst)
+        self.stamp  = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 = take one now)."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp  = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        if self.rate > 0:
+            self.tokens -= 1
+
+
+class Cortex:
+    def __init__(self, synapse=None):
+        self.synapse   = synapse
+        self.available = GEMINI_AVAILABLE
+        self.running   = True
+
+        self._cond     = threading.Condition()
+        self._queue    = []        # Thought objects waiting (or backing off)
+        self._seq      = 0
+        self._inflight = {c: 0 for c in CLASS_NAMES}
+        self._bucket   = _Bucket(dna.LLM_RATE_PER_MIN, dna.LLM_BURST)
+        self._models   = {}        # system prompt -> GenerativeModel
+
+        self._counts  = {c: {"submitted": 0, "ok": 0, "failed": 0, "timeouts": 0,
+                             "retries": 0, "cancelled": 0} for c in CLASS_NAMES}
+        self._samples = {c: {k: deque(maxlen=200) for k in ("wait_ms", "first_ms", "api_ms", "total_ms")}
+                         for c in CLASS_NAMES}
+
+        for i in range(max(1, dna.LLM_CONCURRENCY)):
+            threading.Thread(target=self._worker, name=f"cortex-{i}", daemon=True).start()
+        if synapse and dna.CORTEX_STATS_INTERVAL:
+            threading.Thread(target=self._stats_loop, name="cortex-stats", daemon=True).start()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def submit(self, prompt, priority: int = DOCS, history: list = None,
+               timeout: float = None, stream: bool = False, system: str = None) -> Thought:
+        """Queue a request; returns a Thought whose result() is the reply text.
+        history: prior turns as [{"role": "user"|"model", "parts": [...]}].
+        stream: fragments are also pushed to thought.sink (None marks the end).
+        system: system instruction for the model (not repeated in the history)."""
+        timeout = timeout or dna.LLM_TIMEOUT
+        with self._cond:
+            self._seq += 1
+            thought = Thought(prompt, priority, history, time.monotonic() + timeout, self._seq, stream, system)
+            if not self.available:
+                thought.set_exception(RuntimeError("Gemini not available"))
+                return thought
+            self._counts[priority]["submitted"] += 1
+            self._queue.append(thought)
+            self._cond.notify()
+        return thought
+
+    def ask(self, prompt, priority: int = DOCS, history: list = None, timeout: float = None,
+            system: str = None) -> str:
+        """Blocking convenience wrapper: reply text, or raises (TimeoutError on deadline)."""
+        timeout = timeout or dna.LLM_TIMEOUT
+        thought = self.submit(prompt, priority, history, timeout, system=system)
+        try:
+            return thought.result(timeout + 1.0)
+        except (WaitTimeout, TimeoutError):
+            thought.cancel()
+            raise
+
+    def stream(self, prompt, priority: int = VOICE, history: list = None, timeout: float = None,
+               system: str = None):
+        """Generator of reply fragments as they arrive. Raises like ask() if the
+        request fails; closing the generator early cancels the request."""
+        timeout  = timeout or dna.LLM_TIMEOUT
+        thought  = self.submit(prompt, priority, history, timeout, stream=True, system=system)
+        deadline = time.monotonic() + timeout + 1.0
+        try:
+            while True:
+                try:
+                    piece = thought.sink.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    raise TimeoutError("LLM stream timed out")
+                if piece is None:
+                    break
+                yield piece
+            thought.result(0)  # Surface a failure that ended the stream
+        finally:
+            if not thought.done():
+                thought.cancel()
+
+    def cancel_all(self, priority: int):
+        """Drop every queued request of one class (e.g. stale reviews)."""
+        with self._cond:
+            for thought in [t for t in self._queue if t.priority == priority]:
+                thought.cancel()
+
+    def shutdown(self):
+        self.running = False
+        with self._cond:
+            for thought in self._queue:
+                thought.cancel()
+            self._queue.clear()
+            self._cond.notify_all()
+
+    # ── Scheduling ────────────────────────────────────────────────────────
+
+    def _eligible(self, thought: Thought, now: float) -> bool:
+        if thought.not_before > now:
+            return False
+        if thought.priority < REVIEW:
+            return True
+        return self._inflight[REVIEW] + self._inflight[INGEST] < dna.LLM_BACKGROUND_SLOTS
+
+    def _next(self) -> Thought | None:
+        """Block until the best eligible request may be sent, then claim it."""
+        with self._cond:
+            while self.running:
+                now = time.monotonic()
+                for thought in list(self._queue):
+                    if thought.abandoned or thought.cancelled():
+                        self._queue.remove(thought)
+                        self._finish_cancelled(thought)
+                    elif thought.deadline <= now:
+                        self._queue.remove(thought)
+                        self._counts[thought.priority]["timeouts"] += 1
+                        thought.set_exception(TimeoutError("LLM request expired in queue"))
+
+                ready = [t for t in self._queue if self._eligible(t, now)]
+                if not ready:
+                    wake = [t.not_before - now for t in self._queue if t.not_before > now]
+                    wake += [t.deadline - now for t in self._queue]
+                    self._cond.wait(min(wake) if wake else None)
+                    continue
+                wait = self._bucket.wait_time()
+                if wait > 0:
+                    self._cond.wait(wait)  # Re-pick afterwards: something more urgent may have arrived
+                    continue
+
+                best = min(ready, key=lambda t: (t.priority, t.seq))
+                self._queue.remove(best)
+                if not best.running() and not best.set_running_or_notify_cancel():
+                    self._finish_cancelled(best)
+                    continue
+                self._bucket.take()
+                self._inflight[best.priority] += 1
+                return best
+        return None
+
+    def _finish_cancelled(self, thought: Thought):
+        self._counts[thought.priority]["cancelled"] += 1
+        if thought.running():
+            thought.set_exception(CancelledError())
+
+    def _worker(self):
+        while self.running:
+            thought = self._next()
+            if thought is None:
+                return
+            cls = thought.priority
+            if thought.attempts == 0:
+                self._samples[cls]["wait_ms"].append((time.monotonic() - thought.submitted) * 1000)
+            thought.attempts += 1
+            started = time.monotonic()
+            try:
+                reply = self._call(thought)
+                error = None
+            except Exception as e:
+                reply, error = None, e
+            api_ms = (time.monotonic() - started) * 1000
+
+            with self._cond:
+                self._inflight[cls] -= 1
+                self._samples[cls]["api_ms"].append(api_ms)
+                if thought.abandoned:
+                    self._finish_cancelled(thought)
+                elif error is None:
+                    self._counts[cls]["ok"] += 1
+                    self._samples[cls]["total_ms"].append((time.monotonic() - thought.submitted) * 1000)
+                    thought.set_result(reply)
+                elif (_retryable(error) and thought.attempts <= dna.LLM_RETRIES
+                      and not thought.emitted and time.monotonic() < thought.deadline):
+                    backoff = min(dna.LLM_BACKOFF_MAX, dna.LLM_BACKOFF_BASE * 2 ** (thought.attempts - 1))
+                    thought.not_before = time.monotonic() + backoff * random.uniform(0.5, 1.0)
+                    self._counts[cls]["retries"] += 1
+                    self._queue.append(thought)
+                    print(f"  [CORTEX] {CLASS_NAMES[cls]} request retry {thought.attempts}: {error}")
+                else:
+                    self._counts[cls]["failed"] += 1
+                    thought.set_exception(error)
+                self._cond.notify_all()
+
+    def _model(self, system: str = None):
+        if not system:
+            return GEMINI_MODEL
+        with self._cond:
+            model = self._models.get(system)
+            if model is None:
+                if len(self._models) >= 8:  # Prompts change rarely; don't grow without bound
+                    self._models.clear()
+                model = genai.GenerativeModel(dna.GEMINI_MODEL_NAME, system_instruction=system)
+                self._models[system] = model
+            return model
+
+    def _call(self, thought: Thought) -> str:
+        remaining = max(1.0, thought.deadline - time.monotonic())
+        contents  = (thought.history + [{"role": "user", "parts": [thought.prompt]}]
+                     if thought.history else thought.prompt)
+        model     = self._model(thought.system)
+        if thought.sink is None:
+            response = model.generate_content(contents, request_options={"timeout": remaining})
+            return response.text.strip()
+
+        parts = []
+        for chunk in model.generate_content(contents, stream=True,
+                                                   request_options={"timeout": remaining}):
+            if thought.abandoned:
+                break  # Stop reading; the caller has gone away
+            text = chunk.text
+            if not text:
+                continue
+            if not thought.emitted:
+                thought.emitted = True
+                self._samples[thought.priority]["first_ms"].append(
+                    (time.monotonic() - thought.submitted) * 1000)
+            parts.append(text)
+            thought.sink.put(text)
+        return "".join(parts).strip()
+
+    # ── Metrics ───────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        with self._cond:
+            classes = {}
+            for cls, name in CLASS_NAMES.items():
+                s = self._samples[cls]
+                classes[name] = {
+                    **self._counts[cls],
+                    "queued":    sum(1 for t in self._queue if t.priority == cls),
+                    "in_flight": self._inflight[cls],
+                    "wait_ms_p50":  _pct(s["wait_ms"], 0.5),  "wait_ms_p95":  _pct(s["wait_ms"], 0.95),
+                    "first_ms_p50": _pct(s["first_ms"], 0.5), "first_ms_p95": _pct(s["first_ms"], 0.95),
+                    "api_ms_p50":   _pct(s["api_ms"], 0.5),   "api_ms_p95":   _pct(s["api_ms"], 0.95),
+                    "total_ms_p50": _pct(s["total_ms"], 0.5), "total_ms_p95": _pct(s["total_ms"], 0.95),
+                }
+            return {"ts": round(time.time(), 3), "available": self.available,
+                    "bucket_tokens": round(self._bucket.tokens, 2), "classes": classes}
+
+    def _stats_loop(self):
+        while self.running:
+            time.sleep(dna.CORTEX_STATS_INTERVAL)
+            self.synapse.publish(dna.TOPIC["cortex_stats"], self.stats())
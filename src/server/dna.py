@@ -10,6 +10,9 @@ PHONE_IP     = "192.168.1.101"   # Redmi Note 12 static IP
 TABLET_IP    = "192.168.1.102"   # Tablet static IP
 MQTT_BROKER  = LAPTOP_IP
 MQTT_PORT    = 1883
+MQTT_CONNECT_TIMEOUT = 5.0       # Seconds startup waits before going on offline
+MQTT_RECONNECT_MIN   = 1         # Reconnect backoff: doubles from min to max seconds
+MQTT_RECONNECT_MAX   = 30
 
 CAMERA_URL   = f"http://{PHONE_IP}:4747/video"   # DroidCam stream URL
 DASHBOARD_PORT = 8501
@@ -19,6 +22,7 @@ WEB_PORT       = 5000
 GEMINI_API_KEY      = "YOUR_GEMINI_API_KEY_HERE"        # aistudio.google.com
 ELEVENLABS_API_KEY  = ""   # Optional — leave blank to use edge-TTS (free)
 ELEVENLABS_VOICE_ID = "pNInz6obpgDQGcFmaJgB"  # "Adam" — change as you like
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"  # Point at a local stub server for tests
 OPENWEATHER_API_KEY = ""   # Optional — for weather queries
 
 # ── Face Recognition ─────────────────────────────────────────
@@ -41,6 +45,9 @@ HEAD_TRACK_ENABLED   = True     # Enable head servo tracking
 # ── Audio ─────────────────────────────────────────────────────
 AUDIO_SAMPLE_RATE    = 22050
 AUDIO_CHUNK_DURATION = 2.0      # Seconds per audio classification window
+CAPTURE_SAMPLE_RATE  = 48000    # Shared mic stream (ANTENNA); consumers get resampled taps
+CAPTURE_BLOCK_MS     = 20       # PortAudio callback block
+CAPTURE_RING_SECONDS = 10.0     # History per rate; a reader further behind skips ahead
 AUDIO_CLASSES = [
     "air_conditioner", "car_horn", "children_playing",
     "dog_bark", "drilling", "engine_idling",
@@ -62,16 +69,103 @@ VOLTAGE_DIVIDER_RATIO    = 2.0  # R1=R2=10kΩ so ratio=2
 
 # ── Voice ─────────────────────────────────────────────────────
 WAKE_WORD          = "hey jinx"
+WAKE_THRESHOLD     = 0.70        # Min mean word confidence to fire the spotter (lower = more sensitive)
+WAKE_RING_SECONDS  = 2.0         # Audio buffered for the spotter; oldest dropped if it falls behind
 VOICE_TIMEOUT      = 5          # Seconds to wait for command after wake word
 USE_OFFLINE_STT    = True       # Vosk (offline) or Google (online, more accurate)
+VOSK_MODEL_PATH    = "models/vosk-model"
+STT_SAMPLE_RATE    = 16000       # Vosk models are trained at 16 kHz
+STT_BLOCK_MS       = 30          # Mic block fed to the streaming recognizer per step
+STT_PREROLL        = 0.5         # Seconds of audio kept from before listening starts
+STT_START_MAX      = 5.0         # Vosk endpointer: give up if speech hasn't started by then
+STT_ENDPOINT_SILENCE = 0.6       # Trailing silence (s) that ends an utterance
+STT_MAX_UTTERANCE  = 10.0        # Hard cap on one utterance (s)
 VOICE_GENDER       = "male"     # edge-TTS voice gender if ElevenLabs not set
 # Edge-TTS voice options: "en-US-GuyNeural", "en-US-JasonNeural", "en-IN-PrabhatNeural"
 EDGE_TTS_VOICE     = "en-US-GuyNeural"
+TTS_MIN_SENTENCE   = 20          # Chars before a streamed reply is cut at a sentence end and spoken
+TTS_MAX_SENTENCE   = 220         # Run-on text is cut at a comma/space past this
+VOICEBANK_DIR      = "data/voicebank"  # Cached TTS clips, keyed by engine + voice + text
+VOICEBANK_MEMORY_MB = 16         # In-memory clip LRU (instant playback)
+VOICEBANK_DISK_MB  = 200         # On-disk clip LRU (survives restarts, works offline)
+PLAYBACK_RATE      = 48000       # Resonator output stream; clips are resampled to it
+PLAYBACK_BLOCK_MS  = 20          # Output callback block
+BARGE_IN           = True        # Saying the wake word while JINX talks cuts the speech off
+MUSIC_VOLUME       = 80          # mpv volume (0-100) for music
+DUCK_VOLUME        = 25          # Music volume while JINX is speaking
+DUCK_RELEASE       = 0.6         # Seconds of silence before music comes back up
+MUSIC_DIR          = "data/music"  # Local library; matching tracks play instantly and offline
+MUSIC_CACHE_DB     = "data/jukebox.db"  # Resolved yt-dlp URLs, survive restarts
+MUSIC_CACHE_SIZE   = 200         # LRU bound on cached queries
+MUSIC_URL_TTL      = 3 * 3600    # URL lifetime when it carries no expire= parameter
+MUSIC_EXPIRY_MARGIN = 600        # Treat URLs as dead this many seconds before they expire
+MUSIC_RESOLVE_TIMEOUT = 15       # Seconds for one yt-dlp lookup
+MUSIC_RESCAN       = 300         # Seconds between local library rescans
+MUSIC_WARM_QUERIES = ["lofi hip hop", "synthwave"]  # Always kept resolved
+MUSIC_WARM_TOP     = 10          # ...plus this many of the most requested queries
+MUSIC_WARM_INTERVAL = 1800       # Seconds between warm passes
+TTS_TIMEOUT        = 20          # Seconds for one synthesized clip
+INTENT_THRESHOLD   = 0.6         # Local command confidence below which Gemini handles it as chat
+NEAREST_THRESHOLD  = 0.85        # Same, for paraphrase (nearest-example) matches
+SPECTRE_HISTORY    = 200         # Voice traces kept for latency percentiles
+
+# ── Network (Uplink) ──────────────────────────────────────────
+UPLINK_POOL_SIZE       = 4       # Keep-alive connections per provider host
+UPLINK_KEEPALIVE       = 60      # Seconds an idle pooled connection stays open
+UPLINK_CONNECT_TIMEOUT = 5
+UPLINK_READ_TIMEOUT    = 15
 
 # ── AI Agent ──────────────────────────────────────────────────
 DOCUMENTS_DIR      = "data/documents"    # Upload PDFs/docs here for Q&A
+DOCUMENT_INDEX_DB  = "data/document_index.db"  # Extracted text + chunk index, survives restarts
+INGEST_WORKERS     = 2           # Threads extracting/indexing new or changed documents
+WATCH_DEBOUNCE     = 0.5         # Seconds a file must be quiet before its change is handled
+WATCH_POLL_INTERVAL = 2.0        # Fallback polling period when watchdog (inotify) isn't installed
+PDF_WORKERS        = 4           # Processes extracting PDF pages in parallel
+PDF_PAGE_BATCH     = 16          # Pages per extraction task (smaller PDFs stay in-process)
+DOC_MAX_CHARS      = 4_000_000   # Per-document text cap; extraction stops past this
 WATCH_CODE_DIR     = ""                  # Set to your project folder for code review
+CODE_WATCH_DB      = "data/code_watch.db"  # Content-hash cache for watched code (survives restarts)
+CODE_DEBOUNCE      = 2.0         # Seconds of quiet after the last save before a file is reviewed
+CODE_IGNORE_DIRS   = {".git", "node_modules", ".venv", "venv", "__pycache__", ".mypy_cache",
+                      ".pytest_cache", ".tox", "dist", "build"}  # Never watched, on top of .gitignore
+REVIEW_CONTEXT_LINES = 3         # Unchanged lines around each diff hunk sent for review
+REVIEW_MAX_HUNKS   = 12          # More hunks than this (or most of the file changed) = full review
+REVIEW_CACHE_PER_FILE = 200      # Hunk reviews remembered per watched file
 MAX_CONTEXT_TOKENS = 32000
+CHUNK_SIZE         = 1200        # Characters per retrieval chunk
+CHUNK_OVERLAP      = 200         # Characters shared between neighbouring chunks
+RETRIEVAL_TOP_K    = 6           # Chunks sent to Gemini per question
+EMBEDDING_MODEL    = ""          # e.g. "all-MiniLM-L6-v2" (sentence-transformers); blank = BM25 only
+EMBEDDING_WEIGHT   = 0.5         # Dense vs BM25 share of the blended score
+SUMMARY_SECTION_CHUNKS = 8       # Chunks per section summary (one background LLM call each)
+SUMMARY_FANOUT     = 10          # Summaries merged per call while condensing toward the document summary
+SUMMARY_TIMEOUT    = 600.0       # Background summaries may wait a long time behind interactive traffic
+
+# ── LLM (Cortex) ──────────────────────────────────────────────
+GEMINI_MODEL_NAME  = "gemini-2.0-flash"
+LLM_CONCURRENCY    = 3           # Gemini requests in flight at once
+LLM_BACKGROUND_SLOTS = 1         # Of those, at most this many background jobs (code reviews, summaries)
+LLM_RATE_PER_MIN   = 15          # Token bucket refill (0 = unlimited); free tier is 15 RPM
+LLM_BURST          = 5           # Token bucket size
+LLM_TIMEOUT        = 30.0        # Seconds per request, queueing + retries included
+LLM_VOICE_TIMEOUT  = 12.0        # Tighter deadline for spoken replies — better a quip than silence
+GHOST_TOKEN_BUDGET = 1500        # Verbatim chat history (est. tokens) before old turns are summarized
+GHOST_MAX_TURNS    = 12          # ...or this many exchanges, whichever comes first
+GHOST_KEEP_TURNS   = 4           # Exchanges kept verbatim after a fold
+GHOST_SUMMARY_WORDS = 150        # Cap on the running summary
+LLM_RETRIES        = 3           # Retries on 429/5xx/timeouts
+LLM_BACKOFF_BASE   = 1.0         # Seconds; doubles per retry, jittered
+LLM_BACKOFF_MAX    = 10.0
+CORTEX_STATS_INTERVAL = 10       # Seconds between TOPIC["cortex_stats"] broadcasts (0 = off)
+ENGRAM_DB          = "data/engram.db"  # Cached LLM responses, survive restarts
+ENGRAM_MAX_ENTRIES = 2000        # LRU bound (memory and disk)
+ENGRAM_SIMILARITY  = 0.8         # Token Jaccard for near-duplicate prompts (1.0 = exact only)
+ENGRAM_TTL = {                   # Seconds a cached answer stays valid, per namespace
+    "docs":    7 * 86400,        # Keyed by source-document hashes, so edits invalidate anyway
+    "summary": 30 * 86400,
+    "default": 3600,
+}
 
 # ── Network Monitoring ────────────────────────────────────────
 NETWORK_SCAN_INTERVAL = 60      # Seconds between network scans
@@ -114,7 +208,74 @@ TOPIC = {
     "network_stats": "jinx/network_stats",
     "depth":         "jinx/depth",
     "web_command":   "jinx/web_command",
+    "batch":         "jinx/batch",
+    "synapse_stats": "jinx/synapse_stats",
+    "cortex_stats":  "jinx/cortex_stats",
+    "voice_trace":   "jinx/voice_trace",
+}
+
+# ── Synapse Transport ─────────────────────────────────────────
+# "mqtt":     every message round-trips through the broker
+# "hybrid":   modules in this process talk directly; only BRIDGE_TOPICS
+#             are mirrored to MQTT for the ESP32 and the web panel
+# "loopback": no broker at all (tests, offline runs)
+SYNAPSE_TRANSPORT = "hybrid"
+# Server → ESP32: the topics the firmware subscribes to, and whose JSON it parses
+DEVICE_TOPICS = {"eyes", "head_track", "eye_track", "motor", "led", "sound", "buzzer", "mode", "command"}
+BRIDGE_TOPICS = DEVICE_TOPICS | {
+    # ESP32 → Server
+    "sensors", "battery", "status", "alerts",
+    # Server ↔ web panel
+    "frame", "audio", "doom_level", "network_stats", "web_command", "synapse_stats",
+    "cortex_stats", "voice_trace",
+}
+SYNAPSE_WORKERS = 16            # Dispatcher threads running subscriber callbacks
+SYNAPSE_STATS_INTERVAL = 10     # Seconds between TOPIC["synapse_stats"] broadcasts (0 = off)
+STAMP_TOPICS = {"web_command", "audio"}  # Dict payloads get a "_ts" latency header (never DEVICE_TOPICS)
+
+# ── Publish Policies ──────────────────────────────────────────
+# Per-topic shaping applied inside Synapse.publish (keys match TOPIC).
+#   max_rate:    coalesce to the latest value, at most N messages/sec
+#   change_only: drop a publish identical to the last one sent...
+#   refresh:     ...unless it is older than this many seconds
+#   batch:       bundle into one TOPIC["batch"] envelope per BATCH_WINDOW
+#                (only for topics the ESP32 doesn't read — it can't unpack)
+PUBLISH_POLICY = {
+    "doom_level":    {"max_rate": 2,  "change_only": True, "refresh": 10, "batch": True},
+    "network_stats": {"change_only": True, "batch": True},
+    "head_track":    {"max_rate": 15, "change_only": True},
+    "eye_track":     {"max_rate": 15, "change_only": True},
+    "eyes":          {"max_rate": 10, "change_only": True, "refresh": 5},
+    "led":           {"max_rate": 10, "change_only": True, "refresh": 5},
+}
+BATCH_WINDOW = 0.25             # Seconds a batch envelope collects updates
+
+# ── Offline Buffer ────────────────────────────────────────────
+# Publishes made while the broker is down are replayed on reconnect,
+# lowest number first. None = live-only, dropped while offline.
+OFFLINE_PRIORITY = {
+    "alerts":     0,
+    "motor":      0,
+    "buzzer":     1,
+    "mode":       1,
+    "command":    2,
+    "web_command": 2,
+    "eyes":       3,
+    "led":        3,
+    "sound":      3,
+    "frame":      None,
+    "head_track": None,
+    "eye_track":  None,
+    "doom_level": None,
+    "synapse_stats": None,
+    "cortex_stats":  None,
+    "voice_trace":   None,
 }
+OFFLINE_DEFAULT_PRIORITY = 4
+OFFLINE_QUEUE_MAX        = 500
+OFFLINE_MAX_AGE          = 30.0  # Seconds — older buffered messages are stale, not replayed
+REPLAY_BACKOFF_BASE      = 0.05  # Seconds to wait when a replayed publish is refused; doubles per retry
+REPLAY_BACKOFF_MAX       = 2.0
 
 # ── Operating Modes ────────────────────────────────────────────
 class Mode:
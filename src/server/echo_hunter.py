@@ -2,15 +2,16 @@
 ECHO HUNTER.PY — AUDIO CLASSIFICATION
 CNN-based environmental sound detection.
 Detects: gunshots, screams, sirens, glass breaking, and more.
+Listens through a 22050 Hz ANTENNA tap, so windows are back-to-back.
 """
 
-import json
 import time
 import threading
 import numpy as np
 import dna
 from blackbox import Blackbox
 from synapse  import Synapse
+from antenna  import Antenna
 
 try:
     import sounddevice as sd
@@ -27,9 +28,11 @@ except ImportError:
 
 
 class EchoHunter:
-    def __init__(self, synapse: Synapse, blackbox: Blackbox):
+    def __init__(self, synapse: Synapse, blackbox: Blackbox, antenna: Antenna = None):
         self.synapse   = synapse
         self.blackbox  = blackbox
+        self.antenna   = antenna
+        self.tap       = None
         self.running   = False
         self.model     = None
         self.mode      = dna.DEFAULT_MODE
@@ -39,7 +42,7 @@ class EchoHunter:
         else:
             print("  [ECHO] TensorFlow not available — audio CNN disabled")
 
-        synapse.subscribe(dna.TOPIC["mode"], lambda p: setattr(self, "mode", p.strip()))
+        synapse.subscribe(dna.TOPIC["mode"], lambda p: setattr(self, "mode", p.text.strip()))
 
     def _load_model(self):
         import os
@@ -53,6 +56,8 @@ class EchoHunter:
     def _record_chunk(self, duration: float = None) -> np.ndarray:
         """Record a chunk of audio."""
         dur = duration or dna.AUDIO_CHUNK_DURATION
+        if self.tap:
+            return self.tap.read(int(dur * dna.AUDIO_SAMPLE_RATE), timeout=dur + 1)
         return sd.rec(
             int(dur * dna.AUDIO_SAMPLE_RATE),
             samplerate=dna.AUDIO_SAMPLE_RATE,
@@ -93,16 +98,20 @@ class EchoHunter:
             return
 
         self.running = True
+        if self.antenna and self.antenna.running:
+            self.tap = self.antenna.tap(dna.AUDIO_SAMPLE_RATE)
         print("  [ECHO] Audio monitoring started")
 
         while self.running:
             try:
                 audio  = self._record_chunk()
+                if audio is None:
+                    continue
                 result = self.freq_hunt(audio)
 
                 # Only publish if confident
                 if result["confidence"] > 0.70:
-                    self.synapse.publish(dna.TOPIC["audio"], json.dumps(result))
+                    self.synapse.publish(dna.TOPIC["audio"], result)
 
                     label = result["label"]
                     conf  = result["confidence"]
@@ -124,3 +133,6 @@ class EchoHunter:
 
     def stop(self):
         self.running = False
+        if self.tap:
+            self.tap.close()
+            self.tap = None
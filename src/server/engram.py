@@ -0,0 +1,167 @@
+"""
+ENGRAM.PY — LLM RESPONSE CACHE
+Remembers what Gemini said so JINX doesn't pay for the same answer twice.
+Entries are keyed by namespace + normalized prompt + a version string
+(e.g. the hashes of the documents an answer was drawn from), so editing a
+document silently invalidates every answer built on it.
+
+Lookups try the exact key first, then — optionally — the closest
+near-duplicate prompt in the same namespace and version (token Jaccard ≥
+ENGRAM_SIMILARITY, with identical numbers and single letters, so "page 3"
+never answers "page 4"). Entries expire per-namespace (ENGRAM_TTL), the
+least-recently-used are evicted past ENGRAM_MAX_ENTRIES, and everything
+persists in SQLite so the cache survives restarts.
+"""
+
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+import dna
+from oracle import tokenize, STOPWORDS
+
+_PUNCT_RE  = re.compile(r"[^\w\s]")
+_SPACE_RE  = re.compile(r"\s+")
+_CLITICS   = {"s", "t", "d", "m"}  # What normalize() leaves of "what's", "don't", "i'd", "i'm"
+
+
+def normalize(prompt: str) -> str:
+    return _SPACE_RE.sub(" ", _PUNCT_RE.sub(" ", prompt.lower())).strip()
+
+
+def _terms(prompt: str) -> set:
+    """Similarity tokens: content words plus the single characters tokenize()
+    drops ("page 3", "part b")."""
+    single = {w for w in normalize(prompt).split() if len(w) == 1 and w not in STOPWORDS | _CLITICS}
+    return set(tokenize(prompt)) | single
+
+
+def _marks(tokens: set) -> set:
+    """Numbers and single letters: the tokens a near-duplicate must share exactly."""
+    return {t for t in tokens if len(t) == 1 or any(c.isdigit() for c in t)}
+
+
+class Engram:
+    def __init__(self, db_path: str = None):
+        self._lock   = threading.Lock()
+        self.entries = OrderedDict()  # key -> {"ns", "version", "tokens", "response", "created"}; LRU order
+        self.counts  = {"hits": 0, "near_hits": 0, "misses": 0, "expired": 0, "evicted": 0}
+
+        db_path = db_path or dna.ENGRAM_DB
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS engrams (
+                key      TEXT PRIMARY KEY,
+                ns       TEXT,
+                version  TEXT,
+                prompt   TEXT,
+                response TEXT,
+                created  REAL,
+                last_hit REAL
+            )
+        """)
+        self.conn.commit()
+        self._load()
+
+    def _load(self):
+        now = time.time()
+        rows = self.conn.execute(
+            "SELECT key, ns, version, prompt, response, created FROM engrams ORDER BY last_hit DESC LIMIT ?",
+            (dna.ENGRAM_MAX_ENTRIES,)).fetchall()
+        for key, ns, version, prompt, response, created in reversed(rows):
+            if now - created <= self._ttl(ns):
+                self.entries[key] = {"ns": ns, "version": version, "tokens": _terms(prompt),
+                                     "response": response, "created": created}
+        self.conn.execute("DELETE FROM engrams WHERE key NOT IN (%s)" % ",".join("?" * len(self.entries)),
+                          list(self.entries))
+        self.conn.commit()
+        if self.entries:
+            print(f"  [ENGRAM] Loaded {len(self.entries)} cached responses")
+
+    @staticmethod
+    def _ttl(ns: str) -> float:
+        return dna.ENGRAM_TTL.get(ns, dna.ENGRAM_TTL.get("default", 3600))
+
+    @staticmethod
+    def _key(ns: str, norm: str, version: str) -> str:
+        return hashlib.sha1(f"{ns}\x00{version}\x00{norm}".encode()).hexdigest()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def recall(self, ns: str, prompt: str, version: str = "", similar: bool = True) -> str | None:
+        """Cached response for this prompt, or None."""
+        norm = normalize(prompt)
+        key  = self._key(ns, norm, version)
+        now  = time.time()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None and similar and dna.ENGRAM_SIMILARITY < 1.0:
+                key, entry = self._nearest(ns, version, _terms(norm))
+                if entry is not None:
+                    self.counts["near_hits"] += 1
+            elif entry is not None:
+                self.counts["hits"] += 1
+            if entry is None:
+                self.counts["misses"] += 1
+                return None
+            if now - entry["created"] > self._ttl(ns):
+                self._drop(key)
+                self.counts["expired"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.conn.execute("UPDATE engrams SET last_hit=? WHERE key=?", (now, key))
+            self.conn.commit()
+            return entry["response"]
+
+    def remember(self, ns: str, prompt: str, response: str, version: str = ""):
+        norm = normalize(prompt)
+        key  = self._key(ns, norm, version)
+        now  = time.time()
+        with self._lock:
+            self.entries[key] = {"ns": ns, "version": version, "tokens": _terms(norm),
+                                 "response": response, "created": now}
+            self.entries.move_to_end(key)
+            self.conn.execute("INSERT OR REPLACE INTO engrams VALUES (?,?,?,?,?,?,?)",
+                              (key, ns, version, norm, response, now, now))
+            while len(self.entries) > dna.ENGRAM_MAX_ENTRIES:
+                self._drop(next(iter(self.entries)))
+                self.counts["evicted"] += 1
+            self.conn.commit()
+
+    def forget(self, ns: str = None):
+        """Drop one namespace (or everything)."""
+        with self._lock:
+            for key in [k for k, e in self.entries.items() if ns is None or e["ns"] == ns]:
+                self._drop(key)
+            self.conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self.entries), **self.counts}
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    def _nearest(self, ns: str, version: str, tokens: set):
+        if not tokens:
+            return None, None
+        marks = _marks(tokens)
+        best, best_key, best_score = None, None, dna.ENGRAM_SIMILARITY
+        for key, entry in self.entries.items():
+            if entry["ns"] != ns or entry["version"] != version or not entry["tokens"]:
+                continue
+            if _marks(entry["tokens"]) != marks:
+                continue  # Different page/chapter/section number: a different question
+            score = len(tokens & entry["tokens"]) / len(tokens | entry["tokens"])
+            if score >= best_score:
+                best, best_key, best_score = entry, key, score
+        return best_key, best
+
+    def _drop(self, key: str):
+        self.entries.pop(key, None)
+        self.conn.execute("DELETE FROM engrams WHERE key=?", (key,))
@@ -8,6 +8,7 @@ Usage:
     python server/genesis.py --sentinel
     python server/genesis.py --no-vision --no-audio
     python server/genesis.py --agent-mode  (code review / doc Q&A focus)
+    python server/genesis.py --loopback    (no Mosquitto — in-process bus only)
 """
 
 import sys
@@ -23,15 +24,6 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(__file__))
 
 import dna
-from synapse    import Synapse
-from blackbox   import Blackbox
-from psyche     import Psyche
-from optic      import Optic
-from vocoder    import Vocoder
-from echo_hunter import EchoHunter
-from ice_wall   import IceWall
-from hivemind   import Hivemind
-from agent      import Agent
 
 
 BANNER = r"""
@@ -57,6 +49,7 @@ def parse_args():
     parser.add_argument("--no-network",  action="store_true", help="Skip network monitoring")
     parser.add_argument("--no-dashboard",action="store_true", help="Skip Streamlit dashboard")
     parser.add_argument("--no-web",      action="store_true", help="Skip web control server")
+    parser.add_argument("--loopback",    action="store_true", help="In-process message bus only (no MQTT broker)")
     return parser.parse_args()
 
 
@@ -82,6 +75,22 @@ class Deskbot:
         time.sleep(0.1)
 
     def startup(self):
+        # Module imports live here, not at the top of the file: SCRIBE's PDF
+        # workers are spawned and re-import __main__ (this file), and must not
+        # load the vision and audio stack just to read a PDF
+        from synapse    import Synapse
+        from blackbox   import Blackbox
+        from psyche     import Psyche
+        from cortex     import Cortex
+        from engram     import Engram
+        from optic      import Optic
+        from vocoder    import Vocoder
+        from echo_hunter import EchoHunter
+        from antenna    import Antenna
+        from ice_wall   import IceWall
+        from hivemind   import Hivemind
+        from agent      import Agent
+
         print(BANNER)
         print(f"  Starting in \033[96m{self.mode.upper()}\033[0m mode")
         print(f"  {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -89,7 +98,7 @@ class Deskbot:
 
         try:
             # 1. SYNAPSE — MQTT must come first (everything uses it)
-            synapse = Synapse()
+            synapse = Synapse(transport="loopback" if self.args.loopback else None)
             synapse.connect()
             self.modules["synapse"] = synapse
             self._init_print("SYNAPSE (MQTT Bridge)")
@@ -104,6 +113,15 @@ class Deskbot:
             self.modules["psyche"] = psyche
             self._init_print("PSYCHE (Personality Matrix)")
 
+            # 3b. CORTEX — Shared LLM executor
+            cortex = Cortex(synapse)
+            self.modules["cortex"] = cortex
+            self._init_print("CORTEX (LLM Executor)")
+
+            engram = Engram()
+            self.modules["engram"] = engram
+            self._init_print("ENGRAM (Response Cache)")
+
             # 4. OPTIC — Vision
             if not self.args.no_vision:
                 optic = Optic(synapse, blackbox)
@@ -112,9 +130,19 @@ class Deskbot:
             else:
                 self._init_print("OPTIC (Visual Cortex) — SKIPPED", "~")
 
+            # 4b. ANTENNA — One shared microphone stream for every listener
+            antenna = None
+            if not (self.args.no_voice and self.args.no_audio):
+                antenna = Antenna()
+                if antenna.start():
+                    self.modules["antenna"] = antenna
+                    self._init_print("ANTENNA (Audio Capture)")
+                else:
+                    self._init_print("ANTENNA (Audio Capture) — NO MIC", "~")
+
             # 5. VOCODER — Voice
             if not self.args.no_voice:
-                vocoder = Vocoder(synapse, blackbox, psyche, self.modules.get("optic"))
+                vocoder = Vocoder(synapse, blackbox, psyche, cortex, self.modules.get("optic"), antenna)
                 self.modules["vocoder"] = vocoder
                 self._init_print("VOCODER (Voice System)")
             else:
@@ -122,7 +150,7 @@ class Deskbot:
 
             # 6. ECHO HUNTER — Audio Classification
             if not self.args.no_audio:
-                echo = EchoHunter(synapse, blackbox)
+                echo = EchoHunter(synapse, blackbox, antenna)
                 self.modules["echo"] = echo
                 self._init_print("ECHO HUNTER (Sound Detection)")
             else:
@@ -142,7 +170,7 @@ class Deskbot:
             self._init_print("HIVEMIND (Sensor Fusion)")
 
             # 9. AGENT — AI Agent (code review, doc Q&A)
-            agent = Agent(synapse, blackbox, psyche)
+            agent = Agent(synapse, blackbox, psyche, cortex, engram)
             self.modules["agent"] = agent
             self._init_print("AGENT (AI Code/Doc Agent)")
 
@@ -217,7 +245,7 @@ class Deskbot:
         vocoder = self.modules.get("vocoder")
         if vocoder:
             time.sleep(2)  # Let boot animation play
-            vocoder.speak(f"Systems online. I am {dna.BOT_NAME}. Try not to bore me.")
+            vocoder.speak(self.modules["psyche"].BOOT_LINE)
 
         print("\n  Press Ctrl+C to shutdown\n")
 
@@ -236,9 +264,17 @@ class Deskbot:
 
         vocoder = self.modules.get("vocoder")
         if vocoder:
-            vocoder.speak("Going offline. Try not to miss me.")
+            vocoder.speak(self.modules["psyche"].SHUTDOWN_LINE)
             time.sleep(2)
 
+        cortex = self.modules.get("cortex")
+        if cortex:
+            cortex.shutdown()
+
+        antenna = self.modules.get("antenna")
+        if antenna:
+            antenna.stop()
+
         synapse = self.modules.get("synapse")
         if synapse:
             synapse.publish(dna.TOPIC["eyes"], "sleep")
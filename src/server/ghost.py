@@ -0,0 +1,108 @@
+"""
+GHOST.PY — CONVERSATION MEMORY
+One running conversation for the voice loop, sent to Gemini as a
+bounded history:
+
+    [summary of older turns]  +  the most recent turns verbatim
+
+When the verbatim turns exceed GHOST_TOKEN_BUDGET (or GHOST_MAX_TURNS),
+the oldest ones are folded into the running summary by a background
+Cortex request; they stay in the history until the new summary lands,
+so nothing is forgotten mid-fold. The system prompt is not part of the
+history at all — it goes to Cortex as the model's system instruction.
+Per-turn prompt size therefore stays flat however long JINX is chatted at.
+"""
+
+import threading
+
+import dna
+from cortex import DOCS
+
+_CHARS_PER_TOKEN = 4  # Rough estimate; good enough for a budget
+
+
+def _tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+class Ghost:
+    def __init__(self, cortex):
+        self.cortex  = cortex
+        self.turns   = []    # [{"role": "user"|"model", "parts": [text]}]
+        self.summary = ""
+        self.folding = False
+        self._lock   = threading.Lock()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def history(self) -> list:
+        """Turns to send with the next message: summary first, then recent turns."""
+        with self._lock:
+            turns = list(self.turns)
+            if self.summary:
+                turns = [{"role": "user",  "parts": [f"(Summary of our conversation so far: {self.summary})"]},
+                         {"role": "model", "parts": ["Noted."]}] + turns
+            return turns
+
+    def add(self, user: str, reply: str):
+        with self._lock:
+            self.turns.append({"role": "user",  "parts": [user]})
+            self.turns.append({"role": "model", "parts": [reply]})
+        self._maybe_fold()
+
+    def clear(self):
+        with self._lock:
+            self.turns   = []
+            self.summary = ""
+
+    def size(self) -> int:
+        """Estimated tokens of history() (what each request carries)."""
+        with self._lock:
+            return _tokens(self.summary) + sum(_tokens(t["parts"][0]) for t in self.turns)
+
+    # ── Folding ───────────────────────────────────────────────────────────
+
+    def _over_budget(self) -> bool:
+        used = sum(_tokens(t["parts"][0]) for t in self.turns)
+        return used > dna.GHOST_TOKEN_BUDGET or len(self.turns) > dna.GHOST_MAX_TURNS * 2
+
+    def _maybe_fold(self):
+        with self._lock:
+            if self.folding or not self._over_budget():
+                return
+            keep = min(len(self.turns), dna.GHOST_KEEP_TURNS * 2)
+            fold = self.turns[:len(self.turns) - keep]
+            if not fold:
+                return
+            if not self.cortex.available:
+                self.turns = self.turns[len(fold):]  # No LLM to summarize with — just forget
+                return
+            self.folding = True
+            previous     = self.summary
+            turns        = self.turns
+
+        transcript = "\n".join(f"{'User' if t['role'] == 'user' else dna.BOT_NAME}: {t['parts'][0]}"
+                               for t in fold)
+        prompt = (
+            f"Update the running summary of a conversation between a user and {dna.BOT_NAME}.\n"
+            f"Current summary: {previous or '(none)'}\n\nNew exchanges:\n{transcript}\n\n"
+            f"Write the updated summary in at most {dna.GHOST_SUMMARY_WORDS} words. Keep names, "
+            "facts the user shared, requests and anything they may refer back to. Plain text only."
+        )
+        thought = self.cortex.submit(prompt, DOCS, timeout=dna.LLM_TIMEOUT)
+        thought.add_done_callback(lambda t: self._folded(t, turns, len(fold)))
+
+    def _folded(self, thought, turns: list, count: int):
+        try:
+            summary = thought.result(0).strip()
+        except Exception as e:
+            print(f"  [GHOST] Summary failed, dropping oldest turns: {e}")
+            summary = None
+        with self._lock:
+            self.folding = False
+            if self.turns is not turns:
+                return  # Cleared meanwhile
+            if summary:
+                self.summary = summary
+            del self.turns[:count]  # Summarized (or, on failure, dropped to stay in budget)
+        self._maybe_fold()
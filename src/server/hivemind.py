@@ -4,12 +4,11 @@ Combines visual, audio, network, and proximity scores into a unified
 "doom_level" threat assessment. Also tracks battery state from ESP32.
 """
 
-import json
 import time
 import threading
 import dna
 from blackbox import Blackbox
-from synapse  import Synapse
+from synapse  import Synapse, Pulse
 
 
 class Hivemind:
@@ -73,9 +72,9 @@ class Hivemind:
             self.synapse.publish(dna.TOPIC["eyes"],  "threat")
             self.blackbox.log_event("HIGH_DOOM", {"doom_level": self.doom_level, "scores": self.scores})
 
-    def _on_battery(self, payload: str):
+    def _on_battery(self, pulse: Pulse):
         try:
-            data = json.loads(payload)
+            data = pulse.json()
             self.battery_pct      = int(data.get("percent", 100))
             self.battery_voltage  = float(data.get("voltage", 8.4))
 
@@ -94,10 +93,10 @@ class Hivemind:
         except Exception:
             pass
 
-    def _on_sensors(self, payload: str):
+    def _on_sensors(self, pulse: Pulse):
         """Process proximity/depth sensor data from ESP32."""
         try:
-            data = json.loads(payload)
+            data = pulse.json()
             us1_cm   = data.get("us1_cm", 999)
             us2_cm   = data.get("us2_cm", 999)
             ir_left  = data.get("ir_left", 0)
@@ -123,9 +122,9 @@ class Hivemind:
         except Exception:
             pass
 
-    def _on_audio_score(self, payload: str):
+    def _on_audio_score(self, pulse: Pulse):
         try:
-            data  = json.loads(payload)
+            data  = pulse.json()
             label = data.get("label", "")
             conf  = float(data.get("confidence", 0))
             score = conf if label in dna.AUDIO_THREAT_CLASSES else 0.0
@@ -133,9 +132,9 @@ class Hivemind:
         except Exception:
             pass
 
-    def _on_alert(self, payload: str):
+    def _on_alert(self, pulse: Pulse):
         """Visual threat alerts increase visual score."""
-        if "THREAT" in payload.upper():
+        if "THREAT" in pulse.text.upper():
             self.update_score("visual", 0.9)
 
     def run(self):
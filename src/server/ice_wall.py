@@ -4,7 +4,6 @@ Real-time network device detection, traffic monitoring, and anomaly detection.
 Shows on tablet: all devices on network, unknown devices flagged.
 """
 
-import json
 import time
 import socket
 import threading
@@ -107,11 +106,11 @@ class IceWall:
             if devices:
                 self._check_new_devices(devices)
                 self.current_devices = devices
-                self.synapse.publish(dna.TOPIC["network_stats"], json.dumps({
+                self.synapse.publish(dna.TOPIC["network_stats"], {
                     "count": len(devices),
                     "devices": list(devices.values()),
                     "timestamp": datetime.now().isoformat(),
-                }))
+                })
             time.sleep(dna.NETWORK_SCAN_INTERVAL)
 
     def stop(self):
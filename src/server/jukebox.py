@@ -0,0 +1,184 @@
+"""
+JUKEBOX.PY — MUSIC RESOLVER
+Turns "play <query>" into something mpv can open, as fast as possible:
+
+  1. A local library (MUSIC_DIR) indexed by file/folder name — a query
+     whose words all match a local track plays instantly, offline.
+  2. An LRU cache (SQLite-backed) of query → yt-dlp stream URL. Entries
+     expire with the URL itself (googlevideo's expire= parameter, else
+     MUSIC_URL_TTL), so a cached URL is never handed out dead.
+  3. yt-dlp, only on a miss. Its result is cached.
+
+A warm thread re-resolves the most requested queries (and
+MUSIC_WARM_QUERIES) before their URLs expire, so favourites start
+without the yt-dlp round trip. With no network, the best partial local
+match is played instead of nothing.
+"""
+
+import re
+import time
+import sqlite3
+import threading
+import subprocess
+from pathlib import Path
+from collections import OrderedDict
+
+import dna
+from engram import normalize
+
+AUDIO_EXTENSIONS = {".mp3", ".flac", ".ogg", ".opus", ".m4a", ".wav", ".aac"}
+_EXPIRE_RE = re.compile(r"[?&/]expire[=/](\d+)")
+
+
+class Jukebox:
+    def __init__(self, db_path: str = None):
+        self.cache   = OrderedDict()  # query -> {"url", "expires", "hits"}; LRU order
+        self.library = {}             # path -> set of name tokens
+        self.scanned = 0.0
+        self.running = False
+        self._lock   = threading.Lock()
+
+        db_path = db_path or dna.MUSIC_CACHE_DB
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS music (
+                query     TEXT PRIMARY KEY,
+                url       TEXT,
+                expires   REAL,
+                hits      INTEGER,
+                last_used REAL
+            )
+        """)
+        self.conn.commit()
+        for query, url, expires, hits in self.conn.execute(
+                "SELECT query, url, expires, hits FROM music ORDER BY last_used"):
+            self.cache[query] = {"url": url, "expires": expires, "hits": hits}
+
+    def start(self):
+        self.running = True
+        self._scan_library()
+        threading.Thread(target=self._warm_loop, name="jukebox-warm", daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def ready(self, query: str) -> bool:
+        """True if resolve() will answer without running yt-dlp."""
+        query = normalize(query)
+        return self._local(query, exact=True) is not None or self._cached(query) is not None
+
+    def resolve(self, query: str) -> str | None:
+        """Local path or stream URL for query, or None."""
+        query = normalize(query)
+        local = self._local(query, exact=True)
+        if local:
+            return str(local)
+        url = self._cached(query)
+        if url:
+            self._touch(query)
+            return url
+        url = self._fetch(query)
+        if url:
+            self._store(query, url)
+            return url
+        fallback = self._local(query, exact=False)  # Offline: closest local track beats silence
+        return str(fallback) if fallback else None
+
+    # ── Local library ─────────────────────────────────────────────────────
+
+    def _scan_library(self):
+        root = Path(dna.MUSIC_DIR)
+        library = {}
+        if root.is_dir():
+            for path in root.rglob("*"):
+                if path.suffix.lower() in AUDIO_EXTENSIONS:
+                    library[path] = set(normalize(" ".join(path.relative_to(root).with_suffix("").parts)).split())
+        with self._lock:
+            self.library = library
+            self.scanned = time.time()
+        if library:
+            print(f"  [JUKEBOX] Local library: {len(library)} tracks")
+
+    def _local(self, query: str, exact: bool):
+        if time.time() - self.scanned > dna.MUSIC_RESCAN:
+            self._scan_library()
+        words = set(query.split())
+        if not words:
+            return None
+        with self._lock:
+            scored = [(len(words & tokens) / len(words), path) for path, tokens in self.library.items()]
+        score, path = max(scored, default=(0.0, None), key=lambda s: s[0])
+        if exact:
+            return path if score >= 1.0 else None
+        return path if score > 0 else None
+
+    # ── URL cache ─────────────────────────────────────────────────────────
+
+    def _cached(self, query: str, margin: float = None) -> str | None:
+        margin = dna.MUSIC_EXPIRY_MARGIN if margin is None else margin
+        with self._lock:
+            entry = self.cache.get(query)
+            if entry and entry["url"] and entry["expires"] - margin > time.time():
+                return entry["url"]
+        return None
+
+    def _touch(self, query: str):
+        with self._lock:
+            entry = self.cache[query]
+            entry["hits"] += 1
+            self.cache.move_to_end(query)
+            self.conn.execute("UPDATE music SET hits=?, last_used=? WHERE query=?",
+                              (entry["hits"], time.time(), query))
+            self.conn.commit()
+
+    def _store(self, query: str, url: str, hit: bool = True):
+        match   = _EXPIRE_RE.search(url)
+        expires = float(match.group(1)) if match else time.time() + dna.MUSIC_URL_TTL
+        with self._lock:
+            entry = self.cache.pop(query, {"hits": 0})
+            hits  = entry["hits"] + (1 if hit else 0)
+            self.cache[query] = {"url": url, "expires": expires, "hits": hits}
+            self.conn.execute("INSERT OR REPLACE INTO music VALUES (?,?,?,?,?)",
+                              (query, url, expires, hits, time.time()))
+            while len(self.cache) > dna.MUSIC_CACHE_SIZE:
+                old, _ = self.cache.popitem(last=False)
+                self.conn.execute("DELETE FROM music WHERE query=?", (old,))
+            self.conn.commit()
+
+    @staticmethod
+    def _fetch(query: str) -> str | None:
+        try:
+            result = subprocess.run(
+                ["yt-dlp", "-f", "bestaudio", "--get-url", f"ytsearch1:{query}"],
+                capture_output=True, text=True, timeout=dna.MUSIC_RESOLVE_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"  [JUKEBOX] yt-dlp failed for '{query}': {e}")
+            return None
+        url = result.stdout.strip().split("\n")[0]
+        return url or None
+
+    # ── Warming ───────────────────────────────────────────────────────────
+
+    def _warm_loop(self):
+        while self.running:
+            with self._lock:
+                popular = sorted(self.cache, key=lambda q: self.cache[q]["hits"], reverse=True)
+            queries = list(dict.fromkeys([normalize(q) for q in dna.MUSIC_WARM_QUERIES] +
+                                         popular[:dna.MUSIC_WARM_TOP]))
+            for query in queries:
+                if not self.running:
+                    return
+                # Refresh anything that would expire before the next pass
+                if self._local(query, exact=True) or self._cached(query, margin=dna.MUSIC_WARM_INTERVAL * 2):
+                    continue
+                url = self._fetch(query)
+                if url is None:
+                    break  # Offline — try again next pass
+                self._store(query, url, hit=False)
+            for _ in range(int(dna.MUSIC_WARM_INTERVAL)):
+                if not self.running:
+                    return
+                time.sleep(1)
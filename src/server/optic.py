@@ -7,7 +7,6 @@ Handles: Camera feed, face detection/recognition, pose estimation,
 
 import cv2
 import time
-import json
 import base64
 import threading
 import numpy as np
@@ -20,7 +19,7 @@ from ultralytics import YOLO
 
 import dna
 from blackbox import Blackbox
-from synapse  import Synapse
+from synapse  import Synapse, Pulse
 
 
 class Optic:
@@ -122,12 +121,12 @@ class Optic:
         self.blackbox.log_event("FACE_REGISTERED", {"name": name, "label": label})
         return True
 
-    def _on_mode_change(self, payload: str):
-        self.mode = payload.strip()
+    def _on_mode_change(self, pulse: Pulse):
+        self.mode = pulse.text.strip()
 
-    def _on_web_command(self, payload: str):
+    def _on_web_command(self, pulse: Pulse):
         try:
-            cmd = json.loads(payload)
+            cmd = pulse.json()
             if cmd.get("action") == "register_face":
                 self.register_face(cmd["name"], cmd.get("label", "safe"))
         except Exception:
@@ -266,8 +265,8 @@ class Optic:
         cx, cy  = largest["center"]
         # Normalize to 0-1
         nx, ny  = cx / frame_w, cy / frame_h
-        self.synapse.publish(dna.TOPIC["head_track"], json.dumps({"x": nx, "y": ny}))
-        self.synapse.publish(dna.TOPIC["eye_track"],  json.dumps({"x": nx, "y": ny}))
+        self.synapse.publish(dna.TOPIC["head_track"], {"x": nx, "y": ny})
+        self.synapse.publish(dna.TOPIC["eye_track"],  {"x": nx, "y": ny})
 
     def _process_frame(self, frame: np.ndarray) -> np.ndarray:
         """Run all vision models on one frame and return annotated result."""
@@ -323,7 +322,7 @@ class Optic:
         if gesture != self.gesture_state and gesture != "none":
             self.gesture_state = gesture
             self.synapse.publish(dna.TOPIC["command"],
-                                 json.dumps({"type": "gesture", "value": gesture}))
+                                 {"type": "gesture", "value": gesture})
 
         # HUD overlay
         timestamp = datetime.now().strftime("%H:%M:%S")
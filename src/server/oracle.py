@@ -0,0 +1,460 @@
+"""
+ORACLE.PY — DOCUMENT RETRIEVAL INDEX
+Splits documents into overlapping chunks and ranks them against a
+question with an in-memory BM25 inverted index, optionally blended with
+local sentence embeddings. Agent sends only the top-k chunks to Gemini.
+
+Extracted text, chunks and per-chunk term counts persist in SQLite
+(dna.DOCUMENT_INDEX_DB), keyed by path, size, mtime and a raw-bytes hash,
+so a restart rebuilds the in-memory index without re-extracting anything.
+Paged sources (PDFs) are chunked as pages stream in, and every chunk
+remembers its page range for citations.
+
+Agent's background summaries (chunk → section → document) are stored
+here too, tied to the document's hash and dropped when it is re-indexed.
+"""
+
+import re
+import json
+import math
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+from collections import Counter, defaultdict
+
+import dna
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    EMBED_AVAILABLE = True
+except ImportError:
+    EMBED_AVAILABLE = False
+
+
+BM25_K1 = 1.5
+BM25_B  = 0.75
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from",
+    "has", "have", "how", "i", "in", "is", "it", "its", "me", "my", "of", "on",
+    "or", "so", "that", "the", "this", "to", "was", "what", "when", "where",
+    "which", "who", "why", "will", "with", "you", "your",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def chunk_spans(text: str, size: int = None, overlap: int = None) -> list:
+    """(start, end) offsets of ~size-char windows overlapping by ~overlap chars,
+    preferring paragraph, then sentence, then word boundaries."""
+    size    = size or dna.CHUNK_SIZE
+    overlap = dna.CHUNK_OVERLAP if overlap is None else overlap
+    spans   = []
+    start   = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            window = text[start:end]
+            for sep in ("\n\n", ". ", "\n", " "):
+                cut = window.rfind(sep)
+                if cut > size // 2:
+                    end = start + cut + len(sep)
+                    break
+        spans.append((start, end))
+        if end >= len(text):
+            break
+        # Step back by the overlap, realigned to a word start
+        nxt = max(end - overlap, start + 1)
+        space = text.find(" ", nxt, end)
+        start = space + 1 if space != -1 else nxt
+    return spans
+
+
+def chunk_text(text: str, size: int = None, overlap: int = None) -> list:
+    text = text.strip()
+    return [p for p in (text[s:e].strip() for s, e in chunk_spans(text, size, overlap)) if p]
+
+
+class PageChunker:
+    """Incremental chunk_text over a stream of pages. Only the unfinished
+    tail is buffered; each chunk records the pages it starts and ends on."""
+
+    def __init__(self):
+        self.buf   = ""
+        self.marks = []  # [(offset in buf, page_no)]
+
+    def feed(self, page, text: str) -> list:
+        self.marks.append((len(self.buf), page))
+        self.buf += text + "\n"
+        if len(self.buf) < 2 * dna.CHUNK_SIZE:
+            return []
+        return self._drain(final=False)
+
+    def finish(self) -> list:
+        return self._drain(final=True)
+
+    def _page_at(self, pos: int):
+        page = None
+        for offset, p in self.marks:
+            if offset > pos:
+                break
+            page = p
+        return page
+
+    def _drain(self, final: bool) -> list:
+        """[(text, page, page_end)] for every settled chunk."""
+        spans = chunk_spans(self.buf)
+        keep  = spans if final else spans[:-1]
+        out   = []
+        for s, e in keep:
+            piece = self.buf[s:e].strip()
+            if piece:
+                out.append((piece, self._page_at(s), self._page_at(max(s, e - 1))))
+        if final or not keep:
+            return out
+        cut = spans[-1][0]
+        self.marks = ([(0, self._page_at(cut))] +
+                      [(o - cut, p) for o, p in self.marks if o > cut])
+        self.buf = self.buf[cut:]
+        return out
+
+
+class Oracle:
+    def __init__(self, db_path: str = None):
+        self._lock     = threading.RLock()
+        self.chunks    = {}                  # chunk_id -> {"doc", "idx", "text", "len", "terms"}
+        self.doc_chunks = defaultdict(list)  # doc name -> [chunk_id]
+        self.postings  = defaultdict(dict)   # term -> {chunk_id: tf}
+        self.total_len = 0
+        self._next_id  = 0
+        self.documents = {}                  # doc name -> {"path", "size", "mtime", "hash", "chars", "indexed_at"}
+
+        # Optional dense vectors: chunk_id -> normalized embedding
+        self.embedder   = None
+        self.embeddings = {}
+        if dna.EMBEDDING_MODEL and EMBED_AVAILABLE:
+            try:
+                self.embedder = SentenceTransformer(dna.EMBEDDING_MODEL)
+                print(f"  [ORACLE] Embeddings: {dna.EMBEDDING_MODEL}")
+            except Exception as e:
+                print(f"  [ORACLE] Embedding model load failed: {e}")
+
+        self.conn = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(db_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self._create_tables()
+            self._load()
+
+    # ── Persistence ───────────────────────────────────────────────────────
+
+    def _create_tables(self):
+        c = self.conn.cursor()
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                name       TEXT PRIMARY KEY,
+                path       TEXT,
+                size       INTEGER,
+                mtime      REAL,
+                raw_hash   TEXT,
+                text       TEXT,
+                indexed_at TEXT,
+                page_marks TEXT
+            )
+        """)
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                doc       TEXT,
+                idx       INTEGER,
+                text      TEXT,
+                terms     TEXT,
+                embedding BLOB,
+                page      INTEGER,
+                page_end  INTEGER,
+                PRIMARY KEY (doc, idx)
+            )
+        """)
+        c.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS summaries (
+                doc   TEXT,
+                level TEXT,
+                idx   INTEGER,
+                text  TEXT,
+                PRIMARY KEY (doc, level, idx)
+            )
+        """)
+
+        # Stores from before page tracking: add the columns and drop PDFs so
+        # they are re-extracted with page numbers
+        if "page" not in {row[1] for row in c.execute("PRAGMA table_info(chunks)")}:
+            c.execute("ALTER TABLE chunks ADD COLUMN page INTEGER")
+            c.execute("ALTER TABLE chunks ADD COLUMN page_end INTEGER")
+            c.execute("ALTER TABLE documents ADD COLUMN page_marks TEXT")
+            c.execute("DELETE FROM chunks WHERE doc IN (SELECT name FROM documents WHERE LOWER(name) LIKE '%.pdf')")
+            c.execute("DELETE FROM documents WHERE LOWER(name) LIKE '%.pdf'")
+        self.conn.commit()
+
+    def _chunking_signature(self) -> str:
+        return f"{dna.CHUNK_SIZE}/{dna.CHUNK_OVERLAP}"
+
+    def _load(self):
+        """Rebuild the in-memory index from the store — no extraction, no tokenizing."""
+        c = self.conn.cursor()
+        row = c.execute("SELECT value FROM meta WHERE key='chunking'").fetchone()
+        if row and row[0] != self._chunking_signature():
+            self._rechunk_all()
+            return
+
+        for name, path, size, mtime, raw_hash, chars, indexed_at in c.execute(
+                "SELECT name, path, size, mtime, raw_hash, LENGTH(text), indexed_at FROM documents"):
+            self.documents[name] = {"path": path, "size": size, "mtime": mtime, "hash": raw_hash,
+                                    "chars": chars, "indexed_at": indexed_at}
+        missing_vectors = []
+        for doc, idx, text, terms, blob, page, page_end in c.execute(
+                "SELECT doc, idx, text, terms, embedding, page, page_end FROM chunks ORDER BY doc, idx"):
+            cid = self._insert_chunk(doc, idx, text, Counter(json.loads(terms)), page, page_end)
+            if self.embedder:
+                if blob:
+                    self.embeddings[cid] = np.frombuffer(blob, dtype=np.float32)
+                else:
+                    missing_vectors.append(cid)
+        if missing_vectors:
+            vectors = self._embed([self.chunks[cid]["text"] for cid in missing_vectors])
+            if vectors is not None:
+                self.embeddings.update(zip(missing_vectors, vectors))
+        c.execute("INSERT OR REPLACE INTO meta VALUES ('chunking', ?)", (self._chunking_signature(),))
+        self.conn.commit()
+        print(f"  [ORACLE] Loaded index: {len(self.documents)} documents, {len(self.chunks)} chunks")
+
+    def _rechunk_all(self):
+        """CHUNK_SIZE/OVERLAP changed: re-chunk stored text (still no re-extraction)."""
+        print("  [ORACLE] Chunking settings changed — rebuilding chunks from stored text")
+        rows = self.conn.execute(
+            "SELECT name, path, size, mtime, raw_hash, text, page_marks FROM documents").fetchall()
+        self.conn.execute("DELETE FROM chunks")
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('chunking', ?)", (self._chunking_signature(),))
+        self.conn.commit()
+        for name, path, size, mtime, raw_hash, text, page_marks in rows:
+            self.add_pages(name, self._split_pages(text, page_marks),
+                           path=path, size=size, mtime=mtime, raw_hash=raw_hash)
+
+    @staticmethod
+    def _split_pages(text: str, page_marks: str | None) -> list:
+        """Stored text + [[offset, page], ...] back into [(page, text)]."""
+        if not page_marks:
+            return [(None, text)]
+        marks = json.loads(page_marks)
+        ends  = [offset for offset, _ in marks[1:]] + [len(text)]
+        return [(page, text[offset:end].rstrip("\n")) for (offset, page), end in zip(marks, ends)]
+
+    def lookup(self, name: str) -> dict | None:
+        """Stored fingerprint (path, size, mtime, hash) for freshness checks."""
+        with self._lock:
+            return self.documents.get(name)
+
+    def touch(self, name: str, size: int, mtime: float):
+        """Content unchanged (same hash) but the file was rewritten — refresh stat keys."""
+        with self._lock:
+            doc = self.documents.get(name)
+            if doc is None:
+                return
+            doc["size"], doc["mtime"] = size, mtime
+            if self.conn:
+                self.conn.execute("UPDATE documents SET size=?, mtime=? WHERE name=?", (size, mtime, name))
+                self.conn.commit()
+
+    def document_text(self, name: str) -> str:
+        """Full extracted text — read from the store, not kept in memory."""
+        with self._lock:
+            if self.conn:
+                row = self.conn.execute("SELECT text FROM documents WHERE name=?", (name,)).fetchone()
+                return row[0] if row else ""
+            return "\n".join(self.chunks[cid]["text"] for cid in self.doc_chunks.get(name, []))
+
+    # ── Summaries ─────────────────────────────────────────────────────────
+    # Hierarchy built in the background after ingest (Agent): one line per
+    # chunk, a paragraph per section of chunks, optional "part" levels for
+    # long documents, and a single spoken-style "document" summary.
+
+    def chunk_texts(self, name: str) -> list:
+        with self._lock:
+            return [self.chunks[cid]["text"] for cid in self.doc_chunks.get(name, [])]
+
+    def store_summaries(self, name: str, doc_hash: str, level: str, items: list) -> bool:
+        """Persist [(idx, text)] for one level — refused if the document changed
+        (hash differs) since summarizing started."""
+        with self._lock:
+            if (self.documents.get(name) or {}).get("hash") != doc_hash or not self.conn:
+                return False
+            self.conn.executemany("INSERT OR REPLACE INTO summaries VALUES (?,?,?,?)",
+                                  [(name, level, idx, text) for idx, text in items])
+            self.conn.commit()
+            return True
+
+    def summaries(self, name: str, level: str) -> list:
+        with self._lock:
+            if not self.conn:
+                return []
+            return [row[0] for row in self.conn.execute(
+                "SELECT text FROM summaries WHERE doc=? AND level=? ORDER BY idx", (name, level))]
+
+    def document_summary(self, name: str) -> str | None:
+        found = self.summaries(name, "document")
+        return found[0] if found else None
+
+    # ── Indexing ──────────────────────────────────────────────────────────
+
+    def _insert_chunk(self, doc: str, idx: int, text: str, tf: Counter,
+                      page: int = None, page_end: int = None) -> int:
+        cid = self._next_id
+        self._next_id += 1
+        length = sum(tf.values())
+        self.chunks[cid] = {"doc": doc, "idx": idx, "text": text, "len": length, "terms": list(tf),
+                            "page": page, "page_end": page_end}
+        self.doc_chunks[doc].append(cid)
+        self.total_len += length
+        for term, count in tf.items():
+            self.postings[term][cid] = count
+        return cid
+
+    def add_document(self, name: str, text: str, path: str = "", size: int = 0,
+                     mtime: float = 0.0, raw_hash: str = "") -> int:
+        """(Re)index and persist an unpaged document. Returns the number of chunks."""
+        return self.add_pages(name, [(None, text)], path=path, size=size, mtime=mtime, raw_hash=raw_hash)
+
+    def add_pages(self, name: str, pages, path: str = "", size: int = 0,
+                  mtime: float = 0.0, raw_hash: str = "") -> int:
+        """(Re)index and persist a document from an iterable of (page_no, text),
+        chunking as pages arrive. Text past dna.DOC_MAX_CHARS is dropped and
+        the page source closed. The old version stays searchable until the
+        new one is complete. Returns the number of chunks (0 = no text)."""
+        chunker = PageChunker()
+        staged  = []  # [(text, tf, page, page_end)]
+        parts, marks, chars = [], [], 0
+        for page, text in pages:
+            if not text or not text.strip():
+                continue
+            if chars + len(text) > dna.DOC_MAX_CHARS:
+                text = text[:max(0, dna.DOC_MAX_CHARS - chars)]
+                print(f"  [ORACLE] {name}: capped at {dna.DOC_MAX_CHARS} chars (page {page or '-'})")
+            marks.append([chars, page])
+            parts.append(text)
+            chars += len(text) + 1
+            staged += [(p, Counter(tokenize(p)), a, b) for p, a, b in chunker.feed(page, text)]
+            if chars > dna.DOC_MAX_CHARS:
+                break
+        if hasattr(pages, "close"):
+            pages.close()  # Cancels any extraction still in flight
+        staged += [(p, Counter(tokenize(p)), a, b) for p, a, b in chunker.finish()]
+        if not staged:
+            return 0
+
+        full_text  = "\n".join(parts)
+        page_marks = json.dumps(marks) if any(page is not None for _, page in marks) else None
+        vectors    = self._embed([p for p, *_ in staged]) if self.embedder else None
+        indexed_at = datetime.now().isoformat()
+        with self._lock:
+            self.remove_document(name)
+            for idx, (piece, tf, page, page_end) in enumerate(staged):
+                cid = self._insert_chunk(name, idx, piece, tf, page, page_end)
+                if vectors is not None:
+                    self.embeddings[cid] = vectors[idx]
+            self.documents[name] = {"path": path, "size": size, "mtime": mtime, "hash": raw_hash,
+                                    "chars": len(full_text), "indexed_at": indexed_at}
+            if self.conn:
+                self.conn.execute("DELETE FROM chunks WHERE doc=?", (name,))
+                self.conn.execute("DELETE FROM summaries WHERE doc=?", (name,))
+                self.conn.execute("INSERT OR REPLACE INTO documents VALUES (?,?,?,?,?,?,?,?)",
+                                  (name, path, size, mtime, raw_hash, full_text, indexed_at, page_marks))
+                self.conn.executemany("INSERT INTO chunks VALUES (?,?,?,?,?,?,?)", [
+                    (name, idx, piece, json.dumps(tf),
+                     vectors[idx].astype(np.float32).tobytes() if vectors is not None else None,
+                     page, page_end)
+                    for idx, (piece, tf, page, page_end) in enumerate(staged)
+                ])
+                self.conn.commit()
+        return len(staged)
+
+    def remove_document(self, name: str):
+        with self._lock:
+            for cid in self.doc_chunks.pop(name, []):
+                chunk = self.chunks.pop(cid)
+                self.total_len -= chunk["len"]
+                self.embeddings.pop(cid, None)
+                for term in chunk["terms"]:
+                    posting = self.postings.get(term)
+                    if posting is not None:
+                        posting.pop(cid, None)
+                        if not posting:
+                            del self.postings[term]
+            if self.documents.pop(name, None) is not None and self.conn:
+                self.conn.execute("DELETE FROM documents WHERE name=?", (name,))
+                self.conn.execute("DELETE FROM chunks WHERE doc=?", (name,))
+                self.conn.execute("DELETE FROM summaries WHERE doc=?", (name,))
+                self.conn.commit()
+
+    def _embed(self, texts: list):
+        try:
+            return self.embedder.encode(texts, normalize_embeddings=True, show_progress_bar=False)
+        except Exception as e:
+            print(f"  [ORACLE] Embedding failed: {e}")
+            return None
+
+    # ── Retrieval ─────────────────────────────────────────────────────────
+
+    def search(self, query: str, k: int = None) -> list:
+        """Top-k chunks for a query: [{"doc", "idx", "page", "page_end", "text", "score"}],
+        best first. page/page_end are None for unpaged documents."""
+        k = k or dna.RETRIEVAL_TOP_K
+        terms = tokenize(query)
+        with self._lock:
+            n = len(self.chunks)
+            if not n:
+                return []
+            avg_len = self.total_len / n or 1.0
+            scores  = defaultdict(float)
+            for term in set(terms):
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for cid, tf in posting.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.chunks[cid]["len"] / avg_len)
+                    scores[cid] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+            if self.embedder and self.embeddings:
+                scores = self._blend_dense(query, scores)
+
+            best = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+            return [
+                {"doc": self.chunks[cid]["doc"], "idx": self.chunks[cid]["idx"],
+                 "page": self.chunks[cid]["page"], "page_end": self.chunks[cid]["page_end"],
+                 "text": self.chunks[cid]["text"], "score": round(score, 4)}
+                for cid, score in best if score > 0
+            ]
+
+    def _blend_dense(self, query: str, sparse: dict) -> dict:
+        """Blend max-normalized BM25 with cosine similarity (EMBEDDING_WEIGHT)."""
+        qvec = self._embed([query])
+        if qvec is None:
+            return sparse
+        ids    = list(self.embeddings)
+        matrix = np.stack([self.embeddings[cid] for cid in ids])
+        dense  = matrix @ qvec[0]
+        top    = max(sparse.values(), default=0.0) or 1.0
+        w      = dna.EMBEDDING_WEIGHT
+        return {cid: (1 - w) * sparse.get(cid, 0.0) / top + w * float(sim)
+                for cid, sim in zip(ids, dense)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"documents": len(self.doc_chunks), "chunks": len(self.chunks),
+                    "terms": len(self.postings)}
@@ -0,0 +1,224 @@
+"""
+OVERWATCH.PY — CODE WATCHER
+Watches WATCH_CODE_DIR through TRIPWIRE: event-driven, .gitignore-aware,
+with bursts of saves debounced into one change per file. A persistent
+(path, size, mtime, hash) cache means a file is only reported when its
+content really changed — across restarts, touches and no-op saves.
+
+The cache also keeps the last reviewed version of every file, so a
+change can be reviewed as diff hunks (changed_hunks) instead of the
+whole file, and keeps per-hunk reviews so an unchanged hunk is never
+sent twice.
+"""
+
+import re
+import queue
+import difflib
+import sqlite3
+import hashlib
+import time
+import threading
+from pathlib import Path
+
+import dna
+from tripwire import Tripwire, GitIgnore
+
+CODE_EXTENSIONS = {".py", ".js", ".ts", ".java", ".c", ".cpp", ".cs", ".go", ".rs"}
+
+# Lines that open a scope worth naming: def/class/fn-style keywords, or a
+# C-family signature "type name(args) {"
+_SCOPE_RE = re.compile(
+    r"^\s*(?:[\w@]+\s+)*?(?:def|class|function|func|fn|interface|struct|impl|enum|trait)\b"
+    r"|^\s*(?!(?:if|for|while|switch|catch|return|else)\b)[\w:<>,\*&\[\]\s]+\([^;]*\)\s*(?:const\s*)?\{?\s*$"
+)
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def _scope(lines: list, idx: int) -> list:
+    """Headers of the def/class chain enclosing lines[idx], outermost first."""
+    while idx < len(lines) and not lines[idx].strip():
+        idx += 1
+    if idx >= len(lines):
+        idx = len(lines) - 1
+    chain = []
+    current = _indent(lines[idx]) if lines else 0
+    if lines and _SCOPE_RE.match(lines[idx]):
+        chain.append(lines[idx].strip())  # The change is on the header itself
+    for j in range(idx - 1, -1, -1):
+        if current == 0:
+            break
+        line = lines[j]
+        if line.strip() and _indent(line) < current and _SCOPE_RE.match(line):
+            chain.insert(0, line.strip())
+            current = _indent(line)
+    return chain
+
+
+def changed_hunks(old: str, new: str, context: int = None) -> list:
+    """Unified-diff hunks between two versions of a file:
+    [{"header", "scope", "diff", "hash", "changed"}]. The hash ignores line
+    numbers, so a hunk that merely moved keeps its cached review."""
+    context = dna.REVIEW_CONTEXT_LINES if context is None else context
+    a, b  = old.splitlines(), new.splitlines()
+    hunks = []
+    for group in difflib.SequenceMatcher(None, a, b, autojunk=False).get_grouped_opcodes(context):
+        i1, i2, j1, j2 = group[0][1], group[-1][2], group[0][3], group[-1][4]
+        body, changed = [], 0
+        for tag, ai1, ai2, bj1, bj2 in group:
+            if tag == "equal":
+                body += [" " + line for line in a[ai1:ai2]]
+                continue
+            body += ["-" + line for line in a[ai1:ai2]]
+            body += ["+" + line for line in b[bj1:bj2]]
+            changed += max(ai2 - ai1, bj2 - bj1)
+        first  = next(op[3] for op in group if op[0] != "equal")
+        scope  = _scope(b, first) if b else []
+        diff   = "\n".join(body)
+        hunks.append({
+            "header":  f"@@ -{i1 + 1},{i2 - i1} +{j1 + 1},{j2 - j1} @@",
+            "scope":   scope,
+            "diff":    diff,
+            "hash":    hashlib.md5("\n".join(scope + [diff]).encode()).hexdigest(),
+            "changed": changed,
+        })
+    return hunks
+
+
+class Overwatch:
+    def __init__(self, root, on_change, db_path: str = None):
+        """on_change(path: Path, code: str, previous: str | None) -> bool — runs
+        on Overwatch's own worker thread; previous is the last reviewed version.
+        Return True once the change was reviewed: a failed review leaves the
+        old version as the baseline, so the next diff still includes it."""
+        self.root      = Path(root)
+        self.on_change = on_change
+        self.running   = False
+        self.wire      = None
+        self.events    = queue.Queue()
+        self._lock     = threading.Lock()
+
+        db_path = db_path or dna.CODE_WATCH_DB
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path  TEXT PRIMARY KEY,
+                size  INTEGER,
+                mtime REAL,
+                hash  TEXT,
+                reviewed TEXT
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS reviews (
+                path      TEXT,
+                hunk_hash TEXT,
+                review    TEXT,
+                created   REAL,
+                PRIMARY KEY (path, hunk_hash)
+            )
+        """)
+        if "reviewed" not in {row[1] for row in self.conn.execute("PRAGMA table_info(files)")}:
+            self.conn.execute("ALTER TABLE files ADD COLUMN reviewed TEXT")
+        self.conn.commit()
+
+        ignore = GitIgnore(self.root, always=dna.CODE_IGNORE_DIRS)
+        self.accept = lambda path, is_dir: ignore(path, is_dir) and (
+            is_dir or path.suffix.lower() in CODE_EXTENSIONS)
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._worker, name="overwatch", daemon=True).start()
+        self.wire = Tripwire(self.root, lambda path, kind: self.events.put((path, kind)),
+                             accept=self.accept, debounce=dna.CODE_DEBOUNCE, name="code")
+        self.wire.start()
+
+    def stop(self):
+        self.running = False
+        if self.wire:
+            self.wire.stop()
+
+    # ── Hash cache ────────────────────────────────────────────────────────
+
+    def _cached(self, path: Path):
+        with self._lock:
+            return self.conn.execute("SELECT size, mtime, hash FROM files WHERE path=?",
+                                     (str(path),)).fetchone()
+
+    def _remember(self, path: Path, size: int, mtime: float, digest: str):
+        with self._lock:
+            self.conn.execute("""
+                INSERT INTO files (path, size, mtime, hash) VALUES (?,?,?,?)
+                ON CONFLICT(path) DO UPDATE SET size=excluded.size, mtime=excluded.mtime,
+                                                hash=excluded.hash
+            """, (str(path), size, mtime, digest))
+            self.conn.commit()
+
+    def _reviewed(self, path: Path) -> str | None:
+        with self._lock:
+            row = self.conn.execute("SELECT reviewed FROM files WHERE path=?", (str(path),)).fetchone()
+            return row[0] if row else None
+
+    def _mark_reviewed(self, path: Path, code: str):
+        with self._lock:
+            self.conn.execute("UPDATE files SET reviewed=? WHERE path=?", (code, str(path)))
+            self.conn.commit()
+
+    def _forget(self, path: Path):
+        with self._lock:
+            self.conn.execute("DELETE FROM files WHERE path=?", (str(path),))
+            self.conn.execute("DELETE FROM reviews WHERE path=?", (str(path),))
+            self.conn.commit()
+
+    # ── Review cache ──────────────────────────────────────────────────────
+
+    def cached_review(self, path: Path, hunk_hash: str) -> str | None:
+        with self._lock:
+            row = self.conn.execute("SELECT review FROM reviews WHERE path=? AND hunk_hash=?",
+                                    (str(path), hunk_hash)).fetchone()
+            return row[0] if row else None
+
+    def store_review(self, path: Path, hunk_hash: str, review: str):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO reviews VALUES (?,?,?,?)",
+                              (str(path), hunk_hash, review, time.time()))
+            self.conn.execute("""
+                DELETE FROM reviews WHERE path=? AND hunk_hash NOT IN (
+                    SELECT hunk_hash FROM reviews WHERE path=? ORDER BY created DESC LIMIT ?)
+            """, (str(path), str(path), dna.REVIEW_CACHE_PER_FILE))
+            self.conn.commit()
+
+    # ── Events ────────────────────────────────────────────────────────────
+
+    def _worker(self):
+        while self.running:
+            try:
+                path, kind = self.events.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                if kind == "deleted" and not path.exists():
+                    self._forget(path)
+                elif path.is_file():
+                    self._check(path)
+            except Exception as e:
+                print(f"  [OVERWATCH] {path.name}: {e}")
+
+    def _check(self, path: Path):
+        st     = path.stat()
+        cached = self._cached(path)
+        if cached and cached[0] == st.st_size and cached[1] == st.st_mtime:
+            return  # Touched by the event but not rewritten
+        data   = path.read_bytes()
+        digest = hashlib.md5(data).hexdigest()
+        self._remember(path, st.st_size, st.st_mtime, digest)
+        if cached and cached[2] == digest:
+            return  # Saved with identical content
+        code = data.decode("utf-8", errors="ignore")
+        if len(code) > 50:  # Skip tiny files
+            if self.on_change(path, code, self._reviewed(path)):
+                self._mark_reviewed(path, code)
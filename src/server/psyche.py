@@ -74,6 +74,10 @@ class Psyche:
             "glass_break": "Something broke. I hope it wasn't important. It probably was.",
         }
 
+        # Startup / shutdown announcements
+        self.BOOT_LINE     = f"Systems online. I am {dna.BOT_NAME}. Try not to bore me."
+        self.SHUTDOWN_LINE = "Going offline. Try not to miss me."
+
         self.last_idle_joke = 0
         self.idle_joke_interval = 300  # 5 minutes between unprompted jokes
 
@@ -97,6 +101,13 @@ class Psyche:
         return self.AUDIO_LINES.get(sound_class,
                f"Unusual sound detected: {sound_class}. Interesting.")
 
+    def static_lines(self) -> list:
+        """Every fixed line (no per-call placeholders) — prewarmed in the Voicebank."""
+        lines = (self.ACK_LINES + self.UNKNOWN_LINES + self.SAFE_LINES + self.THREAT_LINES +
+                 self.BATTERY_LINES + self.IDLE_JOKES + list(self.AUDIO_LINES.values()) +
+                 [self.BOOT_LINE, self.SHUTDOWN_LINE])
+        return [line for line in lines if "{" not in line]
+
     def should_make_idle_joke(self) -> bool:
         """Returns True if it's time to make an unprompted joke."""
         if random.random() > dna.HUMOR_FREQUENCY:
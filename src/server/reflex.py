@@ -0,0 +1,174 @@
+"""
+REFLEX.PY — LOCAL INTENT CLASSIFIER
+Turns a voice command into (intent, confidence, slots) without a cloud
+round trip. Two stages:
+
+  1. A keyword/regex automaton — every intent's patterns compiled into
+     one alternation, longest phrase first, so "stop the music" wins over
+     a bare "stop" and one scan finds every hit.
+  2. A nearest-example classifier (idf-weighted cosine over example
+     utterances) for paraphrases no pattern covers. It has to clear the
+     stricter NEAREST_THRESHOLD on at least two shared words; known chat
+     phrases that look like commands are examples too, so they stay chat.
+     Motion never comes from here (a paraphrase must not drive the
+     motors), and agent_query only when a document/code word was said.
+
+Anything scoring below its stage's threshold comes back as "chat" and goes
+to the LLM. Slots (name, color, query) are pulled out per intent.
+"""
+
+import re
+import math
+from collections import Counter
+
+import dna
+
+# intent -> [(pattern, weight)]; weight is the confidence of a hit
+PATTERNS = {
+    "sentinel_mode": [(r"guard mode", 1.0), (r"sentinel(?: mode)?", 1.0), (r"surveillance", 0.95)],
+    "buddy_mode":    [(r"buddy mode", 1.0), (r"normal mode", 1.0), (r"relax", 0.85)],
+    "sleep":         [(r"go to sleep", 1.0), (r"sleep", 0.9), (r"good ?night", 0.95), (r"shut up", 0.95),
+                      (r"stop", 0.75)],
+    "roast":         [(r"roast", 1.0)],
+    "play_music":    [(r"play (?:some |me )?(?:music|songs?)", 1.0), (r"put on", 0.85), (r"play", 0.85)],
+    "stop_music":    [(r"(?:stop|pause|kill) (?:the )?(?:music|song)", 1.0), (r"mute", 0.9)],
+    "lights":        [(r"lights?", 0.95), (r"leds?", 0.95)],
+    "move_forward":  [(r"come here", 1.0), (r"get over here", 1.0), (r"move forward", 1.0),
+                      (r"drive ahead", 1.0), (r"forward", 0.9)],
+    "move_backward": [(r"go back", 1.0), (r"back up", 1.0), (r"drive back", 1.0), (r"backwards?", 0.95),
+                      (r"retreat", 0.95)],
+    "stop_moving":   [(r"stop moving", 1.0), (r"halt", 0.95), (r"freeze", 0.9)],
+    "status":        [(r"status", 0.95), (r"how are you", 0.9), (r"battery", 0.9)],
+    "register_face": [(r"learn my face", 1.0), (r"remember my face", 1.0), (r"this is my face", 1.0),
+                      (r"memorize me", 1.0), (r"register", 0.95)],
+    "agent_query":   [(r"review (?:the |my )?code", 1.0), (r"summari[sz]e", 0.95), (r"what does", 0.85),
+                      (r"explain", 0.9), (r"read", 0.85)],
+    "skeleton":      [(r"show skeleton", 1.0), (r"dance mode", 1.0), (r"skeleton", 0.95)],
+}
+
+# Paraphrases for the classifier stage (the pattern phrases are added automatically).
+# Motion intents have none: they only fire from a pattern.
+EXAMPLES = {
+    "sentinel_mode": ["watch the room", "keep an eye on things", "start guarding"],
+    "buddy_mode":    ["be nice again", "back to normal", "chill out"],
+    "sleep":         ["go to bed", "be quiet", "take a nap", "power down"],
+    "roast":         ["make fun of him", "insult my friend", "burn this guy"],
+    "play_music":    ["i want to hear something", "queue up a track", "throw on a tune"],
+    "stop_music":    ["turn the music off", "enough music", "silence the song"],
+    "lights":        ["make it red", "change the color", "turn the lamp blue"],
+    "stop_moving":   ["stay there", "do not move", "hold still"],
+    "status":        ["how is your battery", "system report", "are you okay"],
+    "register_face": ["save my face", "store my face"],
+    "agent_query":   ["what is in this document", "check my code", "tell me about the manual"],
+    "skeleton":      ["track my pose", "watch me dance", "show my bones"],
+}
+
+# Misfires: chat that lands near a command example without these
+CHAT_EXAMPLES = ["tell me about the weather", "tell me about yourself", "tell me a joke",
+                 "what is the news", "how was your day", "what time is it",
+                 "get over it", "reverse the list", "move away from politics",
+                 "power down the stairs", "are you okay with pineapple pizza"]
+
+COLORS = ["red", "blue", "green", "purple", "cyan", "yellow", "white", "orange", "pink", "rainbow"]
+
+_FILLER    = {"hey", "jinx", "please", "can", "could", "you", "the", "a", "an", "to", "some", "me", "my",
+              "for", "now", "just", "and", "it", "i", "is", "this", "that", "of", "on", "in"}
+_DOC_WORDS = {"document", "documents", "doc", "docs", "pdf", "manual", "file", "files", "code",
+              "script", "function", "readme", "page", "chapter", "notes"}
+_NOT_NAME  = {"me", "my", "him", "her", "them", "this", "that", "the", "a", "an", "face", "everyone"}
+_WORD_RE   = re.compile(r"[a-z']+")
+
+_PATTERN_ONLY = {"move_forward", "move_backward"}  # Drive the motors: never from a paraphrase
+
+
+def _tokens(text: str) -> list:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _FILLER]
+
+
+class Reflex:
+    def __init__(self):
+        # Stage 1: one alternation, longest phrases first so specific beats generic
+        rules = [(p, intent, w) for intent, pats in PATTERNS.items() for p, w in pats]
+        rules.sort(key=lambda r: len(r[0]), reverse=True)
+        self.rules   = [(intent, w) for _, intent, w in rules]
+        self.pattern = re.compile("|".join(f"\\b(?P<r{i}>{p})\\b" for i, (p, _, _) in enumerate(rules)))
+
+        # Stage 2: idf-weighted example vectors
+        examples = [(intent, _tokens(text)) for intent, texts in EXAMPLES.items() for text in texts]
+        examples += [(intent, _tokens(re.sub(r"\[\w+\]|\(\?:|[()?|\\]", " ", p)))
+                     for intent, pats in PATTERNS.items() for p, _ in pats]
+        examples += [("chat", _tokens(text)) for text in CHAT_EXAMPLES]
+        df = Counter(w for _, toks in examples for w in set(toks))
+        self.idf      = {w: math.log(1 + len(examples) / n) for w, n in df.items()}
+        self.unseen   = math.log(1 + len(examples))  # Unknown words weigh like the rarest known one
+        self.examples = [(intent, self._vector(toks)) for intent, toks in examples if toks]
+        self.vocab    = {intent: {w for i, toks in examples if i == intent for w in toks} for intent in PATTERNS}
+
+    def _vector(self, tokens: list) -> dict:
+        tf   = Counter(tokens)
+        vec  = {w: c * self.idf.get(w, self.unseen) for w, c in tf.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {w: v / norm for w, v in vec.items()}
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def classify(self, text: str) -> tuple:
+        """(intent, confidence, slots); intent is "chat" below the threshold."""
+        text = text.lower().strip()
+        intent, confidence, span = self._match(text)
+        threshold = dna.INTENT_THRESHOLD
+        if intent is None:
+            intent, confidence = self._nearest(text)
+            threshold = dna.NEAREST_THRESHOLD
+        if intent in (None, "chat") or confidence < threshold:
+            return "chat", confidence, {}
+        return intent, confidence, self._slots(intent, text, span)
+
+    def _match(self, text: str) -> tuple:
+        best = (None, 0.0, None)
+        for m in self.pattern.finditer(text):
+            intent, weight = self.rules[int(m.lastgroup[1:])]
+            score = weight + 0.001 * len(m.group())  # Ties go to the longer phrase
+            if score > best[1]:
+                best = (intent, score, m.span())
+        intent, score, span = best
+        return intent, min(score, 1.0), span
+
+    def _nearest(self, text: str) -> tuple:
+        tokens    = _tokens(text)
+        vec       = self._vector(tokens)
+        about_doc = not _DOC_WORDS.isdisjoint(tokens)
+        best, best_score = None, 0.0
+        for intent, example in self.examples:
+            if intent in _PATTERN_ONLY or (intent == "agent_query" and not about_doc):
+                continue  # "tell me about the weather" is not a document question
+            shared = [w for w in vec if w in example]
+            if len(shared) < 2:
+                continue  # One common word ("reverse", "okay") is not a paraphrase
+            score = sum(vec[w] * example[w] for w in shared)
+            if score > best_score:
+                best, best_score = intent, score
+        return best, min(best_score, 1.0)
+
+    # ── Slots ─────────────────────────────────────────────────────────────
+
+    def _slots(self, intent: str, text: str, span) -> dict:
+        if intent in ("roast", "register_face"):
+            return {"name": self.extract_name(text)}
+        if intent == "lights":
+            return {"color": next((c for c in COLORS if re.search(rf"\b{c}\b", text)), "white")}
+        if intent == "play_music":
+            if span:  # "play <query>"
+                rest = re.sub(r"\b(hey jinx|jinx|please|some|me)\b", "", text[span[1]:])
+                return {"query": " ".join(rest.split()).strip(" ,.")}
+            return {"query": " ".join(w for w in _tokens(text) if w not in self.vocab["play_music"])}
+        if intent == "agent_query":
+            return {"query": text}
+        return {}
+
+    @staticmethod
+    def extract_name(text: str) -> str:
+        for match in re.finditer(r"(?:roast|register|learn|remember|call)\s+(?:me\s+as\s+)?(\w+)", text):
+            if match.group(1) not in _NOT_NAME:
+                return match.group(1).capitalize()
+        return ""
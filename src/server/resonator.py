@@ -0,0 +1,218 @@
+"""
+RESONATOR.PY — AUDIO PLAYBACK ENGINE
+One long-lived sounddevice output stream for everything JINX says.
+Clips are decoded in memory (soundfile), resampled to the stream rate
+and queued as utterances; the output callback runs straight from one
+utterance into the next, so there is no process start-up and no gap
+between sentences. cancel() drops the current and queued utterances at
+once (barge-in).
+
+Music keeps streaming through a single idle mpv instance driven over
+its JSON IPC socket (yt-dlp URLs need mpv's network demuxers). While
+speech is playing, the music volume is ducked and restored afterwards.
+"""
+
+import io
+import json
+import time
+import socket
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from collections import deque
+
+import numpy as np
+
+import dna
+from antenna import Resampler
+
+try:
+    import sounddevice as sd
+    SD_AVAILABLE = True
+except ImportError:
+    SD_AVAILABLE = False
+
+try:
+    import soundfile as sf
+    SF_AVAILABLE = True
+except ImportError:
+    SF_AVAILABLE = False
+
+
+class Utterance:
+    def __init__(self, pcm: np.ndarray):
+        self.pcm       = pcm
+        self.pos       = 0
+        self.cancelled = False
+        self.started   = None   # Monotonic time its first sample went to the device
+        self.done      = threading.Event()
+
+
+class Resonator:
+    def __init__(self, rate: int = None):
+        self.rate    = rate or dna.PLAYBACK_RATE
+        self.queue   = deque()
+        self.current = None
+        self.stream  = None
+        self.running = False
+        self.idle    = threading.Event()   # Nothing queued or playing
+        self.active  = threading.Event()   # Speech started since the ducker last looked
+        self.idle.set()
+        self._lock   = threading.Lock()
+
+        # Music: one idle mpv, controlled over IPC
+        self.music     = None
+        self.music_ipc = str(Path(tempfile.gettempdir()) / "jinx-music.sock")
+        self.playing   = False  # A song is loaded (mpv itself stays up between songs)
+        self.ducked    = False
+
+    def start(self) -> bool:
+        if not (SD_AVAILABLE and SF_AVAILABLE):
+            print("  [RESONATOR] sounddevice/soundfile missing — falling back to mpv per clip")
+            return False
+        try:
+            self.stream = sd.OutputStream(samplerate=self.rate, channels=1, dtype="float32",
+                                          blocksize=int(self.rate * dna.PLAYBACK_BLOCK_MS / 1000),
+                                          callback=self._on_audio)
+            self.stream.start()
+        except Exception as e:
+            print(f"  [RESONATOR] Output device unavailable: {e}")
+            self.stream = None
+            return False
+        self.running = True
+        threading.Thread(target=self._ducker, name="resonator-duck", daemon=True).start()
+        print(f"  [RESONATOR] Playback engine at {self.rate} Hz")
+        return True
+
+    def stop(self):
+        self.running = False
+        self.cancel()
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        if self.music and self.music.poll() is None:
+            self.music.terminate()
+        self.music = None
+
+    # ── Speech ────────────────────────────────────────────────────────────
+
+    def decode(self, audio: bytes) -> np.ndarray | None:
+        """Encoded clip (MP3/WAV/OGG...) → mono float32 at the stream rate."""
+        try:
+            data, rate = sf.read(io.BytesIO(audio), dtype="float32", always_2d=True)
+        except Exception as e:
+            print(f"  [RESONATOR] Can't decode clip: {e}")
+            return None
+        mono = data.mean(axis=1)
+        return mono if rate == self.rate else Resampler(rate, self.rate)(mono)
+
+    def play(self, audio) -> Utterance | None:
+        """Queue a clip (encoded bytes or PCM) behind whatever is playing."""
+        pcm = self.decode(audio) if isinstance(audio, (bytes, bytearray)) else audio
+        if pcm is None or not self.running:
+            return None
+        utterance = Utterance(pcm.astype(np.float32, copy=False))
+        with self._lock:
+            self.queue.append(utterance)
+            self.idle.clear()
+            self.active.set()
+        return utterance
+
+    def cancel(self):
+        """Barge-in: stop now and drop everything queued."""
+        with self._lock:
+            dropped = ([self.current] if self.current else []) + list(self.queue)
+            self.current = None
+            self.queue.clear()
+            self.idle.set()
+        for utterance in dropped:
+            utterance.cancelled = True
+            utterance.done.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until everything queued has played (or was cancelled)."""
+        return self.idle.wait(timeout)
+
+    @property
+    def busy(self) -> bool:
+        return not self.idle.is_set()
+
+    def _on_audio(self, outdata, frames, time_info, status):
+        out    = outdata[:, 0]
+        filled = 0
+        with self._lock:  # Only ever contended by play()/cancel(), both O(1)
+            while filled < frames:
+                if self.current is None:
+                    if not self.queue:
+                        break
+                    self.current = self.queue.popleft()
+                u = self.current
+                if u.started is None:
+                    u.started = time.monotonic() + filled / self.rate
+                n = min(frames - filled, len(u.pcm) - u.pos)
+                out[filled:filled + n] = u.pcm[u.pos:u.pos + n]
+                u.pos  += n
+                filled += n
+                if u.pos >= len(u.pcm):
+                    u.done.set()
+                    self.current = None
+            out[filled:] = 0.0
+            if self.current is None and not self.queue:
+                self.idle.set()
+
+    # ── Music ─────────────────────────────────────────────────────────────
+
+    def play_music(self, url: str):
+        """Replace whatever music is playing; mpv is started once and reused."""
+        if self.music is None or self.music.poll() is not None:
+            Path(self.music_ipc).unlink(missing_ok=True)
+            self.music = subprocess.Popen(
+                ["mpv", "--idle=yes", "--no-video", "--no-terminal",
+                 f"--volume={dna.MUSIC_VOLUME}", f"--input-ipc-server={self.music_ipc}"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            deadline = time.time() + 3
+            while not Path(self.music_ipc).exists() and time.time() < deadline:
+                time.sleep(0.05)
+        self.playing = self._mpv("loadfile", url, "replace")
+        self.ducked  = self.busy and self._mpv("set_property", "volume", dna.DUCK_VOLUME)
+
+    def stop_music(self) -> bool:
+        """Stop the music (mpv stays idle for the next song). True if any was playing."""
+        was, self.playing = self.playing, False
+        if self.music is None or self.music.poll() is not None:
+            return False
+        self._mpv("stop")
+        return was
+
+    def _mpv(self, *command) -> bool:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1)
+                sock.connect(self.music_ipc)
+                sock.sendall((json.dumps({"command": list(command)}) + "\n").encode())
+            return True
+        except OSError:
+            return False
+
+    def _ducker(self):
+        """Duck music while speech plays; release once it has been quiet for
+        DUCK_RELEASE seconds, so gaps between sentences don't pump the volume."""
+        while self.running:
+            if not self.active.wait(1):
+                continue
+            self.active.clear()
+            if self.music and self.music.poll() is None and not self.ducked:
+                self.ducked = self._mpv("set_property", "volume", dna.DUCK_VOLUME)
+            while self.running:
+                self.idle.wait(1)
+                if self.busy:
+                    continue
+                time.sleep(dna.DUCK_RELEASE)
+                if not self.busy:
+                    break
+            self.active.clear()
+            if self.ducked:
+                self._mpv("set_property", "volume", dna.MUSIC_VOLUME)
+                self.ducked = False
@@ -0,0 +1,98 @@
+"""
+SCRIBE.PY — PDF EXTRACTION PIPELINE
+Pulls text out of PDFs page by page. Large files are split into page
+batches and extracted in a process pool, and pages are yielded in order
+as they finish, so the caller can chunk and index a 500-page manual
+without waiting for (or holding) the whole thing. In-flight batches are
+bounded, which bounds memory per document.
+"""
+
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import dna
+
+try:
+    import PyPDF2
+    PDF_AVAILABLE = True
+except ImportError:
+    try:
+        import pypdf as PyPDF2
+        PDF_AVAILABLE = True
+    except ImportError:
+        PDF_AVAILABLE = False
+        print("  [SCRIBE] Install PyPDF2 or pypdf for PDF support: pip install pypdf")
+
+
+def _extract_range(path: str, start: int, stop: int) -> list:
+    """Worker: [(page_no, text)] for pages start..stop-1 (page_no is 1-based)."""
+    out = []
+    with open(path, "rb") as f:
+        reader = PyPDF2.PdfReader(f)
+        for i in range(start, min(stop, len(reader.pages))):
+            try:
+                text = reader.pages[i].extract_text() or ""
+            except Exception:
+                text = ""  # One bad page shouldn't sink the document
+            out.append((i + 1, text))
+    return out
+
+
+class Scribe:
+    def __init__(self, workers: int = None):
+        self.workers = max(1, workers or dna.PDF_WORKERS)
+        self.pool    = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Spawned, not forked: the server process is full of threads and sockets.
+        # Spawned workers re-import __main__, so genesis keeps its module-level
+        # imports light (the heavy ones happen in Deskbot.startup)
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return self.pool
+
+    def page_count(self, path: Path) -> int:
+        with open(path, "rb") as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+    def pages(self, path: Path):
+        """Yield (page_no, text) in page order. Closing the generator early
+        (e.g. the document hit its size cap) cancels the remaining batches."""
+        n     = self.page_count(path)
+        batch = max(1, dna.PDF_PAGE_BATCH)
+
+        if n <= batch or self.workers == 1:
+            for start in range(0, n, batch):
+                yield from _extract_range(str(path), start, start + batch)
+            return
+
+        pool     = self._pool()
+        starts   = iter(range(0, n, batch))
+        inflight = deque()
+        try:
+            for start in starts:
+                inflight.append((start, pool.submit(_extract_range, str(path), start, start + batch)))
+                if len(inflight) >= self.workers * 2:
+                    break
+            while inflight:
+                start, future = inflight.popleft()
+                try:
+                    results = future.result()
+                except Exception as e:
+                    print(f"  [SCRIBE] {path.name}: pages {start + 1}-{start + batch} failed: {e}")
+                    results = []
+                nxt = next(starts, None)
+                if nxt is not None:
+                    inflight.append((nxt, pool.submit(_extract_range, str(path), nxt, nxt + batch)))
+                yield from results
+        finally:
+            for _, future in inflight:
+                future.cancel()
+
+    def shutdown(self):
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
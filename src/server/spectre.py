@@ -0,0 +1,190 @@
+"""
+SPECTRE.PY — VOICE LATENCY TRACER
+Times one voice interaction end to end as a span tree:
+
+    interaction
+    ├── ack               speak → tts → playback
+    ├── listen            capture + endpointing (→ stt on the non-streaming paths)
+    └── command
+        ├── classify
+        └── speak_stream  (or speak, for local intents)
+            ├── llm       first_token_ms
+            └── synth     helper thread: tts → playback, per sentence
+
+Spans nest per thread; a span opened on a thread with nothing open
+(e.g. the synth helper) hangs off its explicit parent or the root.
+Playback reports when its first sample reached the device, which gives
+the two numbers that matter: wake word → first audio (the ack) and end
+of the user's speech → first audio of the reply.
+
+Each finished trace is logged to Blackbox (VOICE_TRACE) and published on
+TOPIC["voice_trace"] together with rolling p50/p95 per phase. With no
+interaction open every call is a cheap no-op.
+"""
+
+import time
+import threading
+from collections import deque
+
+import dna
+
+
+def _pct(samples, q: float):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+
+class Span:
+    def __init__(self, name: str, parent=None, **attrs):
+        self.name     = name
+        self.parent   = parent
+        self.attrs    = attrs
+        self.children = []
+        self.start    = time.monotonic()
+        self.end      = None
+        self.audio_at = None  # Monotonic time the first sample of this span's audio played
+
+    def to_dict(self, origin: float) -> dict:
+        end  = self.end or time.monotonic()
+        node = {"name": self.name,
+                "at_ms": round((self.start - origin) * 1000, 1),
+                "ms":    round((end - self.start) * 1000, 1)}
+        if self.audio_at:
+            node["audio_ms"] = round((self.audio_at - origin) * 1000, 1)
+        if self.attrs:
+            node["attrs"] = self.attrs
+        if self.children:
+            node["children"] = [c.to_dict(origin) for c in self.children]
+        return node
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class _Open:
+    """Context manager returned by Spectre.span()."""
+
+    def __init__(self, spectre, span):
+        self.spectre = spectre
+        self.span    = span
+
+    def __enter__(self):
+        return self.span
+
+    def __exit__(self, *exc):
+        if self.span is not None:
+            self.spectre._close(self.span)
+        return False
+
+
+class Spectre:
+    def __init__(self, synapse=None, blackbox=None):
+        self.synapse  = synapse
+        self.blackbox = blackbox
+        self.root     = None
+        self.history  = deque(maxlen=dna.SPECTRE_HISTORY)  # Summaries of finished traces
+        self._local   = threading.local()
+        self._lock    = threading.Lock()
+
+    # ── Tracing ───────────────────────────────────────────────────────────
+
+    def begin(self, name: str = "interaction", **attrs) -> Span:
+        """Start a new trace (an unfinished one is discarded)."""
+        with self._lock:
+            self.root = Span(name, **attrs)
+        self._local.stack = [self.root]
+        return self.root
+
+    def span(self, name: str, parent: Span = None, **attrs) -> _Open:
+        """`with spectre.span("tts") as span:` — span is None when not tracing."""
+        root = self.root
+        if root is None or root.end is not None:
+            return _Open(self, None)
+        stack  = self._stack()
+        parent = parent or (stack[-1] if stack else root)
+        span   = Span(name, parent, **attrs)
+        with self._lock:
+            parent.children.append(span)
+        stack.append(span)
+        return _Open(self, span)
+
+    def audio(self, at: float = None):
+        """First audio sample of the innermost open span on this thread played
+        at `at` (monotonic; default now). The earliest report wins."""
+        stack = self._stack()
+        if not stack or self.root is None:
+            return
+        at   = at or time.monotonic()
+        span = stack[-1]
+        if span.audio_at is None or at < span.audio_at:
+            span.audio_at = at
+
+    def end(self) -> dict | None:
+        """Finish the trace; log, publish and return its summary."""
+        with self._lock:
+            root, self.root = self.root, None
+        if root is None:
+            return None
+        root.end = time.monotonic()
+        self._local.stack = []
+        summary = self._summarize(root)
+        self.history.append(summary)
+        tree = root.to_dict(root.start)
+        if self.blackbox:
+            self.blackbox.log_event("VOICE_TRACE", {**summary, "tree": tree})
+        if self.synapse:
+            self.synapse.publish(dna.TOPIC["voice_trace"], {**summary, "stats": self.stats()})
+        print(f"  [SPECTRE] {summary['total_ms']:.0f} ms total, first audio "
+              f"{summary['first_audio_ms']} ms, reply audio {summary['reply_audio_ms']} ms")
+        return summary
+
+    # ── Metrics ───────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        """p50/p95/p99 per metric over the last SPECTRE_HISTORY traces."""
+        metrics = {}
+        for summary in list(self.history):
+            for key in ("total_ms", "first_audio_ms", "reply_audio_ms"):
+                if summary[key] is not None:
+                    metrics.setdefault(key, []).append(summary[key])
+            for phase, ms in summary["phases"].items():
+                metrics.setdefault(phase, []).append(ms)
+        return {key: {"n": len(v), "p50": _pct(v, 0.5), "p95": _pct(v, 0.95), "p99": _pct(v, 0.99)}
+                for key, v in metrics.items()}
+
+    def _summarize(self, root: Span) -> dict:
+        origin = root.start
+        phases = {}
+        for span in root.walk():
+            if span is not root and span.end:
+                phases[span.name] = round(phases.get(span.name, 0.0) + (span.end - span.start) * 1000, 1)
+
+        heard  = [s.audio_at for s in root.walk() if s.audio_at]
+        listen = next((s for s in root.children if s.name == "listen" and s.end), None)
+        after  = [a for a in heard if listen and a >= listen.end]
+        return {
+            "ts":             round(time.time(), 3),
+            "total_ms":       round((root.end - origin) * 1000, 1),
+            "first_audio_ms": round((min(heard) - origin) * 1000, 1) if heard else None,
+            "reply_audio_ms": round((min(after) - listen.end) * 1000, 1) if after else None,
+            "phases":         phases,
+            **root.attrs,
+        }
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None or (stack and stack[0] is not self.root):
+            stack = self._local.stack = [self.root] if self.root else []
+        return stack
+
+    def _close(self, span: Span):
+        span.end = time.monotonic()
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)  # Not always the top: generators close out of order
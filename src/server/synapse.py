@@ -1,81 +1,710 @@
 """
 SYNAPSE.PY — MQTT CENTRAL HUB
 All inter-module communication goes through here.
+
+Subscribers receive a Pulse: the raw payload bytes plus lazily cached
+text / JSON / msgpack views, decoded at most once per message no matter
+how many callbacks share it.
+
+Publishes are shaped per topic by dna.PUBLISH_POLICY: latest-value
+coalescing under a max rate, change-only suppression, and batch envelopes
+on TOPIC["batch"] that Synapse unpacks back into per-topic deliveries.
+
+Transport (dna.SYNAPSE_TRANSPORT):
+  "mqtt"      every message round-trips through the broker
+  "hybrid"    modules in this process get messages directly from the
+              dispatcher; only dna.BRIDGE_TOPICS are mirrored to MQTT
+  "loopback"  no broker at all — for tests and offline runs
+
+Broker outages never block: paho reconnects in the background with
+exponential backoff, and publishes made while offline wait in a bounded
+priority buffer (dna.OFFLINE_PRIORITY) that is replayed on reconnect.
+
+Every topic is metered — publish/receive counts and bytes, callback
+time histograms, end-to-end latency — available from stats() and
+broadcast on TOPIC["synapse_stats"] every SYNAPSE_STATS_INTERVAL.
 """
 
 import json
 import time
+import heapq
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import paho.mqtt.client as mqtt
 import dna
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+TRANSPORTS = ("mqtt", "hybrid", "loopback")
+
+_UNSET = object()
+
+
+def _encode(payload) -> bytes:
+    """Wire form of a payload. Binary payloads pass through untouched."""
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, (bytearray, memoryview)):
+        return bytes(payload)
+    if isinstance(payload, (dict, list)):
+        payload = json.dumps(payload)
+    return str(payload).encode("utf-8")
+
+
+class Pulse:
+    """One message on the bus. Treat decoded views as read-only — they are shared."""
+
+    __slots__ = ("topic", "sent_at", "_raw", "_text", "_json", "_msgpack", "_lock")
+
+    def __init__(self, topic: str, raw: bytes = None):
+        self.topic    = topic
+        self.sent_at  = None  # Publisher's time.time(), when known (local or "_ts" stamped)
+        self._raw     = raw if raw is None or isinstance(raw, bytes) else bytes(raw)
+        self._text    = None
+        self._json    = _UNSET
+        self._msgpack = _UNSET
+        self._lock    = threading.RLock()
+
+    @classmethod
+    def local(cls, topic: str, payload) -> "Pulse":
+        """Wrap a published object for in-process delivery — nothing is serialized up front."""
+        if isinstance(payload, (bytes, bytearray, memoryview)):
+            return cls(topic, payload)
+        pulse = cls(topic)
+        if isinstance(payload, (dict, list)):
+            pulse._json = payload
+        else:
+            pulse._text = payload if isinstance(payload, str) else str(payload)
+        return pulse
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            with self._lock:
+                if self._raw is None:
+                    self._raw = _encode(self._text if self._text is not None else self._json)
+        return self._raw
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view over the raw payload (frames, binary blobs)."""
+        return memoryview(self.raw)
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            with self._lock:
+                if self._text is None:
+                    self._text = self.raw.decode("utf-8", errors="ignore")
+        return self._text
+
+    def json(self):
+        """Parsed JSON payload. A parse failure is cached and re-raised too."""
+        if self._json is _UNSET:
+            with self._lock:
+                if self._json is _UNSET:
+                    try:
+                        self._json = json.loads(self.text)
+                    except ValueError as e:
+                        self._json = e
+        if isinstance(self._json, ValueError):
+            raise self._json
+        return self._json
+
+    def msgpack(self):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not installed: pip install msgpack")
+        if self._msgpack is _UNSET:
+            with self._lock:
+                if self._msgpack is _UNSET:
+                    self._msgpack = msgpack.unpackb(self.raw, raw=False)
+        return self._msgpack
+
+    def __bytes__(self) -> bytes:
+        return self.raw
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"Pulse({self.topic!r}, {len(self.raw)} bytes)"
+
+
+class _Pacer:
+    """One timer thread for every deferred flush (coalesced topics, batch windows)."""
+
+    def __init__(self, fire):
+        self._fire  = fire       # fire(key) runs on the pacer thread
+        self._heap  = []         # [(deadline, key)]
+        self._keys  = set()
+        self._cond  = threading.Condition()
+        threading.Thread(target=self._run, name="synapse-pacer", daemon=True).start()
+
+    def schedule(self, key, deadline: float):
+        with self._cond:
+            if key in self._keys:
+                return
+            self._keys.add(key)
+            heapq.heappush(self._heap, (deadline, key))
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                deadline, key = self._heap[0]
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                self._keys.discard(key)
+            try:
+                self._fire(key)
+            except Exception as e:
+                print(f"  [SYNAPSE] Deferred flush error on {key}: {e}")
+
+
+# Callback / latency histogram bucket upper bounds, milliseconds
+HIST_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class _TopicMeter:
+    """Counters for one topic. Mutated under Synapse._meter_lock."""
+
+    __slots__ = ("pub", "wire", "wire_bytes", "recv", "recv_bytes",
+                 "cb_count", "cb_total", "cb_max", "cb_hist",
+                 "lat_count", "lat_total", "lat_max", "lat_hist", "mark")
+
+    def __init__(self):
+        self.pub = self.wire = self.wire_bytes = self.recv = self.recv_bytes = 0
+        self.cb_count, self.cb_total, self.cb_max = 0, 0.0, 0.0
+        self.lat_count, self.lat_total, self.lat_max = 0, 0.0, 0.0
+        self.cb_hist  = [0] * (len(HIST_BUCKETS_MS) + 1)
+        self.lat_hist = [0] * (len(HIST_BUCKETS_MS) + 1)
+        self.mark     = (0, 0, 0)  # (pub, wire_bytes, recv) at the start of the rate window
+
+    @staticmethod
+    def _bucket(ms: float) -> int:
+        for i, bound in enumerate(HIST_BUCKETS_MS):
+            if ms <= bound:
+                return i
+        return len(HIST_BUCKETS_MS)
+
+    def add_callback(self, ms: float):
+        self.cb_count += 1
+        self.cb_total += ms
+        self.cb_max    = max(self.cb_max, ms)
+        self.cb_hist[self._bucket(ms)] += 1
+
+    def add_latency(self, ms: float):
+        self.lat_count += 1
+        self.lat_total += ms
+        self.lat_max    = max(self.lat_max, ms)
+        self.lat_hist[self._bucket(ms)] += 1
+
+    def snapshot(self, window: float) -> dict:
+        pub0, bytes0, recv0 = self.mark
+        window = max(window, 1e-6)
+        return {
+            "pub":        self.pub,
+            "pub_rate":   round((self.pub - pub0) / window, 2),
+            "wire":       self.wire,
+            "wire_bytes": self.wire_bytes,
+            "wire_bps":   round((self.wire_bytes - bytes0) / window, 1),
+            "recv":       self.recv,
+            "recv_rate":  round((self.recv - recv0) / window, 2),
+            "recv_bytes": self.recv_bytes,
+            "cb_ms_avg":  round(self.cb_total / self.cb_count, 2) if self.cb_count else None,
+            "cb_ms_max":  round(self.cb_max, 2),
+            "cb_hist":    list(self.cb_hist),
+            "lat_ms_avg": round(self.lat_total / self.lat_count, 2) if self.lat_count else None,
+            "lat_ms_max": round(self.lat_max, 2),
+            "lat_hist":   list(self.lat_hist),
+        }
+
+
+class _OfflineBuffer:
+    """Bounded priority queue of publishes made while the broker is unreachable."""
+
+    def __init__(self, capacity: int, max_age: float):
+        self.capacity = capacity
+        self.max_age  = max_age
+        self._heap    = []       # [(priority, seq, queued_at, topic, raw, retain)]
+        self._seq     = 0
+        self._lock    = threading.Lock()
+        self.dropped  = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, priority: int, topic: str, raw: bytes, retain: bool):
+        with self._lock:
+            self._seq += 1
+            item = (priority, self._seq, time.monotonic(), topic, raw, retain)
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, item)
+                return
+            # Full: evict the least important, newest entry — possibly this one
+            worst = max(self._heap)
+            self.dropped += 1
+            if item >= worst:
+                return
+            self._heap.remove(worst)
+            heapq.heapify(self._heap)
+            heapq.heappush(self._heap, item)
+
+    def pop(self):
+        """Next (topic, raw, retain) to replay, skipping anything too old to matter."""
+        with self._lock:
+            now = time.monotonic()
+            while self._heap:
+                _, _, queued_at, topic, raw, retain = heapq.heappop(self._heap)
+                if now - queued_at <= self.max_age:
+                    return topic, raw, retain
+                self.dropped += 1
+            return None
+
+    def requeue(self, topic: str, raw: bytes, retain: bool):
+        """Put back an entry whose replay failed, ahead of its priority peers."""
+        with self._lock:
+            heapq.heappush(self._heap, (-1, 0, time.monotonic(), topic, raw, retain))
+
+
+class _TopicState:
+    __slots__ = ("last", "last_at", "pending")
 
-class Synapse:
     def __init__(self):
-        self.client      = mqtt.Client()
+        self.last    = None    # Last payload that went out
+        self.last_at = 0.0     # monotonic time it went out
+        self.pending = None    # Latest coalesced payload waiting for its slot
+
+
+class Synapse:
+    def __init__(self, transport: str = None):
+        self.transport   = transport or dna.SYNAPSE_TRANSPORT
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Unknown Synapse transport: {self.transport}")
         self.subscribers = {}  # topic -> [callback]
         self._connected  = False
+        self._dispatcher = ThreadPoolExecutor(max_workers=dna.SYNAPSE_WORKERS,
+                                              thread_name_prefix="synapse")
+
+        # Topics mirrored onto MQTT (None = all of them)
+        if self.transport == "mqtt":
+            self._bridged = None
+        elif self.transport == "hybrid":
+            self._bridged = {dna.TOPIC[k] for k in dna.BRIDGE_TOPICS} | {dna.TOPIC["batch"]}
+        else:
+            self._bridged = set()
+
+        # Hybrid mode: fingerprints of our own bridged publishes, so the broker
+        # echo isn't delivered a second time to local subscribers
+        self._echoes     = {}  # (topic, raw) -> [count, monotonic time]
+        self._echo_lock  = threading.Lock()
+
+        # Publish shaping: full topic string -> policy dict
+        self._policies   = {dna.TOPIC[k]: p for k, p in dna.PUBLISH_POLICY.items() if k in dna.TOPIC}
+        self._shape      = {}  # topic -> _TopicState
+        self._batch      = {}  # topic -> payload, insertion-ordered
+        self._shape_lock = threading.Lock()
+        self._pacer      = _Pacer(self._on_pacer)
+        self.shaping_stats = {"sent": 0, "coalesced": 0, "suppressed": 0, "batched": 0}
+
+        # Per-topic metering
+        self._meters      = {}  # topic -> _TopicMeter
+        self._meter_lock  = threading.Lock()
+        self._window_start = time.monotonic()
+        # The firmware parses device payloads as-is, so those are never stamped
+        self._stamped     = {dna.TOPIC[k] for k in dna.STAMP_TOPICS - dna.DEVICE_TOPICS if k in dna.TOPIC}
+        if dna.SYNAPSE_STATS_INTERVAL:
+            self._pacer.schedule(("stats",), time.monotonic() + dna.SYNAPSE_STATS_INTERVAL)
+
+        # Offline buffering + link state
+        self._priorities = {dna.TOPIC[k]: p for k, p in dna.OFFLINE_PRIORITY.items() if k in dna.TOPIC}
+        self._offline    = _OfflineBuffer(dna.OFFLINE_QUEUE_MAX, dna.OFFLINE_MAX_AGE)
+        self._online     = threading.Event()
+        self._replaying  = False
+        self._replay_lock = threading.Lock()
+        self._closing    = False
+        self._down_since = time.monotonic()
+        self.link_stats  = {
+            "connects": 0, "disconnects": 0, "publish_failures": 0,
+            "buffered": 0, "replayed": 0, "discarded": 0, "offline_seconds": 0.0,
+            "last_connect": None, "last_disconnect": None,
+        }
 
-        self.client.on_connect    = self._on_connect
-        self.client.on_message    = self._on_message
-        self.client.on_disconnect = self._on_disconnect
+        self.client = None
+        if self.transport != "loopback":
+            self.client = mqtt.Client()
+            self.client.reconnect_delay_set(min_delay=dna.MQTT_RECONNECT_MIN,
+                                            max_delay=dna.MQTT_RECONNECT_MAX)
+            self.client.on_connect    = self._on_connect
+            self.client.on_message    = self._on_message
+            self.client.on_disconnect = self._on_disconnect
+
+    def _is_bridged(self, topic: str) -> bool:
+        return self._bridged is None or topic in self._bridged
+
+    def _wants_mqtt(self, topic: str) -> bool:
+        """Whether this process should receive a topic from the broker."""
+        if self.transport == "mqtt":
+            return True
+        # Hybrid: local publishes arrive directly; only listen for outside producers
+        return topic != dna.TOPIC["batch"] and self._is_bridged(topic)
 
     def connect(self):
-        retries = 0
-        while retries < 10:
-            try:
-                self.client.connect(dna.MQTT_BROKER, dna.MQTT_PORT, keepalive=60)
-                self.client.loop_start()
-                time.sleep(0.5)
-                if self._connected:
-                    return
-            except Exception as e:
-                print(f"  [SYNAPSE] MQTT connect failed (attempt {retries+1}): {e}")
-                time.sleep(2)
-            retries += 1
-        raise ConnectionError("Could not connect to MQTT broker. Is Mosquitto running?")
+        """Start the MQTT link. Never blocks longer than MQTT_CONNECT_TIMEOUT —
+        if the broker is down we run offline and paho keeps retrying with backoff."""
+        if self.client is None:
+            print("  [SYNAPSE] Loopback bus — no MQTT broker")
+            return
+        try:
+            self.client.connect_async(dna.MQTT_BROKER, dna.MQTT_PORT, keepalive=60)
+        except Exception as e:
+            print(f"  [SYNAPSE] MQTT connect setup failed: {e}")
+        self.client.loop_start()
+        if not self._online.wait(dna.MQTT_CONNECT_TIMEOUT):
+            print(f"  [SYNAPSE] Broker {dna.MQTT_BROKER}:{dna.MQTT_PORT} unreachable — "
+                  "running offline, publishes buffered, retrying in background")
 
     def _on_connect(self, client, userdata, flags, rc):
         if rc == 0:
             self._connected = True
-            print(f"  [SYNAPSE] MQTT connected to {dna.MQTT_BROKER}:{dna.MQTT_PORT}")
+            self._online.set()
+            self.link_stats["connects"] += 1
+            self.link_stats["last_connect"] = time.time()
+            self.link_stats["offline_seconds"] += time.monotonic() - self._down_since
+            print(f"  [SYNAPSE] MQTT connected to {dna.MQTT_BROKER}:{dna.MQTT_PORT} ({self.transport})")
             for topic in self.subscribers:
-                client.subscribe(topic)
+                if self._wants_mqtt(topic):
+                    client.subscribe(topic)
+            if self.transport == "mqtt":
+                client.subscribe(dna.TOPIC["batch"])
+            if len(self._offline):
+                # Drain off the network thread so paho keeps servicing the socket
+                threading.Thread(target=self._replay, name="synapse-replay", daemon=True).start()
         else:
             print(f"  [SYNAPSE] MQTT connection failed: rc={rc}")
 
     def _on_disconnect(self, client, userdata, rc):
+        # Runs on paho's network thread: record state and return — the loop
+        # reconnects on its own with exponential backoff (reconnect_delay_set)
         self._connected = False
+        self._online.clear()
+        self._down_since = time.monotonic()
+        if self._closing:
+            return
+        self.link_stats["disconnects"] += 1
+        self.link_stats["last_disconnect"] = time.time()
         if rc != 0:
-            print("  [SYNAPSE] MQTT disconnected unexpectedly, reconnecting...")
-            time.sleep(2)
-            self.connect()
+            print("  [SYNAPSE] MQTT disconnected unexpectedly, buffering until reconnect...")
+
+    def _buffer(self, topic: str, raw: bytes, retain: bool):
+        priority = self._priorities.get(topic, dna.OFFLINE_DEFAULT_PRIORITY)
+        if priority is None:
+            self.link_stats["discarded"] += 1  # Live-only data (frames, tracking) is worthless later
+            return
+        self._offline.push(priority, topic, raw, retain)
+        self.link_stats["buffered"] += 1
+
+    def _replay(self):
+        if not self._replay_lock.acquire(blocking=False):
+            return  # Another replay is already draining
+        replayed = 0
+        backoff  = dna.REPLAY_BACKOFF_BASE
+        try:
+            # Re-check after clearing the flag: publishes can slip into the
+            # buffer between the last pop and _replaying going False
+            while self._connected and len(self._offline):
+                self._replaying = True
+                try:
+                    while self._connected:
+                        entry = self._offline.pop()
+                        if entry is None:
+                            break
+                        topic, raw, retain = entry
+                        if self.client.publish(topic, raw, retain=retain).rc != mqtt.MQTT_ERR_SUCCESS:
+                            # Client queue full, or the link dropped before on_disconnect
+                            # fired: wait (live publishes keep buffering behind us) and retry
+                            self._offline.requeue(topic, raw, retain)
+                            time.sleep(backoff)
+                            backoff = min(backoff * 2, dna.REPLAY_BACKOFF_MAX)
+                            continue
+                        backoff = dna.REPLAY_BACKOFF_BASE
+                        replayed += 1
+                finally:
+                    self._replaying = False
+        except Exception as e:
+            print(f"  [SYNAPSE] Replay error: {e}")
+        finally:
+            self._replay_lock.release()
+        self.link_stats["replayed"] += replayed
+        if replayed:
+            print(f"  [SYNAPSE] Replayed {replayed} buffered messages")
+
+    def link_status(self) -> dict:
+        """Connection state and offline-buffer metrics."""
+        offline = 0.0 if self._connected else time.monotonic() - self._down_since
+        return {
+            **self.link_stats,
+            "state": "loopback" if self.client is None
+                     else "online" if self._connected else "offline",
+            "offline_seconds": round(self.link_stats["offline_seconds"] + offline, 1),
+            "queue_depth": len(self._offline),
+            "dropped": self._offline.dropped,
+        }
 
     def _on_message(self, client, userdata, msg):
-        topic   = msg.topic
-        payload = msg.payload.decode("utf-8", errors="ignore")
-        callbacks = self.subscribers.get(topic, [])
-        for cb in callbacks:
+        if msg.topic == dna.TOPIC["batch"]:
+            self._unpack_batch(msg.payload)
+        elif not self._is_echo(msg.topic, msg.payload):
+            self._dispatch(msg.topic, msg.payload)
+
+    def _is_echo(self, topic: str, raw: bytes) -> bool:
+        if self.transport != "hybrid":
+            return False
+        with self._echo_lock:
+            entry = self._echoes.get((topic, raw))
+            if entry is None:
+                return False
+            entry[0] -= 1
+            if entry[0] <= 0:
+                del self._echoes[(topic, raw)]
+            return True
+
+    def _expect_echo(self, topic: str, raw: bytes):
+        now = time.monotonic()
+        with self._echo_lock:
+            entry = self._echoes.setdefault((topic, raw), [0, now])
+            entry[0] += 1
+            entry[1] = now
+            if len(self._echoes) > 256:
+                # Echoes lost to a broker blip would otherwise pile up forever
+                stale = [k for k, (_, t) in self._echoes.items() if now - t > 5.0]
+                for k in stale:
+                    del self._echoes[k]
+
+    def _unpack_batch(self, raw: bytes):
+        try:
+            entries = json.loads(raw)["batch"]
+        except (ValueError, KeyError, TypeError):
+            print("  [SYNAPSE] Malformed batch envelope dropped")
+            return
+        for entry in entries:
+            self._dispatch(entry["topic"], entry["payload"].encode("utf-8"))
+
+    def _dispatch(self, topic: str, raw: bytes):
+        if topic in self.subscribers:
+            self._deliver(Pulse(topic, raw))  # One shared, lazily decoded message
+
+    def _deliver(self, pulse: Pulse):
+        topic = pulse.topic
+        if pulse.sent_at is None and topic in self._stamped:
             try:
-                threading.Thread(target=cb, args=(payload,), daemon=True).start()
-            except Exception as e:
-                print(f"  [SYNAPSE] Callback error on {topic}: {e}")
+                data = pulse.json()
+                if isinstance(data, dict):
+                    pulse.sent_at = data.get("_ts")
+            except ValueError:
+                pass
+        with self._meter_lock:
+            m = self._meter(topic)
+            m.recv += 1
+            if pulse._raw is not None:  # Local deliveries never had wire bytes
+                m.recv_bytes += len(pulse._raw)
+            if pulse.sent_at is not None:
+                m.add_latency(max(0.0, (time.time() - pulse.sent_at) * 1000))
+
+        for cb in self.subscribers.get(topic, []):
+            try:
+                self._dispatcher.submit(self._run_callback, cb, pulse)
+            except RuntimeError:
+                return  # Dispatcher shut down
+
+    def _run_callback(self, cb, pulse: Pulse):
+        start = time.perf_counter()
+        try:
+            cb(pulse)
+        except Exception as e:
+            print(f"  [SYNAPSE] Callback error on {pulse.topic}: {e}")
+        ms = (time.perf_counter() - start) * 1000
+        with self._meter_lock:
+            self._meter(pulse.topic).add_callback(ms)
+
+    def _meter(self, topic: str) -> _TopicMeter:
+        m = self._meters.get(topic)
+        if m is None:
+            m = self._meters[topic] = _TopicMeter()
+        return m
 
     def subscribe(self, topic: str, callback):
+        """Register callback(pulse: Pulse) for a topic."""
         if topic not in self.subscribers:
             self.subscribers[topic] = []
-            if self._connected:
+            if self._connected and self._wants_mqtt(topic):
                 self.client.subscribe(topic)
         self.subscribers[topic].append(callback)
 
+    encode = staticmethod(_encode)
+
     def publish(self, topic: str, payload, retain: bool = False):
-        if isinstance(payload, dict):
-            payload = json.dumps(payload)
+        sent_at = time.time()
+        with self._meter_lock:
+            self._meter(topic).pub += 1
+        if topic in self._stamped and isinstance(payload, dict):
+            payload = {**payload, "_ts": round(sent_at, 3)}  # End-to-end latency header
+
+        if self.transport != "mqtt":
+            # Local subscribers get the object itself, no broker round trip
+            if topic in self.subscribers:
+                pulse = Pulse.local(topic, payload)
+                pulse.sent_at = sent_at
+                self._deliver(pulse)
+            if not self._is_bridged(topic):
+                return
+
+        raw    = self.encode(payload)
+        policy = self._policies.get(topic)
+        if policy is None or retain:
+            self._send(topic, raw, retain)
+            return
+
+        now = time.monotonic()
+        with self._shape_lock:
+            st = self._shape.setdefault(topic, _TopicState())
+            unchanged = (policy.get("change_only") and raw == st.last
+                         and now - st.last_at < policy.get("refresh", float("inf")))
+            interval  = 1.0 / policy["max_rate"] if policy.get("max_rate") else 0.0
+
+            if interval and now - st.last_at < interval:
+                # Inside the rate window: keep only the newest value for the next slot
+                if unchanged:
+                    st.pending = None
+                    self.shaping_stats["suppressed"] += 1
+                else:
+                    if st.pending is not None:
+                        self.shaping_stats["coalesced"] += 1
+                    st.pending = raw
+                    self._pacer.schedule(("topic", topic), st.last_at + interval)
+                return
+            if unchanged:
+                self.shaping_stats["suppressed"] += 1
+                return
+            st.pending = None
+            st.last, st.last_at = raw, now
+        self._emit(topic, raw, policy)
+
+    def _emit(self, topic: str, raw: bytes, policy: dict):
+        """Send a shaped payload, either directly or into the open batch window."""
+        if policy.get("batch"):
+            try:
+                text = raw.decode("utf-8")
+            except UnicodeDecodeError:
+                text = None  # Binary can't ride in a JSON envelope
+            if text is not None:
+                with self._shape_lock:
+                    if topic in self._batch:
+                        self.shaping_stats["coalesced"] += 1
+                    self._batch.pop(topic, None)
+                    self._batch[topic] = text
+                    self.shaping_stats["batched"] += 1
+                self._pacer.schedule(("batch",), time.monotonic() + dna.BATCH_WINDOW)
+                return
+        self._send(topic, raw, False)
+
+    def _on_pacer(self, key):
+        if key[0] == "batch":
+            self._flush_batch()
+            return
+        if key[0] == "stats":
+            self.publish(dna.TOPIC["synapse_stats"], self.stats(reset_window=True))
+            self._pacer.schedule(("stats",), time.monotonic() + dna.SYNAPSE_STATS_INTERVAL)
+            return
+        topic = key[1]
+        with self._shape_lock:
+            st = self._shape[topic]
+            raw, st.pending = st.pending, None
+            if raw is None:
+                return
+            st.last, st.last_at = raw, time.monotonic()
+        self._emit(topic, raw, self._policies[topic])
+
+    def _flush_batch(self):
+        with self._shape_lock:
+            entries, self._batch = self._batch, {}
+        if not entries:
+            return
+        if len(entries) == 1:
+            (topic, text), = entries.items()
+            self._send(topic, text.encode("utf-8"), False)
+            return
+        envelope = {"batch": [{"topic": t, "payload": p} for t, p in entries.items()]}
+        self._send(dna.TOPIC["batch"], json.dumps(envelope).encode("utf-8"), False)
+
+    def flush(self):
+        """Push out every coalesced value and open batch immediately."""
+        with self._shape_lock:
+            pending = [(t, st) for t, st in self._shape.items() if st.pending is not None]
+        for topic, _ in pending:
+            self._on_pacer(("topic", topic))
+        self._flush_batch()
+
+    def _send(self, topic: str, raw: bytes, retain: bool):
+        """The single point where payloads go onto the wire."""
+        self.shaping_stats["sent"] += 1
+        with self._meter_lock:
+            m = self._meter(topic)
+            m.wire += 1
+            m.wire_bytes += len(raw)
+        if not self._connected or self._replaying:
+            # Offline, or older messages are still draining — keep ordering
+            self._buffer(topic, raw, retain)
+            return
+        if self.transport == "hybrid" and topic in self.subscribers and self._wants_mqtt(topic):
+            self._expect_echo(topic, raw)
         try:
-            self.client.publish(topic, str(payload), retain=retain)
+            rc = self.client.publish(topic, raw, retain=retain).rc
         except Exception as e:
             print(f"  [SYNAPSE] Publish error on {topic}: {e}")
+            rc = None
+        if rc != mqtt.MQTT_ERR_SUCCESS:
+            self.link_stats["publish_failures"] += 1
+            self._buffer(topic, raw, retain)
+
+    def stats(self, reset_window: bool = False) -> dict:
+        """Pull API: per-topic traffic, callback timing and latency, plus link/shaping state.
+        Rates cover the window since the last periodic stats broadcast."""
+        now = time.monotonic()
+        with self._meter_lock:
+            window = now - self._window_start
+            topics = {t: m.snapshot(window) for t, m in self._meters.items()}
+            if reset_window:
+                for m in self._meters.values():
+                    m.mark = (m.pub, m.wire_bytes, m.recv)
+                self._window_start = now
+        return {
+            "ts":         round(time.time(), 3),
+            "transport":  self.transport,
+            "window_s":   round(window, 2),
+            "hist_ms":    list(HIST_BUCKETS_MS),
+            "link":       self.link_status(),
+            "shaping":    dict(self.shaping_stats),
+            "topics":     topics,
+        }
 
     def disconnect(self):
-        self.client.loop_stop()
-        self.client.disconnect()
+        if self.client is not None:
+            self.flush()
+            self._closing = True
+            self.client.disconnect()
+            self.client.loop_stop()
+        self._dispatcher.shutdown(wait=False)
@@ -0,0 +1,301 @@
+"""
+TRIPWIRE.PY — FILESYSTEM WATCHER
+Event-driven file watching: inotify (via watchdog) when available, a
+cheap stat-only polling scan otherwise. Bursts of events for a path are
+debounced into a single "changed" or "deleted" callback.
+
+Recursive watches are laid one directory at a time so accept() can prune
+whole subtrees (node_modules, .venv, anything .gitignore'd) before a
+single inotify watch is spent on them.
+"""
+
+import os
+import re
+import time
+import threading
+from pathlib import Path
+
+import dna
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+    FileSystemEventHandler = object
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out, i = [], 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            close = pattern.find("]", i + 1)
+            if close == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:close].replace("\\", "\\\\")
+                out.append("[^" + body[1:] + "]" if body[:1] == "!" else "[" + body + "]")
+                i = close
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class GitIgnore:
+    """accept()-compatible filter implementing .gitignore rules (nested files,
+    negation, anchoring, dir-only patterns, **) plus always-pruned names."""
+
+    def __init__(self, root, always=()):
+        self.root   = Path(os.path.abspath(root))
+        self.always = set(always)
+        self._files = {}  # dir -> (mtime_ns, [(regex, negate, dir_only)])
+        self._dirs  = {}  # dir -> ignored? (cleared whenever a .gitignore changes)
+
+    def _rules(self, directory: Path) -> list:
+        gi = directory / ".gitignore"
+        try:
+            mtime = gi.stat().st_mtime_ns
+        except OSError:
+            if self._files.pop(directory, None):
+                self._dirs.clear()
+            return []
+        cached = self._files.get(directory)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        self._dirs.clear()
+        rules = []
+        for line in gi.read_text(encoding="utf-8", errors="ignore").splitlines():
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            line   = line[1:] if negate else line
+            dir_only = line.endswith("/")
+            line   = line.rstrip("/")
+            anchored = "/" in line
+            body   = _glob_to_regex(line.lstrip("/"))
+            regex  = re.compile(("" if anchored else "(?:.*/)?") + body + r"\Z")
+            rules.append((regex, negate, dir_only))
+        self._files[directory] = (mtime, rules)
+        return rules
+
+    def _ignored(self, path: Path, is_dir: bool) -> bool:
+        ignored = False
+        for base in reversed([path.parent, *path.parent.parents]):
+            if base != self.root and self.root not in base.parents:
+                continue
+            rel = path.relative_to(base).as_posix()
+            for regex, negate, dir_only in self._rules(base):
+                if (is_dir or not dir_only) and regex.match(rel):
+                    ignored = not negate
+        return ignored
+
+    def __call__(self, path: Path, is_dir: bool) -> bool:
+        path = Path(os.path.abspath(path))
+        try:
+            parts = path.relative_to(self.root).parts
+        except ValueError:
+            return False
+        if any(p in self.always for p in parts):
+            return False
+        # An ignored directory hides everything below it, so check ancestors too
+        current = self.root
+        for part in parts[:-1]:
+            current = current / part
+            if current not in self._dirs:
+                self._dirs[current] = self._ignored(current, True)
+            if self._dirs[current]:
+                return False
+        return not self._ignored(path, is_dir)
+
+
+class _Relay(FileSystemEventHandler):
+    """Forwards watchdog events into Tripwire's debouncer."""
+
+    def __init__(self, wire: "Tripwire"):
+        self.wire = wire
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            if event.event_type in ("deleted", "moved"):
+                self.wire._prune(Path(event.src_path))
+            if event.event_type == "created":
+                self.wire._grow(Path(event.src_path))
+            elif event.event_type == "moved":
+                self.wire._grow(Path(event.dest_path))
+            return
+        if event.event_type == "moved":
+            self.wire.notify(Path(event.src_path), "deleted")
+            self.wire.notify(Path(event.dest_path), "changed")
+        elif event.event_type == "deleted":
+            self.wire.notify(Path(event.src_path), "deleted")
+        elif event.event_type in ("created", "modified", "closed"):
+            self.wire.notify(Path(event.src_path), "changed")
+
+
+class Tripwire:
+    def __init__(self, root, callback, accept=None, recursive: bool = True,
+                 debounce: float = None, name: str = "tripwire"):
+        """
+        callback(path: Path, kind: str) — kind is "changed" or "deleted".
+        accept(path: Path, is_dir: bool) -> bool — False skips a file or
+        prunes a whole directory from the scan.
+        """
+        self.root      = Path(root)
+        self.callback  = callback
+        self.accept    = accept or (lambda path, is_dir: True)
+        self.recursive = recursive
+        self.debounce  = dna.WATCH_DEBOUNCE if debounce is None else debounce
+        self.name      = name
+        self.running   = False
+        self.observer  = None
+        self._watches  = {}  # Native mode: directory -> ObservedWatch
+
+        self._pending  = {}  # path -> (kind, due monotonic time)
+        self._cond     = threading.Condition()
+        self._snapshot = {}  # Polling mode: path -> (mtime_ns, size)
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+
+    def start(self):
+        self.running = True
+        threading.Thread(target=self._debounce_loop, name=f"{self.name}-debounce", daemon=True).start()
+
+        if WATCHDOG_AVAILABLE:
+            try:
+                self.observer = Observer()
+                self._relay   = _Relay(self)
+                self._watch_tree(self.root)
+                self.observer.start()
+                print(f"  [TRIPWIRE] Watching {self.root} (inotify, {len(self._watches)} dirs)")
+                return
+            except Exception as e:
+                print(f"  [TRIPWIRE] Native watcher failed ({e}) — falling back to polling")
+                self.observer = None
+
+        self._snapshot = self._scan()
+        threading.Thread(target=self._poll_loop, name=f"{self.name}-poll", daemon=True).start()
+        print(f"  [TRIPWIRE] Watching {self.root} (polling every {dna.WATCH_POLL_INTERVAL}s)")
+
+    def stop(self):
+        self.running = False
+        if self.observer:
+            self.observer.stop()
+        with self._cond:
+            self._cond.notify()
+
+    def _watch_tree(self, top: Path) -> list:
+        """Schedule one non-recursive watch per accepted directory under top.
+        Returns the files found on the way."""
+        files, stack = [], [top]
+        while stack:
+            directory = stack.pop()
+            if directory not in self._watches:
+                self._watches[directory] = self.observer.schedule(self._relay, str(directory), recursive=False)
+            if not self.recursive:
+                break
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                path = Path(entry.path)
+                if entry.is_dir(follow_symlinks=False):
+                    if self.accept(path, True):
+                        stack.append(path)
+                else:
+                    files.append(path)
+        return files
+
+    def _grow(self, directory: Path):
+        """A directory appeared (mkdir, move-in, checkout): watch it and report its files."""
+        if not self.recursive or not self.observer or not self.accept(directory, True):
+            return
+        for path in self._watch_tree(directory):
+            self.notify(path, "changed")
+
+    def _prune(self, directory: Path):
+        for watched in [d for d in self._watches if d == directory or directory in d.parents]:
+            try:
+                self.observer.unschedule(self._watches.pop(watched))
+            except Exception:
+                pass  # Already gone with the directory
+
+    # ── Debounce ──────────────────────────────────────────────────────────
+
+    def notify(self, path: Path, kind: str):
+        """Record an event; the callback fires once the path has been quiet for `debounce` s."""
+        if not self.accept(path, False):
+            return
+        with self._cond:
+            self._pending[path] = (kind, time.monotonic() + self.debounce)
+            self._cond.notify()
+
+    def _debounce_loop(self):
+        while self.running:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                now  = time.monotonic()
+                due  = [(p, k) for p, (k, t) in self._pending.items() if t <= now]
+                if not due:
+                    self._cond.wait(min(t for _, t in self._pending.values()) - now)
+                    continue
+                for path, _ in due:
+                    del self._pending[path]
+            for path, kind in due:
+                try:
+                    self.callback(path, kind)
+                except Exception as e:
+                    print(f"  [TRIPWIRE] Callback error for {path.name}: {e}")
+
+    # ── Polling fallback ──────────────────────────────────────────────────
+
+    def _scan(self) -> dict:
+        """Stat-only walk of the tree, pruning directories accept() rejects."""
+        found = {}
+        stack = [self.root]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                path = Path(entry.path)
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive and self.accept(path, True):
+                            stack.append(path)
+                    elif self.accept(path, False):
+                        st = entry.stat()
+                        found[path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return found
+
+    def _poll_loop(self):
+        while self.running:
+            time.sleep(dna.WATCH_POLL_INTERVAL)
+            current = self._scan()
+            for path, sig in current.items():
+                if self._snapshot.get(path) != sig:
+                    self.notify(path, "changed")
+            for path in self._snapshot.keys() - current.keys():
+                self.notify(path, "deleted")
+            self._snapshot = current
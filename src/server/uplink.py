@@ -0,0 +1,89 @@
+"""
+UPLINK.PY — SHARED ASYNC NETWORK LOOP
+One asyncio event loop on a background thread, plus one pooled
+keep-alive aiohttp session per provider. Synchronous code hands it
+coroutines (run / submit) instead of building an event loop per call,
+and requests to the same host reuse warm TCP+TLS connections instead of
+paying a fresh handshake every utterance.
+
+Sessions are keyed by base URL, so pointing a provider at a local stub
+server (e.g. dna.ELEVENLABS_BASE_URL = "http://127.0.0.1:8765") is a
+one-line config change.
+"""
+
+import asyncio
+import threading
+
+import dna
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    print("  [UPLINK] aiohttp not installed — pooled HTTP disabled: pip install aiohttp")
+
+
+class Uplink:
+    def __init__(self):
+        self.loop     = asyncio.new_event_loop()
+        self.sessions = {}  # base URL -> aiohttp.ClientSession (touched only on the loop thread)
+        self.thread   = threading.Thread(target=self._run, name="uplink", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    # ── Sync → async bridge ───────────────────────────────────────────────
+
+    def submit(self, coro):
+        """Schedule a coroutine on the shared loop; returns a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float = None):
+        """Run a coroutine on the shared loop and wait for its result."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    # ── Pooled sessions ───────────────────────────────────────────────────
+
+    def session(self, base_url: str) -> "aiohttp.ClientSession":
+        """Keep-alive session for one provider. Call from coroutines running
+        on this loop."""
+        session = self.sessions.get(base_url)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=dna.UPLINK_POOL_SIZE,
+                                             keepalive_timeout=dna.UPLINK_KEEPALIVE,
+                                             ttl_dns_cache=300)
+            timeout   = aiohttp.ClientTimeout(sock_connect=dna.UPLINK_CONNECT_TIMEOUT,
+                                              sock_read=dna.UPLINK_READ_TIMEOUT)
+            session   = aiohttp.ClientSession(base_url=base_url, connector=connector, timeout=timeout)
+            self.sessions[base_url] = session
+        return session
+
+    def warm(self, base_url: str):
+        """Open a connection to base_url in the background, so the first
+        real request doesn't pay for DNS + TLS."""
+        async def _warm():
+            try:
+                async with self.session(base_url).head("/") as resp:
+                    await resp.release()
+            except Exception:
+                pass  # Best effort — the real request will surface errors
+        self.submit(_warm())
+
+    def close(self):
+        async def _close():
+            for session in self.sessions.values():
+                await session.close()
+            self.sessions.clear()
+        try:
+            self.run(_close(), timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
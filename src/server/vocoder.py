@@ -1,24 +1,27 @@
 """
 VOCODER.PY — VOICE SYSTEM
-Handles: Wake word detection, STT (Vosk offline / Google online),
+Handles: Wake word detection, STT (streaming Vosk offline via WIRETAP /
+         Google online),
          TTS (edge-TTS for human-like voice, ElevenLabs for ultra-real),
          Gemini LLM conversations, voice commands, roast mode, music.
 
 Human voice via edge-TTS (Microsoft Neural TTS — free, sounds real)
 or ElevenLabs (paid, even more realistic). Never pyttsx3 again.
+
+LLM replies are spoken as they stream: fragments are cut into sentences,
+each sentence is synthesized while Gemini is still writing the next, and
+queued on the RESONATOR playback engine for gapless playback (one mpv
+process over stdin when there is no output device). Saying the wake word
+while JINX talks cuts it off (barge-in).
 """
 
-import os
+import io
 import re
-import json
 import queue
 import time
-import asyncio
 import threading
 import subprocess
-import tempfile
 from datetime import datetime
-from pathlib import Path
 
 import sounddevice as sd
 import numpy as np
@@ -26,31 +29,21 @@ import speech_recognition as sr
 
 import dna
 from blackbox import Blackbox
-from synapse  import Synapse
+from synapse  import Synapse, Pulse
 from psyche   import Psyche
+from cortex   import Cortex, VOICE
+
+from wiretap  import Wiretap, VOSK_AVAILABLE
+from antenna  import Antenna
+from voicebank import Voicebank
+from resonator import Resonator
+from uplink   import Uplink, AIOHTTP_AVAILABLE
+from reflex   import Reflex
+from jukebox  import Jukebox
+from ghost    import Ghost
+from spectre  import Spectre
 
 # Optional imports (graceful degradation)
-try:
-    import google.generativeai as genai
-    genai.configure(api_key=dna.GEMINI_API_KEY)
-    GEMINI_MODEL = genai.GenerativeModel("gemini-2.0-flash")
-    GEMINI_AVAILABLE = True
-except Exception:
-    GEMINI_AVAILABLE = False
-    print("  [VOCODER] Gemini not available")
-
-try:
-    from vosk import Model as VoskModel, KaldiRecognizer
-    VOSK_MODEL_PATH = "models/vosk-model"
-    if Path(VOSK_MODEL_PATH).exists():
-        _vosk_model = VoskModel(VOSK_MODEL_PATH)
-        VOSK_AVAILABLE = True
-    else:
-        VOSK_AVAILABLE = False
-        print("  [VOCODER] Vosk model not found at models/vosk-model/")
-except ImportError:
-    VOSK_AVAILABLE = False
-
 try:
     import edge_tts
     EDGE_TTS_AVAILABLE = True
@@ -58,25 +51,89 @@ except ImportError:
     EDGE_TTS_AVAILABLE = False
     print("  [VOCODER] edge-tts not installed: pip install edge-tts")
 
-try:
-    import requests as http_requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"')\]]*\s+|\n+")
+
+
+def _sentences(fragments):
+    """Regroup streamed text fragments into speakable sentences (at least
+    TTS_MIN_SENTENCE chars; run-ons are cut near TTS_MAX_SENTENCE)."""
+    buf = ""
+    for fragment in fragments:
+        buf += fragment.replace("*", "")
+        while True:
+            cut = next((m.end() for m in _SENTENCE_END.finditer(buf)
+                        if m.start() >= dna.TTS_MIN_SENTENCE), None)
+            if cut is None and len(buf) > dna.TTS_MAX_SENTENCE:
+                comma = buf.rfind(", ", 0, dna.TTS_MAX_SENTENCE)
+                space = buf.rfind(" ", 0, dna.TTS_MAX_SENTENCE)
+                cut   = (comma + 2 if comma > dna.TTS_MAX_SENTENCE // 2
+                         else space + 1 if space > 0 else dna.TTS_MAX_SENTENCE)
+            if cut is None:
+                break
+            sentence, buf = buf[:cut].strip(), buf[cut:]
+            if sentence:
+                yield sentence
+    if buf.strip():
+        yield buf.strip()
+
+
+class _TapSource(sr.AudioSource):
+    """speech_recognition source that reads a 16 kHz Antenna tap instead
+    of opening the microphone itself."""
+
+    def __init__(self, antenna: Antenna):
+        self.antenna      = antenna
+        self.tap          = None
+        self.stream       = None
+        self.SAMPLE_RATE  = dna.STT_SAMPLE_RATE
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK        = 1024
+
+    def __enter__(self):
+        self.tap    = self.antenna.tap(self.SAMPLE_RATE)
+        self.stream = self
+        return self
+
+    def __exit__(self, *exc):
+        self.tap.close()
+        self.stream = None
+
+    def read(self, frames: int) -> bytes:
+        return self.tap.read_pcm16(frames, timeout=1) or b"\0" * (frames * self.SAMPLE_WIDTH)
+
+
+class _QueueSink:
+    """File-like sink for _tts_stream that only queues chunks, so the Uplink
+    loop never blocks on a slow consumer."""
+
+    def __init__(self, chunks: queue.Queue):
+        self.chunks = chunks
+
+    def write(self, data: bytes):
+        self.chunks.put(bytes(data))
+
+    def flush(self):
+        pass
 
 
 class Vocoder:
-    def __init__(self, synapse: Synapse, blackbox: Blackbox, psyche: Psyche, optic=None):
+    def __init__(self, synapse: Synapse, blackbox: Blackbox, psyche: Psyche, cortex: Cortex,
+                 optic=None, antenna: Antenna = None):
         self.synapse   = synapse
         self.blackbox  = blackbox
         self.psyche    = psyche
+        self.cortex    = cortex
         self.optic     = optic
+        self.antenna   = antenna
         self.running   = False
         self.mode      = dna.DEFAULT_MODE
 
-        # Conversation history for context
-        self.conversation_history = []
+        # Conversation memory: recent turns + rolling summary, token-bounded
+        self.ghost     = Ghost(cortex)
         self.is_speaking   = False
+        self.interrupted   = False          # Barge-in: drop the rest of the current speech
+        self.wake          = threading.Event()
         self.is_listening  = False
         self.awake         = False
         self.awake_until   = 0
@@ -86,8 +143,27 @@ class Vocoder:
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
 
-        # Music state
-        self.music_process = None
+        # Resident streaming Vosk recognizers: wake-word spotter + endpointed STT
+        self.wiretap   = Wiretap() if VOSK_AVAILABLE else None
+        self.streaming = False
+
+        # Synthesized speech, banked by (engine, voice, text)
+        self.voicebank = Voicebank()
+
+        # One event loop + keep-alive HTTP sessions for every TTS request
+        self.uplink    = Uplink()
+
+        # Local intent classifier for commands
+        self.reflex    = Reflex()
+
+        # Persistent playback: speech queue, barge-in, music ducking
+        self.resonator = Resonator()
+
+        # Music resolver: local library + cached yt-dlp URLs
+        self.jukebox   = Jukebox()
+
+        # Latency tracing: wake word → first audio sample, per interaction
+        self.spectre   = Spectre(synapse, blackbox)
 
         # Subscribe to MQTT
         synapse.subscribe(dna.TOPIC["mode"],        self._on_mode)
@@ -101,12 +177,12 @@ class Vocoder:
         if VOSK_AVAILABLE:
             print("  [VOCODER] STT: Vosk (offline)")
 
-    def _on_mode(self, payload: str):
-        self.mode = payload.strip()
+    def _on_mode(self, pulse: Pulse):
+        self.mode = pulse.text.strip()
 
-    def _on_web_command(self, payload: str):
+    def _on_web_command(self, pulse: Pulse):
         try:
-            cmd = json.loads(payload)
+            cmd = pulse.json()
             if cmd.get("action") == "speak":
                 self.speak(cmd.get("text", ""))
             elif cmd.get("action") == "roast":
@@ -123,55 +199,233 @@ class Vocoder:
         if not text:
             return
         self.is_speaking = True
+        self.interrupted = False
         self.synapse.publish(dna.TOPIC["eyes"], "talking")
 
         try:
-            if dna.ELEVENLABS_API_KEY and REQUESTS_AVAILABLE:
-                self._speak_elevenlabs(text)
-            elif EDGE_TTS_AVAILABLE:
-                self._speak_edge_tts(text)
-            else:
-                self._speak_espeak(text)
-
+            with self.spectre.span("speak", chars=len(text)):
+                self._say(text)
             self.blackbox.log_event("SPEECH", {"text": text[:100]})
-        except Exception as e:
-            print(f"  [VOCODER] TTS error: {e}")
-            self._speak_espeak(text)
         finally:
             self.is_speaking = False
+            if self.wiretap:
+                self.wiretap.discard_preroll()  # It only holds our own voice
             if self.mode != dna.Mode.SENTINEL:
                 self.synapse.publish(dna.TOPIC["eyes"], "neutral")
 
-    def _speak_edge_tts(self, text: str):
-        """edge-TTS: Microsoft Neural voice — sounds very human, fully free."""
-        async def _tts():
-            communicate = edge_tts.Communicate(text, dna.EDGE_TTS_VOICE)
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                tmp = f.name
-            await communicate.save(tmp)
-            return tmp
+    def _say(self, text: str):
+        """Play one piece of text: from the Voicebank if it was said before,
+        otherwise synthesized with the best available engine (and banked)."""
+        engine = self._tts_engine()
+        try:
+            if engine is None:
+                self._speak_espeak(text)
+                return
+            audio = self.voicebank.get(*engine, text)
+            if audio is None:
+                audio = self._synthesize(text)
+                self.voicebank.put(*engine, text, audio)
+            self._play_mp3(audio)
+        except Exception as e:
+            print(f"  [VOCODER] TTS error: {e}")
+            self._speak_espeak(text)
 
-        loop    = asyncio.new_event_loop()
-        tmp     = loop.run_until_complete(_tts())
-        loop.close()
+    @staticmethod
+    def _tts_engine() -> tuple | None:
+        """(engine, voice) for the Voicebank key, or None when only espeak is left."""
+        if dna.ELEVENLABS_API_KEY and AIOHTTP_AVAILABLE:
+            return "elevenlabs", dna.ELEVENLABS_VOICE_ID
+        if EDGE_TTS_AVAILABLE:
+            return "edge", dna.EDGE_TTS_VOICE
+        return None
+
+    def _synthesize(self, text: str) -> bytes:
+        """MP3 for text from the current engine."""
+        buf = io.BytesIO()
+        with self.spectre.span("tts", chars=len(text)):
+            self.uplink.run(self._tts_stream(text, buf), timeout=dna.TTS_TIMEOUT)
+        return buf.getvalue()
+
+    def _play_mp3(self, audio: bytes):
+        """Play an in-memory MP3 to the end (or until barge-in) — on the
+        Resonator, else mpv over stdin, else pygame."""
+        with self.spectre.span("playback", bytes=len(audio)):
+            if self.resonator.running:
+                utterance = self.resonator.play(audio)
+                if utterance:
+                    utterance.done.wait()
+                    if utterance.started:
+                        self.spectre.audio(utterance.started)
+                    return
+            try:
+                subprocess.run(["mpv", "--no-terminal", "--really-quiet", "-"],
+                               input=audio, capture_output=True, timeout=30)
+            except FileNotFoundError:
+                import pygame
+                pygame.mixer.init()
+                pygame.mixer.music.load(io.BytesIO(audio))
+                pygame.mixer.music.play()
+                self.spectre.audio()
+                while pygame.mixer.music.get_busy():
+                    time.sleep(0.1)
+
+    def _prewarm_voicebank(self):
+        engine = self._tts_engine()
+        if engine is None:
+            return
+        lines = self.psyche.static_lines()
+        made  = self.voicebank.prewarm(*engine, lines, self._synthesize)
+        print(f"  [VOICEBANK] {len(lines)} stock lines ready ({made} newly synthesized)")
+
+    def speak_stream(self, fragments) -> str:
+        """Speak text while it is still being generated. Sentences are
+        synthesized on a helper thread as soon as they are complete and their
+        audio is queued on the Resonator (or one mpv stream). Returns what was
+        said."""
+        spoken    = []
+        sentences = queue.Queue()
+        self.is_speaking = True
+        self.interrupted = False
+        self.synapse.publish(dna.TOPIC["eyes"], "talking")
 
-        # Play via mpv or pygame
+        player = None if self.resonator.running else self._open_stream_player()
+        trace  = self.spectre.span("speak_stream")
+        played = []  # Utterances queued on the Resonator, for first-audio timing
+        synth  = threading.Thread(target=self._synth_loop, args=(sentences, player, trace.span, played),
+                                  name="vocoder-synth", daemon=True)
+        synth.start()
         try:
-            subprocess.run(["mpv", "--no-terminal", tmp],
-                           capture_output=True, timeout=30)
-        except Exception:
-            import pygame
-            pygame.mixer.init()
-            pygame.mixer.music.load(tmp)
-            pygame.mixer.music.play()
-            while pygame.mixer.music.get_busy():
-                time.sleep(0.1)
+            with trace:
+                try:
+                    for sentence in _sentences(fragments):
+                        if self.interrupted:
+                            break
+                        spoken.append(sentence)
+                        sentences.put(sentence)
+                finally:
+                    sentences.put(None)
+                    synth.join()
+                    if player:
+                        try:
+                            player.stdin.close()
+                            player.wait(timeout=120)  # Returns once the last sentence has played
+                        except Exception:
+                            player.kill()
+                    elif self.resonator.running:
+                        self.resonator.wait()  # Returns once the last sentence has played
+                    for utterance in played:
+                        if utterance.started:
+                            self.spectre.audio(utterance.started)
+        except Exception as e:
+            print(f"  [VOCODER] Speech stream error: {e}")
         finally:
-            os.unlink(tmp)
+            self.is_speaking = False
+            if self.wiretap:
+                self.wiretap.discard_preroll()  # It only holds our own voice
+            if self.mode != dna.Mode.SENTINEL:
+                self.synapse.publish(dna.TOPIC["eyes"], "neutral")
+
+        text = " ".join(spoken)
+        if text:
+            self.blackbox.log_event("SPEECH", {"text": text[:100], "sentences": len(spoken)})
+        return text
 
-    def _speak_elevenlabs(self, text: str):
-        """ElevenLabs API — ultra-realistic voice."""
-        url = f"https://api.elevenlabs.io/v1/text-to-speech/{dna.ELEVENLABS_VOICE_ID}"
+    def _open_stream_player(self):
+        """mpv reading MP3 from stdin, or None when no streaming engine/player exists."""
+        if self._tts_engine() is None:
+            return None
+        try:
+            return subprocess.Popen(["mpv", "--no-terminal", "--really-quiet", "-"],
+                                    stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+        except FileNotFoundError:
+            return None
+
+    def _synth_loop(self, sentences: queue.Queue, player, trace=None, played: list = None):
+        engine = self._tts_engine()
+        with self.spectre.span("synth", parent=trace):  # This thread's spans hang off speak_stream
+            while (sentence := sentences.get()) is not None:
+                if self.interrupted:
+                    continue  # Barged in — drain without speaking
+                if self.resonator.running and engine:
+                    try:
+                        audio = self.voicebank.get(*engine, sentence) or self._synthesize(sentence)
+                        utterance = None if self.interrupted else self.resonator.play(audio)
+                        if utterance and played is not None:
+                            played.append(utterance)
+                        if self.interrupted or utterance:
+                            continue  # Queued; synthesize the next one while it plays
+                    except Exception as e:
+                        print(f"  [VOCODER] TTS error: {e}")
+                    self._say(sentence)
+                    continue
+                if player is None:
+                    self._say(sentence)  # No stream player: one clip per sentence
+                    continue
+                try:
+                    banked = self.voicebank.get(*engine, sentence)
+                    if banked is not None:
+                        player.stdin.write(banked)
+                        player.stdin.flush()
+                    else:
+                        self._stream_to_player(sentence, player)
+                except BrokenPipeError:
+                    print("  [VOCODER] Stream player exited — finishing sentence by sentence")
+                    player = None
+                    self._say(sentence)
+                except Exception as e:
+                    print(f"  [VOCODER] TTS error: {e}")
+                    self._speak_espeak(sentence)
+
+    def _stream_to_player(self, text: str, player):
+        """Stream text's MP3 into mpv's stdin. The Uplink coroutine only queues
+        chunks; the pipe writes (which block while mpv is busy playing) happen
+        here on the synth thread, so they never stall the shared loop."""
+        chunks = queue.Queue()
+        future = self.uplink.submit(self._tts_stream(text, _QueueSink(chunks)))
+        future.add_done_callback(lambda f: chunks.put(None))
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=dna.TTS_TIMEOUT)  # Network stall, not playback
+                except queue.Empty:
+                    raise TimeoutError("TTS stream stalled")
+                if chunk is None:
+                    break
+                player.stdin.write(chunk)
+            player.stdin.flush()
+        except BaseException:
+            future.cancel()
+            raise
+        future.result()  # Surface a synthesis error
+
+    async def _tts_stream(self, text: str, sink):
+        """Write text's MP3 into sink as it arrives (runs on the Uplink loop)."""
+        if self._tts_engine()[0] == "elevenlabs":
+            await self._stream_elevenlabs(text, sink)
+        else:
+            await self._stream_edge_tts(text, sink)
+
+    async def _stream_edge_tts(self, text: str, sink):
+        communicate = edge_tts.Communicate(text, dna.EDGE_TTS_VOICE)
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                sink.write(chunk["data"])
+        sink.flush()
+
+    async def _stream_elevenlabs(self, text: str, sink):
+        path, headers, body = self._elevenlabs_request(text)
+        session = self.uplink.session(dna.ELEVENLABS_BASE_URL)  # Pooled: TLS stays warm
+        async with session.post(f"{path}/stream", headers=headers, json=body) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"ElevenLabs error {resp.status}")
+            async for block in resp.content.iter_chunked(4096):
+                sink.write(block)
+        sink.flush()
+
+    @staticmethod
+    def _elevenlabs_request(text: str) -> tuple:
+        path = f"/v1/text-to-speech/{dna.ELEVENLABS_VOICE_ID}"
         headers = {
             "xi-api-key": dna.ELEVENLABS_API_KEY,
             "Content-Type": "application/json",
@@ -181,15 +435,7 @@ class Vocoder:
             "model_id": "eleven_monolingual_v1",
             "voice_settings": {"stability": 0.5, "similarity_boost": 0.75}
         }
-        resp = http_requests.post(url, headers=headers, json=body, timeout=10)
-        if resp.status_code == 200:
-            with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-                f.write(resp.content)
-                tmp = f.name
-            subprocess.run(["mpv", "--no-terminal", tmp], capture_output=True)
-            os.unlink(tmp)
-        else:
-            raise RuntimeError(f"ElevenLabs error {resp.status_code}")
+        return path, headers, body
 
     def _speak_espeak(self, text: str):
         """Fallback: espeak (robotic but always works)."""
@@ -201,14 +447,18 @@ class Vocoder:
         """Listen for speech and return transcribed text."""
         self.is_listening = True
         try:
-            with sr.Microphone() as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
-
-            if dna.USE_OFFLINE_STT and VOSK_AVAILABLE:
-                return self._transcribe_vosk(audio)
-            else:
-                return self._transcribe_google(audio)
+            if self.streaming and dna.USE_OFFLINE_STT:
+                with self.spectre.span("listen", stt="vosk-stream"):
+                    return self.wiretap.listen(timeout=timeout, phrase_limit=dna.STT_MAX_UTTERANCE)
+            with self.spectre.span("listen", stt="vosk" if dna.USE_OFFLINE_STT and VOSK_AVAILABLE else "google"):
+                with self._microphone() as source:
+                    self.recognizer.adjust_for_ambient_noise(source, duration=0.3)
+                    audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
+
+                if dna.USE_OFFLINE_STT and VOSK_AVAILABLE:
+                    return self._transcribe_vosk(audio)
+                else:
+                    return self._transcribe_google(audio)
         except sr.WaitTimeoutError:
             return ""
         except Exception as e:
@@ -217,9 +467,15 @@ class Vocoder:
         finally:
             self.is_listening = False
 
+    def _microphone(self):
+        if self.antenna and self.antenna.running:
+            return _TapSource(self.antenna)
+        return sr.Microphone()
+
     def _transcribe_google(self, audio) -> str:
         try:
-            return self.recognizer.recognize_google(audio).lower()
+            with self.spectre.span("stt", engine="google"):
+                return self.recognizer.recognize_google(audio).lower()
         except sr.UnknownValueError:
             return ""
         except sr.RequestError:
@@ -229,20 +485,34 @@ class Vocoder:
             return ""
 
     def _transcribe_vosk(self, audio) -> str:
-        if not VOSK_AVAILABLE:
+        if not self.wiretap:
             return ""
-        rec = KaldiRecognizer(_vosk_model, 16000)
-        wav = audio.get_wav_data(convert_rate=16000)
-        if rec.AcceptWaveform(wav):
-            result = json.loads(rec.Result())
-            return result.get("text", "").lower()
-        return ""
+        with self.spectre.span("stt", engine="vosk"):
+            return self.wiretap.transcribe(audio.get_raw_data(convert_rate=self.wiretap.rate, convert_width=2))
 
     # ── Wake Word Detection ────────────────────────────────────────────────
 
     def _listen_for_wake_word(self):
         """Continuous background listening for wake word."""
-        with sr.Microphone() as source:
+        if self.streaming:
+            print(f"  [VOCODER] Spotting wake word: '{dna.WAKE_WORD}' (threshold {dna.WAKE_THRESHOLD})")
+            # Spotting never blocks on a conversation, so the wake word can cut speech off
+            threading.Thread(target=self._wake_worker, name="vocoder-wake", daemon=True).start()
+            while self.running:
+                try:
+                    if not self.wiretap.wait_for_keyword(timeout=1.0):
+                        continue
+                    if self.is_speaking:
+                        if not (dna.BARGE_IN and self.resonator.running):
+                            continue
+                        self._barge_in()
+                    self.wake.set()
+                except Exception as e:
+                    print(f"  [VOCODER] Wake word spotter error: {e}")
+                    time.sleep(1)
+            return
+        # No Vosk: full STT on every phrase (slow, and online if Google)
+        with self._microphone() as source:
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
             print(f"  [VOCODER] Listening for wake word: '{dna.WAKE_WORD}'")
             while self.running:
@@ -257,11 +527,26 @@ class Vocoder:
                 except Exception as e:
                     time.sleep(1)
 
+    def _wake_worker(self):
+        while self.running:
+            if self.wake.wait(1):
+                self.wake.clear()
+                self._on_wake()
+
+    def _barge_in(self):
+        print("  [VOCODER] Barge-in — cutting speech")
+        self.interrupted = True
+        self.resonator.cancel()
+
     def _on_wake(self):
         """Triggered when wake word is detected."""
+        deadline = time.time() + 1
+        while self.is_speaking and time.time() < deadline:
+            time.sleep(0.05)  # A barged-in speech is still unwinding
         if self.is_speaking:
             return
         print("  [VOCODER] Wake word detected!")
+        trace = self.spectre.begin()
         self.awake      = True
         self.awake_until = time.time() + dna.VOICE_TIMEOUT + 30
 
@@ -270,106 +555,107 @@ class Vocoder:
         self.synapse.publish(dna.TOPIC["sound"], "wake")
 
         # Listen for command
-        self.speak(self.psyche.get_ack())  # "Yes?", "What?", "Ugh, what now?"
-        command = self.listen(timeout=dna.VOICE_TIMEOUT)
-        if command:
-            self._execute_command(command)
-        else:
-            self.speak("I heard nothing. Classic.")
-        self.awake = False
+        try:
+            with self.spectre.span("ack"):
+                self.speak(self.psyche.get_ack())  # "Yes?", "What?", "Ugh, what now?"
+            command = self.listen(timeout=dna.VOICE_TIMEOUT)
+            trace.attrs["command"] = command[:100]
+            if command:
+                self._execute_command(command)
+            else:
+                self.speak("I heard nothing. Classic.")
+        finally:
+            self.awake = False
+            self.spectre.end()
 
     # ── Command Parsing ────────────────────────────────────────────────────
 
     def _execute_command(self, text: str):
-        """Parse and execute a voice command."""
+        """Classify a voice command locally (REFLEX) and run it; only
+        low-confidence "chat" goes to Gemini."""
+        with self.spectre.span("command") as trace:
+            self._run_command(text, trace)
+
+    def _run_command(self, text: str, trace=None):
         text = text.lower().strip()
-        print(f"  [VOCODER] Command: '{text}'")
-        self.blackbox.log_event("COMMAND", {"text": text})
+        with self.spectre.span("classify"):
+            intent, confidence, slots = self.reflex.classify(text)
+        if trace is not None:
+            trace.attrs["intent"] = intent
+        print(f"  [VOCODER] Command: '{text}' -> {intent} ({confidence:.2f})")
+        self.blackbox.log_event("COMMAND", {"text": text, "intent": intent,
+                                            "confidence": round(confidence, 2)})
 
         # Mode switching
-        if any(w in text for w in ["guard mode", "sentinel", "surveillance"]):
+        if intent == "sentinel_mode":
             self.synapse.publish(dna.TOPIC["mode"], dna.Mode.SENTINEL)
             self.speak("Switching to sentinel mode. I'm watching everyone.")
 
-        elif any(w in text for w in ["buddy mode", "normal mode", "relax"]):
+        elif intent == "buddy_mode":
             self.synapse.publish(dna.TOPIC["mode"], dna.Mode.BUDDY)
             self.speak("Back to buddy mode. I'll try to be nice. No promises.")
 
-        elif any(w in text for w in ["sleep", "goodnight", "shut up", "stop"]):
+        elif intent == "sleep":
             self.synapse.publish(dna.TOPIC["eyes"], "sleep")
             self.speak("Finally. Peace and quiet.")
             self.synapse.publish(dna.TOPIC["mode"], dna.Mode.SLEEP)
 
         # Roast mode
-        elif "roast" in text:
-            name = self._extract_name(text)
-            self.roast_mode(name)
+        elif intent == "roast":
+            self.roast_mode(slots.get("name"))
 
         # Music
-        elif any(w in text for w in ["play music", "play song", "play"]):
-            query = re.sub(r"(play music|play song|play|hey jinx)", "", text).strip()
-            self.play_music(query or "chill music")
+        elif intent == "play_music":
+            self.play_music(slots.get("query") or "chill music")
 
-        elif any(w in text for w in ["stop music", "pause music", "mute"]):
+        elif intent == "stop_music":
             self.stop_music()
 
         # Lights / LEDs
-        elif "lights" in text or "led" in text:
-            color = self._extract_color(text)
+        elif intent == "lights":
+            color = slots.get("color", "white")
             self.synapse.publish(dna.TOPIC["led"], f"color:{color}")
             self.speak(f"Lights set to {color}.")
 
         # Movement
-        elif any(w in text for w in ["come here", "forward", "move forward"]):
+        elif intent == "move_forward":
             self.synapse.publish(dna.TOPIC["motor"], "forward")
             self.speak("Moving forward.")
 
-        elif any(w in text for w in ["go back", "backward", "retreat"]):
+        elif intent == "move_backward":
             self.synapse.publish(dna.TOPIC["motor"], "backward")
             self.speak("Backing up.")
 
-        elif any(w in text for w in ["stop moving", "halt"]):
+        elif intent == "stop_moving":
             self.synapse.publish(dna.TOPIC["motor"], "stop")
             self.speak("Stopping.")
 
         # Status
-        elif any(w in text for w in ["status", "how are you", "battery"]):
+        elif intent == "status":
             self._report_status()
 
         # Face registration
-        elif "register" in text or "learn my face" in text:
-            name = self._extract_name(text) or "unknown_person"
+        elif intent == "register_face":
+            name = slots.get("name") or "unknown_person"
             if self.optic and self.optic.register_face(name):
                 self.speak(f"Got it. I'll remember you as {name}. Lucky you.")
             else:
                 self.speak("I couldn't see a face clearly. Try again.")
 
         # Agent mode — document question or code review
-        elif any(w in text for w in ["read", "summarize", "explain", "what does", "review code"]):
+        elif intent == "agent_query":
             self.synapse.publish(dna.TOPIC["command"],
-                                 json.dumps({"type": "agent_query", "query": text}))
+                                 {"type": "agent_query", "query": slots.get("query", text)})
             self.speak("Let me check that for you.")
 
         # Skeleton show-off
-        elif any(w in text for w in ["skeleton", "show skeleton", "dance mode"]):
+        elif intent == "skeleton":
             self.speak("Show me your moves. I'll judge.")
             self.synapse.publish(dna.TOPIC["mode"], dna.Mode.BUDDY)
 
         # Fallback — Gemini conversation
         else:
-            response = self.ask_gemini(text)
-            self.speak(response)
-
-    def _extract_name(self, text: str) -> str:
-        match = re.search(r"(?:roast|register|learn)\s+(\w+)", text)
-        return match.group(1).capitalize() if match else ""
-
-    def _extract_color(self, text: str) -> str:
-        colors = ["red", "blue", "green", "purple", "cyan", "yellow", "white", "orange", "pink", "rainbow"]
-        for c in colors:
-            if c in text:
-                return c
-        return "white"
+            self.speak_stream(self.ask_gemini_stream(text))
 
     def _report_status(self):
         # Battery comes from MQTT state in hivemind
@@ -381,36 +667,51 @@ class Vocoder:
 
     def ask_gemini(self, user_input: str) -> str:
         """Send message to Gemini with personality context."""
-        if not GEMINI_AVAILABLE:
-            return "My brain module is offline. Check the API key."
-
-        # Build personality system prompt
-        system_prompt = self.psyche.get_system_prompt()
+        return "".join(self.ask_gemini_stream(user_input)).strip()
 
-        # Add to conversation history (keep last 10 turns)
-        self.conversation_history.append({"role": "user", "parts": [user_input]})
-        if len(self.conversation_history) > 20:
-            self.conversation_history = self.conversation_history[-20:]
+    def ask_gemini_stream(self, user_input: str):
+        """ask_gemini, yielding the reply as Gemini writes it (for speak_stream)."""
+        # Never cached: a reply depends on the conversation so far, not just the words
+        if not self.cortex.available:
+            yield "My brain module is offline. Check the API key."
+            return
 
+        # Personality goes in once as the system instruction; the message is just what was said
+        parts = []
+        with self.spectre.span("llm", history_tokens=self.ghost.size()) as trace:
+            for piece in self._voice_stream(user_input, "My thoughts are buffering. Try again.",
+                                            history=self.ghost.history(), sink=parts,
+                                            system=self.psyche.get_system_prompt()):
+                if trace is not None and "first_token_ms" not in trace.attrs:
+                    trace.attrs["first_token_ms"] = round((time.monotonic() - trace.start) * 1000, 1)
+                yield piece
+        reply = "".join(parts).strip()
+        if reply:
+            self.ghost.add(user_input, reply)
+
+    def _voice_stream(self, prompt: str, fallback: str, history: list = None, sink: list = None,
+                      system: str = None):
+        """Stream a VOICE-priority reply; yields `fallback` if nothing arrived.
+        Fragments of a complete reply are also appended to `sink`."""
+        parts = []
         try:
-            chat = GEMINI_MODEL.start_chat(history=self.conversation_history[:-1])
-            response = chat.send_message(
-                f"{system_prompt}\n\nUser said: {user_input}\n"
-                "Reply in 1-3 sentences. Be clever and sarcastic but helpful. "
-                "No markdown formatting in your reply."
-            )
-            reply = response.text.strip()
-            self.conversation_history.append({"role": "model", "parts": [reply]})
-            return reply
+            for piece in self.cortex.stream(prompt, VOICE, history=history, timeout=dna.LLM_VOICE_TIMEOUT,
+                                          system=system):
+                parts.append(piece)
+                yield piece
         except Exception as e:
             print(f"  [VOCODER] Gemini error: {e}")
-            return "My thoughts are buffering. Try again."
+            if not parts:
+                yield fallback
+            return
+        if sink is not None:
+            sink.extend(parts)
 
     # ── Roast Mode ────────────────────────────────────────────────────────
 
     def roast_mode(self, name: str = None):
         """Generate and deliver a personalized AI roast."""
-        if not GEMINI_AVAILABLE:
+        if not self.cortex.available:
             self.speak("I'd roast you, but my creativity module is offline.")
             return
 
@@ -432,37 +733,23 @@ class Vocoder:
             "Keep it to 2-3 sentences. Be creative. Reference the situation if possible. "
             "End with a smug one-liner."
         )
-        try:
-            response = GEMINI_MODEL.generate_content(prompt)
-            roast    = response.text.strip()
-        except Exception:
-            roast = "I was going to roast you, but I see you're already well-done."
-
-        self.speak(roast)
+        self.speak_stream(self._voice_stream(
+            prompt, "I was going to roast you, but I see you're already well-done."))
 
     # ── Music ─────────────────────────────────────────────────────────────
 
     def play_music(self, query: str):
-        """Search and play music via yt-dlp."""
-        self.speak(f"Looking up {query}...")
+        """Play music: local library or cached URL at once, yt-dlp otherwise."""
+        if not self.jukebox.ready(query):
+            self.speak(f"Looking up {query}...")
         self.synapse.publish(dna.TOPIC["eyes"], "music")
         self.synapse.publish(dna.TOPIC["led"],  "music")
 
         def _play():
             try:
-                # Get audio URL via yt-dlp (no download)
-                result = subprocess.run(
-                    ["yt-dlp", "-f", "bestaudio", "--get-url",
-                     f"ytsearch1:{query}"],
-                    capture_output=True, text=True, timeout=15
-                )
-                url = result.stdout.strip().split("\n")[0]
-                if url:
-                    self.stop_music()
-                    self.music_process = subprocess.Popen(
-                        ["mpv", "--no-terminal", url],
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                    )
+                source = self.jukebox.resolve(query)
+                if source:
+                    self.resonator.play_music(source)
                 else:
                     self.speak("Couldn't find that. Your taste in music must be too obscure.")
             except Exception as e:
@@ -471,9 +758,7 @@ class Vocoder:
         threading.Thread(target=_play, daemon=True).start()
 
     def stop_music(self):
-        if self.music_process:
-            self.music_process.terminate()
-            self.music_process = None
+        if self.resonator.stop_music():
             self.synapse.publish(dna.TOPIC["eyes"], "neutral")
             self.synapse.publish(dna.TOPIC["led"],  "normal")
 
@@ -482,9 +767,20 @@ class Vocoder:
     def run(self):
         """Start voice system — runs wake word detection loop."""
         self.running = True
+        self.streaming = bool(self.wiretap and self.wiretap.start(self.antenna))  # Spotting needs only Vosk
+        self.resonator.start()
+        self.jukebox.start()
+        if (self._tts_engine() or ("",))[0] == "elevenlabs":
+            self.uplink.warm(dna.ELEVENLABS_BASE_URL)  # Pre-open the TLS connection
+        threading.Thread(target=self._prewarm_voicebank, name="voicebank", daemon=True).start()
         print("  [VOCODER] Voice system running")
         self._listen_for_wake_word()
 
     def stop(self):
         self.running = False
         self.stop_music()
+        self.resonator.stop()
+        self.jukebox.stop()
+        self.uplink.close()
+        if self.wiretap:
+            self.wiretap.stop()
@@ -0,0 +1,163 @@
+"""
+VOICEBANK.PY — TTS PHRASE CACHE
+Synthesized speech keyed by (engine, voice, text), so a line JINX has
+said before is never sent to edge-TTS or ElevenLabs again. Two LRU
+tiers: encoded audio in memory (VOICEBANK_MEMORY_MB) for instant
+playback, and MP3 files on disk (VOICEBANK_DISK_MB) that survive
+restarts and keep working offline. The disk tier's LRU order and size
+live in memory (scanned once at startup); every hit also touches the
+file's mtime, so the order survives a restart.
+
+prewarm() synthesizes Psyche's fixed lines up front, so acknowledging
+the wake word never waits on the network.
+"""
+
+import os
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+import dna
+
+
+class Voicebank:
+    def __init__(self, cache_dir: str = None):
+        self.dir = Path(cache_dir or dna.VOICEBANK_DIR)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.memory     = OrderedDict()  # key -> audio bytes; LRU order
+        self.mem_bytes  = 0
+        self.disk       = OrderedDict()  # key -> size of its .mp3; LRU order
+        self.disk_bytes = 0
+        self.counts     = {"memory": 0, "disk": 0, "misses": 0}
+        self._lock      = threading.Lock()
+        self._scan_disk()
+
+    @staticmethod
+    def key(engine: str, voice: str, text: str) -> str:
+        return hashlib.sha1(f"{engine}\x00{voice}\x00{text.strip()}".encode()).hexdigest()
+
+    # ── Public API ────────────────────────────────────────────────────────
+
+    def get(self, engine: str, voice: str, text: str) -> bytes | None:
+        key  = self.key(engine, voice, text)
+        path = self.dir / f"{key}.mp3"
+        with self._lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.counts["memory"] += 1
+                if key in self.disk:
+                    self.disk.move_to_end(key)
+        if data is not None:
+            self._touch(path)  # The most-played lines live in memory; keep them young on disk too
+            return data
+        try:
+            data = path.read_bytes()
+        except OSError:
+            with self._lock:
+                self.counts["misses"] += 1
+                self._forget_disk(key)
+            return None
+        self._touch(path)
+        with self._lock:
+            self.counts["disk"] += 1
+            self._hold(key, data)
+            self._note_disk(key, len(data))
+        return data
+
+    def put(self, engine: str, voice: str, text: str, data: bytes):
+        if not data:
+            return
+        key  = self.key(engine, voice, text)
+        path = self.dir / f"{key}.mp3"
+        tmp  = path.with_suffix(".tmp")
+        with self._lock:
+            self._hold(key, data)
+        try:
+            tmp.write_bytes(data)
+            tmp.replace(path)  # Never leave a half-written clip behind
+        except OSError as e:
+            print(f"  [VOICEBANK] Disk cache write failed: {e}")
+            return
+        with self._lock:
+            self._note_disk(key, len(data))
+            victims = self._trim_disk()
+        for old in victims:
+            (self.dir / f"{old}.mp3").unlink(missing_ok=True)
+
+    def prewarm(self, engine: str, voice: str, lines, synth) -> int:
+        """Load every line into memory, synthesizing (synth(text) -> bytes)
+        the ones never heard before. Returns how many were synthesized."""
+        made = 0
+        for text in dict.fromkeys(lines):
+            if self.get(engine, voice, text) is not None:
+                continue
+            try:
+                self.put(engine, voice, text, synth(text))
+                made += 1
+            except Exception as e:
+                print(f"  [VOICEBANK] Prewarm stopped: {e}")  # Offline — try again next start
+                break
+        return made
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"memory_entries": len(self.memory), "memory_bytes": self.mem_bytes,
+                    "disk_entries": len(self.disk), "disk_bytes": self.disk_bytes, **self.counts}
+
+    # ── Internals ─────────────────────────────────────────────────────────
+
+    def _hold(self, key: str, data: bytes):
+        if key in self.memory:
+            self.mem_bytes -= len(self.memory.pop(key))
+        self.memory[key] = data
+        self.mem_bytes  += len(data)
+        budget = dna.VOICEBANK_MEMORY_MB * 1024 * 1024
+        while self.mem_bytes > budget and len(self.memory) > 1:
+            _, old = self.memory.popitem(last=False)
+            self.mem_bytes -= len(old)
+
+    def _scan_disk(self):
+        """The only directory walk: existing clips, oldest first."""
+        files = []
+        for path in self.dir.glob("*.mp3"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path.stem))
+        for _, size, key in sorted(files):
+            self.disk[key] = size
+            self.disk_bytes += size
+        for old in self._trim_disk():
+            (self.dir / f"{old}.mp3").unlink(missing_ok=True)
+
+    def _note_disk(self, key: str, size: int):
+        """Record a clip on disk as the most recently used."""
+        self._forget_disk(key)
+        self.disk[key] = size
+        self.disk_bytes += size
+
+    def _forget_disk(self, key: str):
+        size = self.disk.pop(key, None)
+        if size is not None:
+            self.disk_bytes -= size
+
+    def _trim_disk(self) -> list:
+        """Drop least-recently-used clips from the index until it fits the
+        budget; returns their keys for the caller to unlink outside the lock."""
+        budget  = dna.VOICEBANK_DISK_MB * 1024 * 1024
+        victims = []
+        while self.disk_bytes > budget and len(self.disk) > 1:
+            key, size = self.disk.popitem(last=False)
+            self.disk_bytes -= size
+            victims.append(key)
+        return victims
+
+    @staticmethod
+    def _touch(path: Path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
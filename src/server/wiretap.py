@@ -0,0 +1,176 @@
+"""
+WIRETAP.PY — STREAMING SPEECH RECOGNITION
+One resident Vosk recognizer fed small PCM blocks from a 16 kHz tap on
+the shared ANTENNA capture stream. Audio is decoded as it arrives, so partial
+results are available mid-sentence and the final transcript lands within
+one block of Vosk's endpointer deciding the user stopped talking — no
+capture-then-convert cycle, no recognizer built per utterance.
+
+Between utterances the tap keeps running into a short pre-roll
+buffer, so the first syllable after the wake word isn't clipped, and
+into a ring buffer watched by a second, grammar-restricted recognizer
+that only knows the wake phrase. Keyword spotting on that tiny graph is
+cheap enough to run all day; full STT only starts once it fires.
+"""
+
+import json
+import queue
+import time
+import threading
+from pathlib import Path
+from collections import deque
+
+import dna
+
+try:
+    from vosk import Model as VoskModel, KaldiRecognizer
+    if Path(dna.VOSK_MODEL_PATH).exists():
+        _vosk_model = VoskModel(dna.VOSK_MODEL_PATH)
+        VOSK_AVAILABLE = True
+    else:
+        VOSK_AVAILABLE = False
+        print(f"  [WIRETAP] Vosk model not found at {dna.VOSK_MODEL_PATH}/")
+except ImportError:
+    VOSK_AVAILABLE = False
+
+
+class Wiretap:
+    def __init__(self, rate: int = None):
+        self.rate       = rate or dna.STT_SAMPLE_RATE
+        self.block      = int(self.rate * dna.STT_BLOCK_MS / 1000)
+        self.recognizer = KaldiRecognizer(_vosk_model, self.rate)
+        if hasattr(self.recognizer, "SetEndpointerDelays"):  # vosk >= 0.3.45
+            self.recognizer.SetEndpointerDelays(dna.STT_START_MAX, dna.STT_ENDPOINT_SILENCE,
+                                                dna.STT_MAX_UTTERANCE)
+        self.blocks  = queue.Queue()
+
+        # Wake-word spotter: the phrase's words plus a garbage model for everything else
+        self.keyword = dna.WAKE_WORD.lower().split()
+        self.spotter = KaldiRecognizer(_vosk_model, self.rate, json.dumps([" ".join(self.keyword), "[unk]"]))
+        self.spotter.SetWords(True)  # Per-word confidences for the threshold
+        self.ring    = queue.Queue(maxsize=max(1, int(dna.WAKE_RING_SECONDS * 1000 / dna.STT_BLOCK_MS)))
+        self.preroll = deque(maxlen=max(1, int(dna.STT_PREROLL * 1000 / dna.STT_BLOCK_MS)))
+        self.armed   = False
+        self.partial = ""
+        self.tap     = None
+        self._busy   = threading.Lock()  # One utterance at a time on the shared recognizer
+
+    def start(self, antenna) -> bool:
+        if not antenna or not antenna.running:
+            return False
+        self.tap = antenna.tap(self.rate)
+        threading.Thread(target=self._reader, name="wiretap", daemon=True).start()
+        print(f"  [WIRETAP] Streaming STT at {self.rate} Hz ({dna.STT_BLOCK_MS} ms blocks)")
+        return True
+
+    def stop(self):
+        if self.tap:
+            self.tap.close()
+            self.tap = None
+
+    def _reader(self):
+        tap = self.tap
+        while self.tap is tap and tap.antenna.running:
+            data = tap.read_pcm16(self.block, timeout=1)
+            if data:
+                self._on_audio(data)
+
+    def _on_audio(self, data: bytes):
+        # Route the block, never decode here
+        if self.armed:
+            self.blocks.put(data)
+            return
+        self.preroll.append(data)
+        try:
+            self.ring.put_nowait(data)
+        except queue.Full:  # Spotter fell behind — drop the oldest audio, not the newest
+            try:
+                self.ring.get_nowait()
+            except queue.Empty:
+                pass
+            self.ring.put_nowait(data)
+
+    # ── Wake word ─────────────────────────────────────────────────────────
+
+    def wait_for_keyword(self, timeout: float = 1.0) -> bool:
+        """Feed the spotter for up to timeout seconds; True once the wake
+        phrase is heard with mean word confidence >= WAKE_THRESHOLD."""
+        deadline = time.monotonic() + timeout
+        while (left := deadline - time.monotonic()) > 0:
+            try:
+                data = self.ring.get(timeout=left)
+            except queue.Empty:
+                return False
+            if not self.spotter.AcceptWaveform(data):
+                continue
+            if self._spotted(json.loads(self.spotter.Result()).get("result", [])):
+                self.spotter.Reset()
+                self.preroll.clear()  # The command starts after the wake phrase
+                return True
+        return False
+
+    def _spotted(self, words: list) -> bool:
+        n = len(self.keyword)
+        for i in range(len(words) - n + 1):
+            window = words[i:i + n]
+            if [w.get("word") for w in window] == self.keyword:
+                if sum(w.get("conf", 0.0) for w in window) / n >= dna.WAKE_THRESHOLD:
+                    return True
+        return False
+
+    def discard_preroll(self):
+        """Forget buffered pre-roll — call when JINX stops talking, so the
+        next listen() doesn't start with the tail of its own voice."""
+        self.preroll.clear()
+
+    # ── Recognition ───────────────────────────────────────────────────────
+
+    def listen(self, timeout: float = 5, phrase_limit: float = None, on_partial=None) -> str:
+        """Transcript of the next utterance, or "" if nobody spoke within
+        timeout. on_partial(text) is called as the hypothesis grows."""
+        phrase_limit = phrase_limit or dna.STT_MAX_UTTERANCE
+        with self._busy:
+            self.recognizer.Reset()
+            self.blocks = queue.Queue()
+            self.armed  = True  # New blocks go to the queue from here on
+            for data in list(self.preroll):
+                self.blocks.put(data)
+            self.preroll.clear()
+            self.partial = ""
+            started, heard = time.monotonic(), None
+            try:
+                while True:
+                    now = time.monotonic()
+                    if heard is None and now - started > timeout:
+                        return ""
+                    if heard is not None and now - heard > phrase_limit:
+                        return self._text(self.recognizer.FinalResult())
+                    try:
+                        data = self.blocks.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if self.recognizer.AcceptWaveform(data):
+                        text = self._text(self.recognizer.Result())
+                        if text:
+                            return text
+                        continue  # Endpoint on noise — keep waiting for speech
+                    partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+                    if partial and heard is None:
+                        heard = now
+                    if partial != self.partial:
+                        self.partial = partial
+                        if on_partial:
+                            on_partial(partial)
+            finally:
+                self.armed = False
+
+    def transcribe(self, pcm: bytes) -> str:
+        """Decode an already-captured 16-bit mono clip at self.rate."""
+        with self._busy:
+            self.recognizer.Reset()
+            self.recognizer.AcceptWaveform(pcm)
+            return self._text(self.recognizer.FinalResult())  # Flushes a pending partial too
+
+    @staticmethod
+    def _text(result: str) -> str:
+        return json.loads(result).get("text", "").lower().strip()
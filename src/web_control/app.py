@@ -19,6 +19,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'server'))
 from flask import Flask, render_template, request, jsonify, Response
 import paho.mqtt.client as mqtt
 import dna
+from synapse import Pulse
 
 app = Flask(__name__)
 
@@ -33,6 +34,7 @@ state = {
     "audio":        {},
     "agent_response": "",
     "code_review":  "",
+    "synapse":      {},         # Latest Synapse bus stats broadcast
 }
 
 # ── MQTT Client ────────────────────────────────────────────────────────────
@@ -40,47 +42,75 @@ state = {
 mqtt_client = mqtt.Client()
 
 def _on_mqtt_message(client, userdata, msg):
-    topic   = msg.topic
-    payload = msg.payload.decode("utf-8", errors="ignore")
+    if msg.topic == dna.TOPIC["batch"]:
+        # Synapse bundles small tablet-only updates into one envelope
+        try:
+            for entry in json.loads(msg.payload)["batch"]:
+                _handle_pulse(Pulse(entry["topic"], entry["payload"].encode("utf-8")))
+        except Exception:
+            pass
+        return
+    _handle_pulse(Pulse(msg.topic, msg.payload))  # Decoded lazily, only as far as each topic needs
+
+def _handle_pulse(pulse: Pulse):
+    topic = pulse.topic
 
     if topic == dna.TOPIC["frame"]:
-        state["frame"] = payload
+        state["frame"] = pulse.text  # Base64 JPEG — ASCII, kept as-is for JSON responses
 
     elif topic == dna.TOPIC["battery"]:
         try:
-            data = json.loads(payload)
+            data = pulse.json()
             state["battery_pct"] = int(data.get("percent", 100))
         except Exception:
             pass
 
     elif topic == dna.TOPIC["doom_level"]:
         try:
-            state["doom_level"] = float(payload)
+            state["doom_level"] = float(pulse.text)
         except Exception:
             pass
 
     elif topic == dna.TOPIC["alerts"]:
         state["alerts"].insert(0, {
             "time": datetime.now().strftime("%H:%M:%S"),
-            "msg": payload
+            "msg": pulse.text
         })
         state["alerts"] = state["alerts"][:50]  # Keep last 50
 
     elif topic == dna.TOPIC["network_stats"]:
         try:
-            state["network"] = json.loads(payload)
+            state["network"] = pulse.json()
         except Exception:
             pass
 
     elif topic == dna.TOPIC["audio"]:
         try:
-            state["audio"] = json.loads(payload)
+            state["audio"] = pulse.json()
+        except Exception:
+            pass
+
+    elif topic == dna.TOPIC["synapse_stats"]:
+        try:
+            state["synapse"] = pulse.json()
+        except Exception:
+            pass
+
+    elif topic == dna.TOPIC["cortex_stats"]:
+        try:
+            state["cortex"] = pulse.json()
+        except Exception:
+            pass
+
+    elif topic == dna.TOPIC["voice_trace"]:
+        try:
+            state["voice_trace"] = pulse.json()
         except Exception:
             pass
 
     elif topic == dna.TOPIC["command"]:
         try:
-            cmd = json.loads(payload)
+            cmd = pulse.json()
             if cmd.get("type") == "agent_response":
                 state["agent_response"] = cmd.get("response", "")
             elif cmd.get("type") == "code_review_result":
@@ -143,6 +173,24 @@ def api_frame():
     return jsonify({"frame": None})
 
 
+@app.route("/api/synapse_stats")
+def api_synapse_stats():
+    """Per-topic message rates, sizes, callback timing and latency from Synapse."""
+    return jsonify(state.get("synapse", {}))
+
+
+@app.route("/api/cortex_stats")
+def api_cortex_stats():
+    """LLM executor queue depth, retries and latency per priority class."""
+    return jsonify(state.get("cortex", {}))
+
+
+@app.route("/api/voice_trace")
+def api_voice_trace():
+    """Latest voice interaction timings plus rolling latency percentiles."""
+    return jsonify(state.get("voice_trace", {}))
+
+
 @app.route("/api/command", methods=["POST"])
 def api_command():
     """Send any command to JINX."""